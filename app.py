@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-from flask import Flask, render_template, send_from_directory, request, redirect, url_for
+from flask import Flask, render_template, send_from_directory, send_file, request, redirect, url_for
+from flask import stream_template, Response
 import os
 import re
 import time
@@ -37,20 +38,262 @@ DISABLE_SCRAPERS = os.getenv("DISABLE_SCRAPERS") == "1"
 def serve_robots():
     return send_from_directory(app.root_path, 'robots.txt')
 
-@app.route('/sitemap.xml')
-def serve_sitemap():
-    return send_from_directory(app.root_path, 'sitemap.xml')
+
+# ===== 정적 자산 (JS/CSS) 빌드 =====
+# assets/ 의 원본을 내용 해시가 붙은 파일(app.3f9c1a2b7e.js)로 복사하고
+# .gz / .br 을 미리 만들어 둔다. 이름이 내용으로 바뀌므로 1년 immutable 캐시가 안전하고,
+# 요청 시에는 Accept-Encoding 에 맞는 압축본을 그대로 내보낸다 (요청마다 압축 X).
+# 빌드는 도커 이미지를 만들 때 한 번 (BUILD_ONLY=1 python -c "import app") → 워커는 manifest.json 만 읽는다.
+import hashlib
+import gzip
+import json
+import mimetypes
+
+try:
+    import brotli   # 선택: 없으면 gzip 만
+except ImportError:
+    brotli = None
+
+ASSET_SRC_DIR = os.path.join(app.root_path, "assets")
+ASSET_BUILD_DIR = os.getenv("ASSET_BUILD_DIR") or os.path.join(app.root_path, "build", "assets")
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+ASSET_MANIFEST = {}   # 원본 이름(app.js) -> 해시 이름(app.3f9c1a2b7e.js)
+ASSET_FILES = {}      # 해시 이름 -> {"mimetype", "identity": path, "gzip": path, "br": path}
+
+
+def _write_atomic(path: str, data: bytes):
+    # gunicorn 워커 여러 개가 동시에 빌드해도 반쯤 쓰인 파일을 내보내지 않도록
+    if os.path.exists(path):
+        return
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def build_assets():
+    os.makedirs(ASSET_BUILD_DIR, exist_ok=True)
+    for name in sorted(os.listdir(ASSET_SRC_DIR)):
+        src = os.path.join(ASSET_SRC_DIR, name)
+        if not os.path.isfile(src):
+            continue
+        with open(src, "rb") as f:
+            raw = f.read()
+        stem, ext = os.path.splitext(name)
+        hashed = f"{stem}.{hashlib.sha256(raw).hexdigest()[:10]}{ext}"
+        out = os.path.join(ASSET_BUILD_DIR, hashed)
+        rec = {"mimetype": mimetypes.guess_type(name)[0] or "application/octet-stream", "identity": out}
+        _write_atomic(out, raw)
+        _write_atomic(out + ".gz", gzip.compress(raw, compresslevel=9, mtime=0))
+        rec["gzip"] = out + ".gz"
+        if brotli is not None:
+            _write_atomic(out + ".br", brotli.compress(raw, quality=11))
+            rec["br"] = out + ".br"
+        ASSET_MANIFEST[name] = hashed
+        ASSET_FILES[hashed] = rec
+
+
+def asset_url(name: str) -> str:
+    """템플릿용: {{ asset_url('app.js') }} → /assets/app.3f9c1a2b7e.js"""
+    return url_for("serve_asset", filename=ASSET_MANIFEST[name])
+
+
+def _accepted_encodings() -> set:
+    accepted = set()
+    for part in (request.headers.get("Accept-Encoding") or "").split(","):
+        enc, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(enc.strip().lower())
+    return accepted
+
+
+@app.route("/assets/<path:filename>")
+def serve_asset(filename):
+    rec = ASSET_FILES.get(filename)
+    if rec is None:
+        return ("Not Found", 404)
+    accepted = _accepted_encodings()
+    encoding = next((e for e in ("br", "gzip") if e in rec and e in accepted), None)
+    resp = send_file(rec[encoding or "identity"], mimetype=rec["mimetype"],
+                     conditional=True, etag=f"{filename}-{encoding or 'identity'}")
+    if encoding:
+        resp.headers["Content-Encoding"] = encoding
+    resp.headers["Vary"] = "Accept-Encoding"
+    resp.headers["Cache-Control"] = f"public, max-age={ASSET_MAX_AGE}, immutable"
+    return resp
+
+
+app.jinja_env.globals["asset_url"] = asset_url
+
+
+# ===== 지도 이미지 변환 (WebP/AVIF, 반응형 폭) =====
+# image/map_*.png 원본으로 폭별 WebP(+Pillow 가 지원하면 AVIF) 를 만들어 /assets 로 내보낸다.
+# 파일 이름에 원본 해시가 들어가므로 이미 만들어진 변환본은 재시작해도 다시 인코딩하지 않는다.
+# 원본(/static) 자체는 이름이 안 바뀌므로 짧은 캐시만.
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+IMAGE_SRC_DIR = app.static_folder
+IMAGE_WIDTHS = (480, 800, 1200)
+IMAGE_SIZES = "(min-width: 992px) min(50vw, 900px), 100vw"   # app.css 의 .camp-map img 폭과 맞춤
+IMAGE_FORMATS = [                                            # (확장자, mimetype, Pillow 포맷, 저장 옵션) 좋은 것부터
+    ("avif", "image/avif", "AVIF", {"quality": 55}),
+    ("webp", "image/webp", "WEBP", {"quality": 80, "method": 6}),
+]
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", "3600"))
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = STATIC_MAX_AGE
+
+IMAGE_VARIANTS = {}   # "map_daejeo.png" -> {"src", "width", "height", "sources": [{"type","srcset"}]}
+
+
+def _image_format_ok(fmt: str) -> bool:
+    # AVIF 는 Pillow 11.3+ 휠(libavif 포함)에서만 저장 가능 → requirements 에 11.3.0 고정. 낮은 버전이면 WebP 만
+    Image.init()
+    return fmt in Image.SAVE
+
+
+def _register_built(hashed: str, path: str, mimetype: str):
+    ASSET_FILES[hashed] = {"mimetype": mimetype, "identity": path}
+
+
+def build_images():
+    if Image is None:
+        return
+    formats = [f for f in IMAGE_FORMATS if _image_format_ok(f[2])]
+    for name in sorted(os.listdir(IMAGE_SRC_DIR)):
+        stem, ext = os.path.splitext(name)
+        if not name.startswith("map_") or ext.lower() != ".png":
+            continue
+        src = os.path.join(IMAGE_SRC_DIR, name)
+        with open(src, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()[:10]
+        try:
+            with Image.open(src) as im:
+                im.load()
+                img = im.convert("RGB")
+        except Exception as e:
+            print(f"[images] {name} 변환 생략:", repr(e), flush=True)
+            continue
+        width, height = img.size
+
+        # 원본 폴백도 해시 이름으로 → <img src> 까지 immutable
+        fallback = f"{stem}.{digest}{ext}"
+        _write_atomic(os.path.join(ASSET_BUILD_DIR, fallback), raw)
+        _register_built(fallback, os.path.join(ASSET_BUILD_DIR, fallback), mimetypes.guess_type(name)[0])
+
+        widths = sorted({w for w in IMAGE_WIDTHS if w < width} | {width})
+        sources = []
+        for ext_out, mimetype, pil_fmt, opts in formats:
+            srcset = []
+            for w in widths:
+                hashed = f"{stem}.{digest}.w{w}.{ext_out}"
+                out = os.path.join(ASSET_BUILD_DIR, hashed)
+                if not os.path.exists(out):
+                    resized = img if w == width else img.resize((w, round(height * w / width)), Image.LANCZOS)
+                    tmp = f"{out}.{os.getpid()}.tmp"
+                    resized.save(tmp, pil_fmt, **opts)
+                    os.replace(tmp, out)
+                _register_built(hashed, out, mimetype)
+                srcset.append((hashed, w))
+            sources.append({"type": mimetype, "srcset": srcset})
+        IMAGE_VARIANTS[name] = {"src": fallback, "width": width, "height": height, "sources": sources}
+
+
+def image_media(name: str) -> dict:
+    """캠핑장 media 용: <picture> 에 필요한 URL 들. 변환본이 없으면 /static 원본 그대로."""
+    v = IMAGE_VARIANTS.get(name)
+    if v is None:
+        return {"image_url": url_for("static", filename=name), "image_sources": [],
+                "image_width": None, "image_height": None, "image_sizes": None}
+    return {
+        "image_url": url_for("serve_asset", filename=v["src"]),
+        "image_sources": [
+            {"type": s["type"],
+             "srcset": ", ".join(f"{url_for('serve_asset', filename=n)} {w}w" for n, w in s["srcset"])}
+            for s in v["sources"]
+        ],
+        "image_width": v["width"],
+        "image_height": v["height"],
+        "image_sizes": IMAGE_SIZES,
+    }
+
+
+# ── 빌드 산출물 목록 (manifest.json) ──
+# 워커가 뜰 때마다 압축/이미지 인코딩을 하지 않도록 빌드 결과를 파일로 남기고, 시작할 때는 읽기만 한다.
+# 원본 해시가 안 맞거나 산출물이 없으면(로컬 개발, 빌드 단계 없이 띄운 경우) 그 자리에서 빌드해서 다시 쓴다.
+BUILD_ONLY = os.getenv("BUILD_ONLY", "0") == "1"   # 이미지 빌드 단계: 있는 manifest 를 무시하고 새로 빌드
+STATIC_MANIFEST = os.path.join(ASSET_BUILD_DIR, "manifest.json")
+
+
+def _static_sources() -> dict:
+    """빌드 입력 파일 -> 내용 해시 (manifest 가 지금 원본으로 만든 것인지 확인용)"""
+    out = {}
+    for name in sorted(os.listdir(ASSET_SRC_DIR)):
+        path = os.path.join(ASSET_SRC_DIR, name)
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                out[f"assets/{name}"] = hashlib.sha256(f.read()).hexdigest()
+    for name in sorted(os.listdir(IMAGE_SRC_DIR)):
+        if name.startswith("map_") and name.lower().endswith(".png"):
+            with open(os.path.join(IMAGE_SRC_DIR, name), "rb") as f:
+                out[f"image/{name}"] = hashlib.sha256(f.read()).hexdigest()
+    return out
+
+
+def _rel_files(files: dict, fn) -> dict:
+    # {"mimetype", "identity": 경로, "gzip": 경로, ...} 의 경로만 변환
+    return {h: {k: (v if k == "mimetype" else fn(v)) for k, v in rec.items()} for h, rec in files.items()}
+
+
+def write_static_manifest():
+    data = {
+        "sources": _static_sources(),
+        "assets": ASSET_MANIFEST,
+        "images": IMAGE_VARIANTS,
+        "files": _rel_files(ASSET_FILES, lambda p: os.path.relpath(p, ASSET_BUILD_DIR)),
+    }
+    tmp = f"{STATIC_MANIFEST}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, STATIC_MANIFEST)
+    except OSError as e:
+        print("[assets] manifest 저장 실패:", repr(e), flush=True)
+
+
+def load_static_manifest() -> bool:
+    """manifest 가 최신이고 산출물이 다 있으면 읽어 들이고 True. 아니면 아무것도 바꾸지 않고 False."""
+    try:
+        with open(STATIC_MANIFEST, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if data.get("sources") != _static_sources():
+        return False
+    files = _rel_files(data.get("files") or {}, lambda p: os.path.join(ASSET_BUILD_DIR, p))
+    if not all(os.path.exists(v) for rec in files.values() for k, v in rec.items() if k != "mimetype"):
+        return False
+    ASSET_MANIFEST.update(data["assets"])
+    ASSET_FILES.update(files)
+    IMAGE_VARIANTS.update(data.get("images") or {})
+    return True
+
+
+if BUILD_ONLY or not load_static_manifest():
+    build_assets()
+    build_images()
+    write_static_manifest()
 
 from flask import jsonify
-from threading import Thread, Lock, Semaphore
+from threading import Thread, Lock
 
 YEONGDO_CACHE = {}          # date -> (data, ts)
 YEONGDO_LOCK = Lock()
-YEONGDO_TTL = 180
-
-# 동시에 여러 개 안 띄우도록 (영도/구덕 공용)
-SCRAPER_MAX_CONCURRENCY = int(os.getenv("SCRAPER_MAX_CONCURRENCY", "1"))  # ← 기본 1
-SELENIUM_SEM = Semaphore(SCRAPER_MAX_CONCURRENCY)
 
 # date(str) -> {"ts": float, "ticks": int}
 INFLIGHT = {}
@@ -69,6 +312,1181 @@ def _cache_get(cache, key, ttl):
 def _cache_set(cache, key, data):
     cache[key] = (data, time.time())
 
+
+# ===== 업스트림 호스트별 요청 속도 제한 (token bucket) =====
+# 낙동/대저/화명/영도/구덕/인터파크로 나가는 모든 requests 호출과 driver.get 은
+# http_get / http_post / driver_get 을 거친다. 호스트마다 버킷 하나, 대기열은 우선순위 순.
+import heapq
+import itertools
+import threading
+from contextlib import contextmanager
+from collections import deque
+from urllib.parse import urlparse
+from threading import Condition
+
+PRIO_INTERACTIVE = 0    # 화면을 보고 있는 사용자 요청
+PRIO_BULK = 5           # 월간 조회 등 한 요청이 여러 날짜를 긁는 경우
+PRIO_BACKGROUND = 10    # 감시 루프/워밍업 등
+
+# host -> (초당 요청 수, 버스트)
+UPSTREAM_RATE_DEFAULTS = {
+    "www.nakdongcamping.com": (2.0, 4),
+    "www.daejeocamping.com":  (2.0, 4),
+    "hwamyungcamping.com":    (2.0, 4),
+    "www.yeongdo.go.kr":      (0.5, 2),
+    "gudeok.go.kr":           (0.5, 2),
+    "www.busanpa.com":        (0.5, 2),
+    "ticket.interpark.com":   (0.5, 2),
+}
+UPSTREAM_DEFAULT_RATE = (1.0, 2)
+UPSTREAM_QUEUE_TIMEOUT = float(os.getenv("UPSTREAM_QUEUE_TIMEOUT", "30"))
+
+def _parse_rate_limits(spec: str) -> dict:
+    """UPSTREAM_RATE_LIMITS="www.yeongdo.go.kr=0.2/1,gudeok.go.kr=0.5/2" → {host: (rate, burst)}"""
+    out = {}
+    for part in (spec or "").split(","):
+        if "=" not in part:
+            continue
+        host, val = part.split("=", 1)
+        rate, _, burst = val.partition("/")
+        out[host.strip()] = (float(rate), int(burst or 1))
+    return out
+
+
+class UpstreamError(RuntimeError):
+    """업스트림이 200이 아닌 응답을 준 경우 (메시지는 그대로 화면에 노출)"""
+
+
+class UpstreamThrottled(UpstreamError):
+    """호스트별 대기열에서 UPSTREAM_QUEUE_TIMEOUT 안에 차례가 오지 않음"""
+
+
+class TokenBucket:
+    """rate(개/초)로 채워지고 burst까지 쌓이는 버킷. 잠금은 호출자가 책임진다."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.last = time.monotonic()
+
+    def take_or_delay(self, cost: float = 1) -> float:
+        """토큰이 cost개 있으면 쓰고 0, 없으면 모일 때까지 남은 초. (cost 는 burst 를 넘지 않게 자름)"""
+        cost = min(cost, self.burst)
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+    def idle_full(self) -> bool:
+        """지금 시점이면 버킷이 가득 찼을 것 (오래 안 쓴 클라이언트 정리용)"""
+        return self.tokens + (time.monotonic() - self.last) * self.rate >= self.burst
+
+
+class HostRateLimiter:
+    """호스트 하나의 버킷 + 우선순위 대기열 + 대기시간 지표."""
+
+    def __init__(self, host: str, rate: float, burst: int):
+        self.host = host
+        self.bucket = TokenBucket(rate, burst)
+        self.cond = Condition()
+        self.waiters = []               # heap: (priority, seq)
+        self.seq = itertools.count()
+        self.requests = 0
+        self.timeouts = 0
+        self.waits = deque(maxlen=500)  # 최근 대기시간(초)
+
+    def acquire(self, priority: int = PRIO_INTERACTIVE, timeout: float | None = None) -> float:
+        t0 = time.monotonic()
+        ticket = (priority, next(self.seq))
+        with self.cond:
+            heapq.heappush(self.waiters, ticket)
+            try:
+                while True:
+                    if self.waiters[0] == ticket:
+                        delay = self.bucket.take_or_delay()
+                        if delay <= 0:
+                            break
+                    else:
+                        delay = None    # 앞사람이 나갈 때 notify 받음
+                    if timeout is not None:
+                        remaining = timeout - (time.monotonic() - t0)
+                        if remaining <= 0:
+                            self.timeouts += 1
+                            raise UpstreamThrottled(f"요청이 많아 잠시 후 다시 시도해 주세요. ({self.host})")
+                        delay = remaining if delay is None else min(delay, remaining)
+                    self.cond.wait(delay)
+            finally:
+                if self.waiters and self.waiters[0] == ticket:
+                    heapq.heappop(self.waiters)
+                else:
+                    self.waiters.remove(ticket)
+                    heapq.heapify(self.waiters)
+                self.cond.notify_all()
+            waited = time.monotonic() - t0
+            self.requests += 1
+            self.waits.append(waited)
+        return waited
+
+    def metrics(self) -> dict:
+        with self.cond:
+            waits = sorted(self.waits)
+            queued = len(self.waiters)
+        pct = lambda p: round(waits[min(len(waits) - 1, int(len(waits) * p))] * 1000, 1) if waits else 0.0
+        return {
+            "rate": self.bucket.rate,
+            "burst": self.bucket.burst,
+            "requests": self.requests,
+            "timeouts": self.timeouts,
+            "queued_now": queued,
+            "wait_avg_ms": round(sum(waits) / len(waits) * 1000, 1) if waits else 0.0,
+            "wait_p50_ms": pct(0.5),
+            "wait_p99_ms": pct(0.99),
+            "wait_max_ms": round(waits[-1] * 1000, 1) if waits else 0.0,
+        }
+
+
+UPSTREAM_RATES = {**UPSTREAM_RATE_DEFAULTS, **_parse_rate_limits(os.getenv("UPSTREAM_RATE_LIMITS", ""))}
+UPSTREAM_LIMITERS = {}
+_UPSTREAM_LIMITERS_LOCK = Lock()
+_FETCH_CTX = threading.local()
+
+def _limiter_for(host: str) -> HostRateLimiter:
+    with _UPSTREAM_LIMITERS_LOCK:
+        lim = UPSTREAM_LIMITERS.get(host)
+        if lim is None:
+            rate, burst = UPSTREAM_RATES.get(host, UPSTREAM_DEFAULT_RATE)
+            lim = UPSTREAM_LIMITERS[host] = HostRateLimiter(host, rate, burst)
+        return lim
+
+@contextmanager
+def fetch_priority(priority: int):
+    """이 스레드에서 나가는 업스트림 요청의 우선순위를 잠시 바꾼다."""
+    prev = getattr(_FETCH_CTX, "priority", PRIO_INTERACTIVE)
+    _FETCH_CTX.priority = priority
+    try:
+        yield
+    finally:
+        _FETCH_CTX.priority = prev
+
+def with_priority(priority: int, fn, *args, **kwargs):
+    """다른 스레드(executor 등)에서 우선순위를 지정해 실행할 때 쓰는 래퍼."""
+    with fetch_priority(priority):
+        return fn(*args, **kwargs)
+
+def upstream_acquire(url: str) -> float:
+    host = urlparse(url).hostname or ""
+    prio = getattr(_FETCH_CTX, "priority", PRIO_INTERACTIVE)
+    return _limiter_for(host).acquire(prio, timeout=UPSTREAM_QUEUE_TIMEOUT)
+
+# 부하 테스트용: UPSTREAM_OVERRIDE=http://127.0.0.1:9000 이면
+# https://www.nakdongcamping.com/reservation/real_time?... → http://127.0.0.1:9000/www.nakdongcamping.com/reservation/real_time?...
+# (loadtest/fake_upstream.py 가 이 형태로 받는다). 속도 제한은 원래 호스트 기준 그대로.
+UPSTREAM_OVERRIDE = os.getenv("UPSTREAM_OVERRIDE", "").rstrip("/")
+
+def upstream_url(url: str) -> str:
+    if not UPSTREAM_OVERRIDE:
+        return url
+    p = urlparse(url)
+    if not p.hostname or url.startswith(UPSTREAM_OVERRIDE + "/"):
+        return url
+    return f"{UPSTREAM_OVERRIDE}/{p.hostname}{p.path or '/'}" + (f"?{p.query}" if p.query else "")
+
+# ===== 수집 녹화/재생 (SCRAPER_MODE=record|replay) =====
+# record: 업스트림 HTTP 응답(GET/POST)과 Selenium page_source 스냅샷을 사이트/날짜별로 디스크에 저장
+# replay: 네트워크/브라우저 없이 저장본으로 같은 파싱 경로를 돌림 (프로파일링·회귀 확인용)
+#   SCRAPER_TAPE_DIR/<site>/<date>/GET-<hash>.json, POST-<hash>.json, selenium-<name>.html
+import functools
+
+SCRAPER_MODE = os.getenv("SCRAPER_MODE", "").strip().lower()   # "" | "record" | "replay"
+SCRAPER_TAPE_DIR = os.getenv("SCRAPER_TAPE_DIR") or os.path.join(app.root_path, "tapes")
+
+
+class TapeMiss(UpstreamError):
+    """replay 모드인데 녹화본이 없음"""
+
+
+@contextmanager
+def tape_scope(site: str, d: str | None):
+    """이 스레드의 업스트림 요청/스냅샷을 <site>/<date> 아래에 기록(또는 재생)"""
+    prev = getattr(_FETCH_CTX, "tape", None)
+    _FETCH_CTX.tape = (site, d or "nodate")
+    try:
+        yield
+    finally:
+        _FETCH_CTX.tape = prev
+
+def taped(site: str):
+    """fetch_*(selected_date, ...) 함수용 데코레이터: tape_scope(site, selected_date)"""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            d = kwargs.get("selected_date", args[0] if args else None)
+            with tape_scope(site, d):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+def _tape_path(name: str) -> str:
+    site, d = getattr(_FETCH_CTX, "tape", None) or ("misc", "nodate")
+    return os.path.join(SCRAPER_TAPE_DIR, site, d, name)
+
+def _tape_name(method: str, url: str, data) -> str:
+    body = json.dumps(data, sort_keys=True, ensure_ascii=False) if data else ""
+    return f"{method}-{hashlib.sha1(f'{url}|{body}'.encode('utf-8')).hexdigest()[:16]}.json"
+
+def _tape_write(path: str, text: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+def _tape_read(path: str) -> str:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        raise TapeMiss(f"녹화본 없음: {os.path.relpath(path, SCRAPER_TAPE_DIR)}") from None
+
+
+class TapeResponse:
+    """replay 용 requests.Response 대용 (파서가 쓰는 속성만)"""
+    def __init__(self, rec: dict):
+        self.url = rec["url"]
+        self.status_code = rec["status"]
+        self.headers = rec.get("headers") or {}
+        self.text = rec["text"]
+        self.content = self.text.encode("utf-8")
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} (replay) for url: {self.url}", response=self)
+
+
+def tape_http(method: str, url: str, data, send):
+    """record/replay 를 거쳐 업스트림 호출. send() 는 실제 요청을 보내는 콜백."""
+    name = _tape_name(method, url, data)
+    if SCRAPER_MODE == "replay":
+        return TapeResponse(json.loads(_tape_read(_tape_path(name))))
+    r = send()
+    if SCRAPER_MODE == "record":
+        _tape_write(_tape_path(name), json.dumps({
+            "method": method, "url": url, "data": data, "status": r.status_code,
+            "headers": {"Content-Type": r.headers.get("Content-Type", "")},
+            "text": r.text, "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        }, ensure_ascii=False))
+    return r
+
+def tape_snapshot(driver, name: str):
+    """record 모드면 현재 page_source 를 selenium-<name>.html 로 저장"""
+    if SCRAPER_MODE != "record":
+        return
+    try:
+        _tape_write(_tape_path(f"selenium-{name}.html"), driver.page_source)
+    except Exception as e:
+        print(f"[tape] snapshot {name} 실패:", repr(e), flush=True)
+
+def tape_page_source(name: str) -> str:
+    """replay 모드: 저장된 selenium-<name>.html"""
+    return _tape_read(_tape_path(f"selenium-{name}.html"))
+
+
+# ===== 단계별 트레이싱 (span) =====
+# with span("yeongdo.calendar"): ... 처럼 감싸면 스레드별 스택으로 중첩 구간/소요시간을 모은다.
+# 가장 바깥 span 이 끝나면 트레이스 1건 → 최근 TRACE_KEEP 건은 메모리(/api/traces),
+# TRACE_FILE 이 있으면 JSON 한 줄씩 추가 기록.
+TRACE_FILE = os.getenv("TRACE_FILE", "")
+TRACE_KEEP = int(os.getenv("TRACE_KEEP", "50"))
+TRACES = deque(maxlen=TRACE_KEEP)
+TRACE_LOCK = Lock()
+
+
+@contextmanager
+def span(name: str, **attrs):
+    stack = getattr(_FETCH_CTX, "spans", None)
+    if stack is None:
+        stack = _FETCH_CTX.spans = []
+    node = {"name": name, "start": round(time.time(), 3), "ms": None, "attrs": attrs, "children": []}
+    if stack:
+        stack[-1]["children"].append(node)
+    stack.append(node)
+    t0 = time.perf_counter()
+    try:
+        yield node
+    except BaseException as e:
+        node["error"] = repr(e)[:300]
+        raise
+    finally:
+        node["ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        stack.pop()
+        if not stack:
+            _finish_trace(node)
+
+def span_attrs(**attrs):
+    """현재 span 에 속성 추가 (예: 달력 이동 횟수, 추출 재시도 횟수)"""
+    stack = getattr(_FETCH_CTX, "spans", None)
+    if stack:
+        stack[-1]["attrs"].update(attrs)
+
+def traced(name: str):
+    """함수 전체를 span 으로 감싸는 데코레이터. 인자 중 YYYY-MM-DD 문자열이 있으면 date 속성으로."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            d = next((a for a in (*args, *kwargs.values())
+                      if isinstance(a, str) and re.fullmatch(r"\d{4}-\d{2}-\d{2}", a)), None)
+            with span(name, **({"date": d} if d else {})):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+def _finish_trace(root: dict):
+    root["trace_id"] = uuid4().hex[:12]
+    root["pid"] = os.getpid()
+    root["thread"] = threading.current_thread().name
+    with TRACE_LOCK:
+        TRACES.append(root)
+        if TRACE_FILE:
+            try:
+                with open(TRACE_FILE, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(root, ensure_ascii=False, default=str) + "\n")
+            except OSError as e:
+                print("[trace] write failed:", repr(e), flush=True)
+
+def _trace_stages(node: dict, prefix: str, out: dict):
+    path = f"{prefix}/{node['name']}" if prefix else node["name"]
+    out.setdefault(path, []).append(node["ms"] or 0.0)
+    for ch in node["children"]:
+        _trace_stages(ch, path, out)
+
+
+# 운영용 엔드포인트(/api/traces, /api/metrics)는 호스트·대기열·클라이언트 수 같은 내부 상태를 드러낸다.
+# ADMIN_TOKEN 을 설정한 배포에서 X-Admin-Token 헤더가 맞을 때만 열고, 그 밖에는 없는 경로처럼 404.
+import hmac
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+
+def admin_only(fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        given = request.headers.get("X-Admin-Token", "")
+        if not ADMIN_TOKEN or not hmac.compare_digest(given.encode("utf-8"), ADMIN_TOKEN.encode("utf-8")):
+            return "not found", 404
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+@app.route("/api/traces")
+@admin_only
+def api_traces():
+    """
+    ?n=20&name=fetch_yeongdo  최근 트레이스(최신순)
+    ?summary=1                 단계(span 경로)별 횟수/평균/p50/최대 ms — 어디가 느린지 한눈에
+    """
+    n = max(1, min(request.args.get("n", 20, type=int), TRACE_KEEP))   # 숫자가 아니면 기본값
+    name = request.args.get("name")
+    with TRACE_LOCK:
+        traces = [t for t in TRACES if not name or t["name"] == name]
+    if request.args.get("summary"):
+        stages = {}
+        for t in traces:
+            _trace_stages(t, "", stages)
+        return jsonify({"pid": os.getpid(), "traces": len(traces), "stages": {
+            path: {"count": len(v), "avg_ms": round(sum(v) / len(v), 1),
+                   "p50_ms": sorted(v)[len(v) // 2], "max_ms": max(v)}
+            for path, v in sorted(stages.items())
+        }})
+    return jsonify({"pid": os.getpid(), "traces": traces[::-1][:n]})
+
+
+def _acquire_traced(url: str):
+    with span("ratelimit.wait", host=urlparse(url).hostname):
+        upstream_acquire(url)
+
+def http_get(url: str, session=None, **kwargs):
+    def send():
+        _acquire_traced(url)
+        return (session or requests).get(upstream_url(url), **kwargs)
+    with span("http.get", host=urlparse(url).hostname):
+        return tape_http("GET", url, kwargs.get("params"), send)
+
+def http_post(url: str, session=None, **kwargs):
+    def send():
+        _acquire_traced(url)
+        return (session or requests).post(upstream_url(url), **kwargs)
+    with span("http.post", host=urlparse(url).hostname):
+        return tape_http("POST", url, kwargs.get("data"), send)
+
+def driver_get(driver, url: str):
+    with span("driver.get", host=urlparse(url).hostname):
+        _acquire_traced(url)
+        driver.get(upstream_url(url))
+
+
+# /api/metrics 섹션 등록: name -> () -> dict
+METRICS_SECTIONS = {
+    "upstream": lambda: {host: lim.metrics() for host, lim in list(UPSTREAM_LIMITERS.items())},
+}
+
+@app.route("/api/metrics")
+@admin_only
+def api_metrics():
+    return jsonify({name: fn() for name, fn in METRICS_SECTIONS.items()})
+
+
+# ===== 사이트 비트셋 =====
+# 구역별 사이트 집합을 파이썬 int 하나로 (bit i = i번 사이트).
+# 합/교/차/개수가 리스트 정렬·set 변환 없이 워드 단위 연산으로 끝난다.
+import base64
+
+_DASH_STRIDE = 16   # 구덕식 "1-2" → 1*16 + 2. 뒷번호가 16 이상이면 _site_format 이 "dash:<간격>" 으로 넓힌다
+
+def _dash_stride(fmt: str | None) -> int:
+    """'dash' → 16, 'dash:32' → 32, 그 밖의 형식은 기본값"""
+    if fmt and fmt.startswith("dash:"):
+        return int(fmt[len("dash:"):])
+    return _DASH_STRIDE
+
+def _site_index(site, stride: int = _DASH_STRIDE) -> int:
+    if isinstance(site, int):
+        return site
+    s = str(site).strip()
+    m = re.match(r"^(\d+)-(\d+)$", s)
+    if m:
+        sub = int(m.group(2))
+        if sub >= stride:
+            raise ValueError(f"사이트 뒷번호가 간격({stride})을 넘습니다: {site!r}")
+        return int(m.group(1)) * stride + sub
+    m = re.search(r"(\d+)$", s)
+    if not m:
+        raise ValueError(f"사이트 번호를 알 수 없습니다: {site!r}")
+    return int(m.group(1))
+
+def _site_label(idx: int, fmt: str):
+    if fmt == "int":
+        return idx
+    if fmt == "dash" or fmt.startswith("dash:"):
+        stride = _dash_stride(fmt)
+        return f"{idx // stride}-{idx % stride}"
+    if fmt.startswith("prefix:"):
+        prefix, _, pad = fmt[len("prefix:"):].partition(":")   # "prefix:D" | "prefix:D:02d"
+        return prefix + format(idx, pad or "d")
+    return format(idx, fmt)     # "02d" 등 zero-padding
+
+def _pad_format(nums) -> str:
+    """숫자 부분(문자열)들의 표기: 자릿수가 모두 같을 때만 zero-padding('02d'), 섞여 있으면 패딩 없음('d')"""
+    widths = {len(n) for n in nums}
+    return f"0{widths.pop()}d" if len(widths) == 1 else "d"
+
+def _site_format(sites) -> str:
+    """
+    목록의 표기 형식 추정: 'int'(영도) | '02d' / 'd'(낙동 계열) | 'prefix:D' / 'prefix:D:02d'(화명 D/E, 'B-' 부산항)
+    | 'dash' / 'dash:<간격>'(구덕, 뒷번호 최댓값에 맞춰 간격을 2배씩 넓힘).
+    첫 항목이 아니라 전체 항목을 보고 정하므로 순서와 무관하다 (['3', '12'] 와 ['12', '3'] 은 같은 'd').
+    접두어는 모든 항목에 같아야 한다. 모든 항목이 그 형식으로 되돌아오지 않으면 ValueError.
+    """
+    sites = list(sites or [])
+    if not sites:
+        return "int"
+    ints = [isinstance(v, int) for v in sites]
+    if all(ints):
+        fmt = "int"
+    elif any(ints):
+        raise ValueError(f"사이트 표기가 섞여 있습니다: {sites[ints.index(True)]!r} (숫자와 문자열)")
+    else:
+        labels = [str(v).strip() for v in sites]
+        dashed = [re.match(r"^\d+-(\d+)$", s) for s in labels]
+        prefixed = [re.match(r"^(\D+)(\d+)$", s) for s in labels]
+        if all(dashed):
+            stride = _DASH_STRIDE
+            while stride <= max(int(m.group(1)) for m in dashed):
+                stride *= 2
+            fmt = "dash" if stride == _DASH_STRIDE else f"dash:{stride}"
+        elif all(re.match(r"^\d+$", s) for s in labels):
+            fmt = _pad_format(labels)
+        elif all(prefixed):
+            prefixes = {m.group(1) for m in prefixed}
+            if len(prefixes) > 1:
+                raise ValueError(f"사이트 접두어가 섞여 있습니다: {sorted(prefixes)}")
+            pad = _pad_format(m.group(2) for m in prefixed)
+            fmt = "prefix:" + prefixes.pop() + ("" if pad in ("d", "01d") else f":{pad}")
+        else:
+            bad = next((v for v, s in zip(sites, labels) if not re.match(r"^(\d+-\d+|\d+|\D+\d+)$", s)), None)
+            if bad is not None:
+                raise ValueError(f"사이트 표기를 알 수 없습니다: {bad!r}")
+            raise ValueError(f"사이트 표기가 섞여 있습니다: {sites!r}")
+    for v in sites:
+        if _site_label(_site_index(v, _dash_stride(fmt)), fmt) != (v if fmt == "int" else str(v).strip()):
+            raise ValueError(f"사이트 표기가 섞여 있습니다: {v!r} ({fmt})")
+    return fmt
+
+
+class SiteBits:
+    """사이트 번호 집합 (int 비트셋). |, &, -, len(popcount), in 지원."""
+    __slots__ = ("bits",)
+
+    def __init__(self, bits: int = 0):
+        self.bits = bits
+
+    @classmethod
+    def from_sites(cls, sites, fmt: str | None = None) -> "SiteBits":
+        """fmt 는 'dash:<간격>' 처럼 간격이 기본과 다를 때만 필요 (_site_format 결과를 그대로 넘기면 됨)"""
+        stride = _dash_stride(fmt)
+        b = 0
+        for s in sites or ():
+            b |= 1 << _site_index(s, stride)
+        return cls(b)
+
+    def __or__(self, other):  return SiteBits(self.bits | other.bits)
+    def __and__(self, other): return SiteBits(self.bits & other.bits)
+    def __sub__(self, other): return SiteBits(self.bits & ~other.bits)
+    def __len__(self):        return self.bits.bit_count()
+    def __bool__(self):       return self.bits != 0
+    def __eq__(self, other):  return isinstance(other, SiteBits) and self.bits == other.bits
+    def __hash__(self):       return hash(self.bits)
+    def __repr__(self):       return f"SiteBits({list(self)})"
+
+    def __contains__(self, site):
+        return bool((self.bits >> _site_index(site)) & 1)
+
+    def __iter__(self):
+        # 오름차순 비트 번호
+        b = self.bits
+        while b:
+            low = b & -b
+            yield low.bit_length() - 1
+            b ^= low
+
+    def labels(self, fmt: str) -> list:
+        return [_site_label(i, fmt) for i in self]
+
+    def to_wire(self) -> str:
+        """little-endian 바이트 → base64url(패딩 제거). 40개 사이트 = 8글자."""
+        raw = self.bits.to_bytes(max(1, (self.bits.bit_length() + 7) // 8), "little")
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+    @classmethod
+    def from_wire(cls, s: str) -> "SiteBits":
+        raw = base64.urlsafe_b64decode(s + "=" * (-len(s) % 4))
+        return cls(int.from_bytes(raw, "little"))
+
+
+def merge_sites(a, b) -> list:
+    """두 사이트 목록의 합집합(원래 표기 유지, 번호 오름차순)."""
+    a, b = list(a or []), list(b or [])
+    fmt = _site_format(a + b)
+    return (SiteBits.from_sites(a, fmt) | SiteBits.from_sites(b, fmt)).labels(fmt)
+
+
+def encode_areas_bits(data: dict) -> dict:
+    """
+    ?enc=bits 응답용: 구역별 available/unavailable 리스트를 비트셋 wire 문자열로 바꾼다.
+    개수 필드(num_available, total 등)는 그대로 두고, 표기 형식은 fmt로 같이 내려준다.
+    """
+    out = {}
+    for area, info in (data or {}).items():
+        if not isinstance(info, dict) or "available" not in info:
+            out[area] = info
+            continue
+        av, un = info.get("available") or [], info.get("unavailable") or []
+        try:
+            fmt = _site_format(av + un)
+        except ValueError:
+            out[area] = info   # 변환 불가한 구역은 JSON 그대로
+            continue
+        enc = {k: v for k, v in info.items() if k not in ("available", "unavailable")}
+        enc.update({
+            "fmt": fmt,
+            "available": SiteBits.from_sites(av, fmt).to_wire(),
+            "unavailable": SiteBits.from_sites(un, fmt).to_wire(),
+        })
+        out[area] = enc
+    return out
+
+
+# ===== 변경 피드: (camp, date)별 버전 스냅샷 + 사이트 단위 diff =====
+# gunicorn 워커 여러 개가 같은 버전 체계를 보도록 스냅샷/이벤트는 공유 SQLite(STATE_DB)에 둔다.
+# 버전 = feed_events 의 자동 증가 키, epoch = DB 파일이 처음 만들어질 때 한 번 정해지는 값
+# → 폴링이 어느 워커로 가든, 워커가 재시작돼도 같은 since/epoch 로 이어진다.
+import sqlite3
+
+STATE_DB = os.getenv("STATE_DB", os.path.join(tempfile.gettempdir(), "campingbusan-history.sqlite3"))  # 기본: 수집 이력과 같은 파일
+_STATE_MEMORY_URI = "file:campingbusan-state?mode=memory&cache=shared"   # STATE_DB="" 이면 프로세스 안에서만 공유
+
+STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feed_meta (
+    k TEXT PRIMARY KEY,
+    v TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS feed_snapshots (
+    camp     TEXT    NOT NULL,
+    resdate  TEXT    NOT NULL,
+    version  INTEGER NOT NULL,
+    ts       REAL    NOT NULL,
+    areas    TEXT    NOT NULL,   -- JSON {area: {"fmt", "available": wire, "unavailable": wire}}
+    PRIMARY KEY (camp, resdate)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS feed_events (
+    version  INTEGER PRIMARY KEY AUTOINCREMENT,
+    camp     TEXT    NOT NULL,
+    resdate  TEXT    NOT NULL,
+    ts       REAL    NOT NULL,
+    initial  INTEGER NOT NULL,
+    changes  TEXT    NOT NULL    -- JSON {area: {"opened": [...], "taken": [...]}}
+);
+CREATE INDEX IF NOT EXISTS idx_feed_events_key ON feed_events (camp, resdate, version);
+"""
+_STATE_LOCAL = threading.local()
+_STATE_ANCHOR = None   # 메모리 DB 는 연결이 하나라도 열려 있어야 유지됨
+
+def _state_db():
+    """스레드별 연결 (autocommit; 쓰기는 BEGIN IMMEDIATE 로 워커 간 직렬화)"""
+    global _STATE_ANCHOR
+    conn = getattr(_STATE_LOCAL, "conn", None)
+    if conn is None:
+        if STATE_DB:
+            conn = sqlite3.connect(STATE_DB, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        else:
+            conn = sqlite3.connect(_STATE_MEMORY_URI, uri=True, timeout=10, isolation_level=None,
+                                   check_same_thread=False)
+            if _STATE_ANCHOR is None:
+                _STATE_ANCHOR = conn
+        conn.executescript(STATE_SCHEMA)
+        _STATE_LOCAL.conn = conn
+    return conn
+
+@contextmanager
+def _state_tx():
+    """쓰기 트랜잭션: 다른 워커의 쓰기와 겹치지 않게 시작부터 쓰기 잠금"""
+    conn = _state_db()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+def _state_epoch() -> str:
+    with _state_tx() as conn:
+        conn.execute("INSERT OR IGNORE INTO feed_meta (k, v) VALUES ('epoch', ?)", (uuid4().hex[:8],))
+        return conn.execute("SELECT v FROM feed_meta WHERE k = 'epoch'").fetchone()[0]
+
+
+CHANGE_LOCK = Lock()
+CHANGE_EPOCH = _state_epoch()   # 모든 워커가 같은 값. DB 가 새로 만들어지면 바뀌므로 클라이언트가 감지
+SNAPSHOT_MAX = int(os.getenv("SNAPSHOT_MAX", "500"))
+CHANGE_FEED_MAX = int(os.getenv("CHANGE_FEED_MAX", "2000"))   # 보존하는 최근 변경 이벤트 수
+CHANGE_STATS = {}           # (camp, date) -> {"p": 재수집 1회당 변경 확률(EWMA), "n": 관측 수} — TTL 정책이 사용 (워커별)
+
+def _snapshot_areas(data: dict, camp: str = "", d: str = "") -> dict:
+    """스크랩 결과에서 구역별 available/unavailable 을 비트셋으로 뽑아 비교용으로 정리."""
+    out = {}
+    for area, info in (data or {}).items():
+        if not isinstance(info, dict) or "available" not in info:
+            continue
+        av, un = list(info.get("available") or []), list(info.get("unavailable") or [])
+        try:
+            fmt = _site_format(av + un)
+        except ValueError as e:
+            print(f"[snapshot][{camp}][{d}] {area} skipped (표기 해석 실패):", e, flush=True)
+            continue
+        out[area] = {"fmt": fmt, "available": SiteBits.from_sites(av, fmt), "unavailable": SiteBits.from_sites(un, fmt)}
+    return out
+
+def _areas_to_json(areas: dict) -> str:
+    return json.dumps({
+        area: {"fmt": a["fmt"], "available": a["available"].to_wire(), "unavailable": a["unavailable"].to_wire()}
+        for area, a in areas.items()
+    })
+
+def _areas_from_json(s: str) -> dict:
+    return {
+        area: {"fmt": a["fmt"], "available": SiteBits.from_wire(a["available"]),
+               "unavailable": SiteBits.from_wire(a["unavailable"])}
+        for area, a in json.loads(s).items()
+    }
+
+def load_snapshot(camp: str, d: str):
+    """공유 DB 의 마지막 스냅샷 {"version", "ts", "areas"(비트셋)} 또는 None"""
+    row = _state_db().execute(
+        "SELECT version, ts, areas FROM feed_snapshots WHERE camp = ? AND resdate = ?", (camp, d)).fetchone()
+    if not row:
+        return None
+    return {"version": row[0], "ts": row[1], "areas": _areas_from_json(row[2])}
+
+def _snapshot_view(snap: dict) -> dict:
+    """JSON 응답용: 비트셋 → 원래 표기의 리스트"""
+    return {
+        "version": snap["version"],
+        "ts": snap["ts"],
+        "areas": {
+            area: {"available": a["available"].labels(a["fmt"]), "unavailable": a["unavailable"].labels(a["fmt"])}
+            for area, a in snap["areas"].items()
+        },
+    }
+
+def diff_areas(prev: dict | None, areas: dict) -> dict:
+    """구역별 opened(새로 예약 가능) / taken(새로 마감). prev 가 없으면 전부 opened."""
+    changes = {}
+    for area, cur in areas.items():
+        p = prev.get(area) if prev else None
+        before = p["available"] if p else SiteBits()
+        after = cur["available"]
+        fmt = cur["fmt"]
+        if p and p["fmt"] != fmt:
+            # 구덕 간격이 바뀌면(dash → dash:32) 비트 위치가 달라지므로 공통 형식으로 다시 만들어 비교
+            old_labels, new_labels = before.labels(p["fmt"]), after.labels(fmt)
+            fmt = _site_format(old_labels + new_labels)
+            before, after = SiteBits.from_sites(old_labels, fmt), SiteBits.from_sites(new_labels, fmt)
+        opened, taken = after - before, before - after
+        if opened or taken:
+            changes[area] = {"opened": opened.labels(fmt), "taken": taken.labels(fmt)}
+    return changes
+
+def record_snapshot(camp: str, d: str, data: dict):
+    """
+    스크랩이 끝날 때마다 호출. 공유 DB 의 직전 스냅샷과 비교해서
+    구역별 opened / taken 을 계산하고 변경 피드에 쌓는다.
+    변화가 없으면 버전을 올리지 않는다. 반환: 새 이벤트 또는 None
+    """
+    if not data or data.get("error"):
+        return None
+    areas = _snapshot_areas(data, camp, d)
+    # 전 구역이 비어 있으면 수집 실패로 보고 기록하지 않음 (가짜 '마감' diff 방지)
+    if not any(a["available"] or a["unavailable"] for a in areas.values()):
+        return None
+
+    now = time.time()
+    history_record(camp, d, areas, now)
+    with CHANGE_LOCK, _state_tx() as conn:
+        row = conn.execute("SELECT areas FROM feed_snapshots WHERE camp = ? AND resdate = ?", (camp, d)).fetchone()
+        prev = _areas_from_json(row[0]) if row else None
+        changes = diff_areas(prev, areas)
+
+        if prev is not None:
+            st = CHANGE_STATS.setdefault((camp, d), {"p": 0.5, "n": 0})
+            st["p"] = 0.7 * st["p"] + 0.3 * (1.0 if changes else 0.0)
+            st["n"] += 1
+            if len(CHANGE_STATS) > SNAPSHOT_MAX:
+                CHANGE_STATS.pop(next(iter(CHANGE_STATS)))
+
+        if prev is not None and not changes:
+            conn.execute("UPDATE feed_snapshots SET ts = ? WHERE camp = ? AND resdate = ?", (now, camp, d))
+            return None
+
+        version = conn.execute(
+            "INSERT INTO feed_events (camp, resdate, ts, initial, changes) VALUES (?, ?, ?, ?, ?)",
+            (camp, d, now, int(prev is None), json.dumps(changes, ensure_ascii=False)),
+        ).lastrowid
+        conn.execute(
+            "INSERT INTO feed_snapshots (camp, resdate, version, ts, areas) VALUES (?, ?, ?, ?, ?)"
+            " ON CONFLICT (camp, resdate) DO UPDATE SET version = excluded.version, ts = excluded.ts,"
+            " areas = excluded.areas",
+            (camp, d, version, now, _areas_to_json(areas)),
+        )
+        # 보존 범위: 이벤트는 최근 CHANGE_FEED_MAX 개, 스냅샷은 최근 갱신 순 SNAPSHOT_MAX 개
+        conn.execute("DELETE FROM feed_events WHERE version <= ?", (version - CHANGE_FEED_MAX,))
+        conn.execute(
+            "DELETE FROM feed_snapshots WHERE (camp, resdate) IN"
+            " (SELECT camp, resdate FROM feed_snapshots ORDER BY ts DESC LIMIT -1 OFFSET ?)",
+            (SNAPSHOT_MAX,),
+        )
+    event = {
+        "version": version,
+        "camp": camp,
+        "date": d,
+        "ts": now,
+        "initial": prev is None,
+        "changes": changes,
+    }
+    _notify_watchers(event)
+    return event
+
+def snapshot_version(camp: str, d: str) -> int:
+    row = _state_db().execute(
+        "SELECT version FROM feed_snapshots WHERE camp = ? AND resdate = ?", (camp, d)).fetchone()
+    return row[0] if row else 0
+
+
+@app.route("/api/changes")
+def api_changes():
+    """
+    ?since=<version>[&camp=...&date=...]
+    since 이후의 변경 이벤트만 돌려준다. since가 보존 범위 밖이거나
+    epoch가 다르면 reset=True → 클라이언트는 전체 데이터를 다시 받아야 함.
+    """
+    since = request.args.get("since", default=0, type=int)
+    camp = request.args.get("camp")
+    d = request.args.get("date")
+    epoch = request.args.get("epoch")
+
+    conn = _state_db()
+    latest, oldest = conn.execute("SELECT MAX(version), MIN(version) FROM feed_events").fetchone()
+    latest = latest or 0
+    oldest = oldest or latest + 1
+    sql, params = "SELECT version, camp, resdate, ts, initial, changes FROM feed_events WHERE version > ?", [since]
+    if camp:
+        sql, params = sql + " AND camp = ?", params + [camp]
+    if d:
+        sql, params = sql + " AND resdate = ?", params + [d]
+    events = [
+        {"version": v, "camp": c, "date": rd, "ts": ts, "initial": bool(ini), "changes": json.loads(ch)}
+        for v, c, rd, ts, ini, ch in conn.execute(sql + " ORDER BY version", params)
+    ]
+    snap = load_snapshot(camp, d) if camp and d else None
+    snap = _snapshot_view(snap) if snap else None
+
+    reset = (epoch is not None and epoch != CHANGE_EPOCH) or (0 < since < oldest - 1) or since > latest
+    payload = {"version": latest, "epoch": CHANGE_EPOCH, "since": since, "reset": reset, "changes": [] if reset else events}
+    if reset and snap:
+        payload["snapshot"] = snap
+    return jsonify(payload)
+
+
+# ===== 캐시 TTL 정책 (날짜별 신선도) =====
+# 오늘 밤 자리는 분 단위로 바뀌고 두 달 뒤 자리는 거의 안 바뀐다 → 고정 TTL 대신 (camp, date) 마다:
+#   리드타임 구간별 기본값 × 주말(금·토 밤) × 성수기 × 관측된 변경률 × 캠핑장 비용(ttl_scale)
+# 가까운/붐비는 날짜는 자주, 먼/조용한 날짜는 드물게 재수집해서 업스트림·브라우저 용량을 아낀다.
+TTL_BY_LEAD = [(0, 60), (2, 120), (7, 300), (30, 900)]   # (리드타임 일수 이하, 기본 TTL 초)
+TTL_FAR = int(os.getenv("TTL_FAR_SEC", "3600"))           # 위 구간보다 먼 날짜
+TTL_MIN = int(os.getenv("TTL_MIN_SEC", "30"))
+TTL_MAX = int(os.getenv("TTL_MAX_SEC", "3600"))
+TTL_WEEKEND = 0.5
+TTL_PEAK = 0.5
+PEAK_MONTHS = (7, 8)    # 성수기 (요금표의 성수기 구분과 같은 기준)
+
+
+def is_peak_season(d: str) -> bool:
+    return int(d[5:7]) in PEAK_MONTHS
+
+
+def is_weekend_night(d: str) -> bool:
+    """금·토 밤 (요금표의 '주말')"""
+    return datetime.strptime(d, "%Y-%m-%d").weekday() in (4, 5)
+
+
+def _ttl_for(camp: str, d: str) -> float:
+    try:
+        lead = (datetime.strptime(d, "%Y-%m-%d").date() - date.today()).days
+    except ValueError:
+        return TTL_MIN
+    ttl = next((t for days, t in TTL_BY_LEAD if lead <= days), TTL_FAR)
+    if is_weekend_night(d):
+        ttl *= TTL_WEEKEND
+    if is_peak_season(d):
+        ttl *= TTL_PEAK
+    with CHANGE_LOCK:
+        st = CHANGE_STATS.get((camp, d))
+    if st and st["n"] >= 3:
+        ttl *= 1.5 - st["p"]     # 한 번도 안 바뀜 → 1.5배, 매번 바뀜 → 0.5배
+    spec = CAMPS.get(camp)
+    if spec is not None:
+        ttl *= spec.ttl_scale
+    return max(TTL_MIN, min(TTL_MAX, ttl))
+
+
+def _ttl_metrics() -> dict:
+    today = date.today()
+    probe = {f"+{n}d": (today + timedelta(days=n)).strftime("%Y-%m-%d") for n in (0, 1, 7, 30, 60)}
+    with CHANGE_LOCK:
+        tracked = len(CHANGE_STATS)
+    return {"tracked_dates": tracked,
+            "sample": {camp: {k: round(_ttl_for(camp, d)) for k, d in probe.items()} for camp in CAMPS
+                       if CAMPS[camp].cache is not None}}
+
+METRICS_SECTIONS["ttl"] = _ttl_metrics
+
+
+# ===== 수집 이력 저장소 (SQLite, append-only) =====
+# 스크랩 결과를 TTL 뒤에 버리지 않고 (camp, date, area) 단위로 계속 쌓아둔다.
+# 사이트 목록은 비트셋 BLOB으로 저장해서 용량을 줄이고, 분석 쿼리는 집계 컬럼 + 인덱스만 탄다.
+import queue
+
+HISTORY_DB = os.getenv("HISTORY_DB", os.path.join(tempfile.gettempdir(), "campingbusan-history.sqlite3"))  # ""이면 비활성
+HISTORY_QUEUE = queue.Queue(maxsize=int(os.getenv("HISTORY_QUEUE_MAX", "1000")))
+_HISTORY_THREAD = None
+_HISTORY_THREAD_LOCK = Lock()
+
+HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scrapes (
+    id          INTEGER PRIMARY KEY,
+    camp        TEXT    NOT NULL,
+    resdate     TEXT    NOT NULL,   -- YYYY-MM-DD (이용일)
+    scraped_at  INTEGER NOT NULL,   -- unix sec
+    lead_days   INTEGER NOT NULL,   -- 이용일까지 남은 일수
+    month       INTEGER NOT NULL,   -- 이용일의 월 (1~12)
+    weekday     INTEGER NOT NULL,   -- 이용일의 요일 (0=월 ... 6=일)
+    n_avail     INTEGER NOT NULL,
+    n_total     INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scrape_areas (
+    scrape_id    INTEGER NOT NULL,
+    area         TEXT    NOT NULL,
+    fmt          TEXT    NOT NULL,
+    n_avail      INTEGER NOT NULL,
+    n_total      INTEGER NOT NULL,
+    avail_bits   BLOB    NOT NULL,
+    unavail_bits BLOB    NOT NULL,
+    PRIMARY KEY (scrape_id, area)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_scrapes_camp_date ON scrapes (camp, resdate, scraped_at);
+CREATE INDEX IF NOT EXISTS idx_scrapes_heatmap   ON scrapes (camp, month, weekday, n_avail, n_total);
+CREATE INDEX IF NOT EXISTS idx_scrapes_sellout   ON scrapes (weekday, n_avail, camp, resdate, lead_days);
+"""
+
+def _history_connect():
+    conn = sqlite3.connect(HISTORY_DB, timeout=5)
+    conn.execute("PRAGMA journal_mode=WAL")     # gunicorn 워커 여러 개가 동시에 읽고 씀
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+def _bits_blob(b: SiteBits) -> bytes:
+    return b.bits.to_bytes(max(1, (b.bits.bit_length() + 7) // 8), "little")
+
+def _history_writer():
+    conn = _history_connect()
+    conn.executescript(HISTORY_SCHEMA)
+    while True:
+        camp, d, areas, ts = HISTORY_QUEUE.get()
+        try:
+            day = datetime.strptime(d, "%Y-%m-%d").date()
+            lead = (day - datetime.fromtimestamp(ts).date()).days
+            n_av = sum(len(a["available"]) for a in areas.values())
+            n_tot = sum(len(a["available"] | a["unavailable"]) for a in areas.values())
+            with conn:
+                cur = conn.execute(
+                    "INSERT INTO scrapes (camp, resdate, scraped_at, lead_days, month, weekday, n_avail, n_total)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (camp, d, int(ts), lead, day.month, day.weekday(), n_av, n_tot),
+                )
+                conn.executemany(
+                    "INSERT INTO scrape_areas (scrape_id, area, fmt, n_avail, n_total, avail_bits, unavail_bits)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (cur.lastrowid, area, a["fmt"], len(a["available"]),
+                         len(a["available"] | a["unavailable"]),
+                         _bits_blob(a["available"]), _bits_blob(a["unavailable"]))
+                        for area, a in areas.items()
+                    ],
+                )
+        except Exception as e:
+            print(f"[history][{camp}][{d}] write error:", repr(e), flush=True)
+
+def history_record(camp: str, d: str, areas: dict, ts: float):
+    """record_snapshot에서 호출. 쓰기는 전용 스레드가 하므로 스크랩 스레드는 막히지 않는다."""
+    global _HISTORY_THREAD
+    if not HISTORY_DB:
+        return
+    with _HISTORY_THREAD_LOCK:
+        if _HISTORY_THREAD is None:
+            _HISTORY_THREAD = Thread(target=_history_writer, daemon=True)
+            _HISTORY_THREAD.start()
+    try:
+        HISTORY_QUEUE.put_nowait((camp, d, areas, ts))
+    except queue.Full:
+        print(f"[history][{camp}][{d}] queue full, dropped", flush=True)
+
+def _history_query(sql: str, params=()):
+    if not HISTORY_DB or not os.path.exists(HISTORY_DB):
+        return []
+    conn = sqlite3.connect(f"file:{HISTORY_DB}?mode=ro", uri=True, timeout=5)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+@app.route("/api/history/heatmap")
+def api_history_heatmap():
+    """
+    ?by=month|weekday|month_weekday [&camp=...]
+    점유율(1 - 잔여/전체)의 관측 평균을 캠핑장별로 묶어서 돌려준다.
+    """
+    by = request.args.get("by", "month")
+    cols = {"month": ["month"], "weekday": ["weekday"], "month_weekday": ["month", "weekday"]}.get(by)
+    if not cols:
+        return jsonify({"error": "by는 month, weekday, month_weekday 중 하나입니다."}), 400
+    camp = request.args.get("camp")
+
+    group = ", ".join(["camp"] + cols)
+    where = "n_total > 0" + (" AND camp = ?" if camp else "")
+    rows = _history_query(
+        f"SELECT {group}, AVG(1.0 - CAST(n_avail AS REAL) / n_total), COUNT(*)"
+        f" FROM scrapes WHERE {where} GROUP BY {group} ORDER BY {group}",
+        (camp,) if camp else (),
+    )
+    cells = []
+    for r in rows:
+        cell = {"camp": r[0]}
+        cell.update(dict(zip(cols, r[1:1 + len(cols)])))
+        cell["occupancy"] = round(r[-2], 4)
+        cell["samples"] = r[-1]
+        cells.append(cell)
+    return jsonify({"by": by, "cells": cells})
+
+
+@app.route("/api/history/sellout")
+def api_history_sellout():
+    """
+    ?weekdays=4,5 [&camp=...]
+    주말(기본: 금·토 밤) 이용일별로 '처음 매진이 관측된 시점이 며칠 전이었는지'를 구하고
+    캠핑장별 평균/중앙값을 낸다. 매진이 한 번도 관측되지 않은 날짜는 open_dates로 센다.
+    """
+    try:
+        weekdays = [int(x) for x in (request.args.get("weekdays") or "4,5").split(",") if x.strip()]
+    except ValueError:
+        return jsonify({"error": "weekdays는 0(월)~6(일) 숫자 목록입니다."}), 400
+    camp = request.args.get("camp")
+
+    marks = ",".join("?" * len(weekdays))
+    cond = f"weekday IN ({marks})" + (" AND camp = ?" if camp else "")
+    params = tuple(weekdays) + ((camp,) if camp else ())
+    sold = _history_query(
+        f"SELECT camp, resdate, MAX(lead_days) FROM scrapes"
+        f" WHERE {cond} AND n_avail = 0 AND n_total > 0 GROUP BY camp, resdate",
+        params,
+    )
+    seen = _history_query(
+        f"SELECT camp, COUNT(DISTINCT resdate) FROM scrapes WHERE {cond} GROUP BY camp",
+        params,
+    )
+
+    by_camp = {}
+    for c, d, lead in sold:
+        by_camp.setdefault(c, []).append({"date": d, "lead_days": lead})
+    out = {}
+    for c, n_dates in seen:
+        items = by_camp.get(c, [])
+        leads = sorted(x["lead_days"] for x in items)
+        out[c] = {
+            "dates": n_dates,
+            "sold_out_dates": len(items),
+            "open_dates": n_dates - len(items),
+            "avg_lead_days": round(sum(leads) / len(leads), 1) if leads else None,
+            "median_lead_days": leads[len(leads) // 2] if leads else None,
+            "by_date": items,
+        }
+    return jsonify({"weekdays": weekdays, "camps": out})
+
+
+# ===== 셀레니움 작업 스케줄러 (우선순위 + 버려진 작업 취소) =====
+# 작업마다 스레드 하나가 브라우저 슬롯(SELENIUM_SEM)을 기다리다가, 슬롯을 잡은 순간
+# '지금 가장 급한 작업'을 골라 실행한다 (자기 작업이 아닐 수 있음).
+# 우선순위: 화면에서 기다리는 사용자(interactive) > 백그라운드, 그 안에서는 날짜가 가까운 순.
+# interactive 작업은 JOB_ABANDON_SEC 동안 폴링이 없으면 슬롯을 잡기 전에 취소된다.
+JOB_ABANDON_SEC = int(os.getenv("JOB_ABANDON_SEC", "20"))
+
+
+class ScrapeScheduler:
+    def __init__(self):
+        self.cond = Condition()
+        self.jobs = {}                  # (camp, date) -> job
+        self.seq = itertools.count()
+        self.completed = 0
+        self.cancelled = 0
+
+    @staticmethod
+    def _priority(job) -> tuple:
+        try:
+            lead = (datetime.strptime(job["date"], "%Y-%m-%d").date() - date.today()).days
+        except ValueError:
+            lead = 365
+        return (0 if job["interactive"] else 1, max(0, lead), job["seq"])
+
+    def submit(self, camp: str, d: str, run, interactive: bool = True, on_cancel=None) -> bool:
+        """새 작업이면 True. 이미 대기/실행 중이면 우선순위만 갱신하고 False."""
+        now = time.time()
+        key = (camp, d)
+        with self.cond:
+            job = self.jobs.get(key)
+            if job:
+                if interactive:
+                    job["interactive"] = True
+                    job["last_poll"] = now
+                else:
+                    job["pinned"] = True    # 백그라운드도 원하는 작업 → 취소하지 않음
+                return False
+            self.jobs[key] = {
+                "camp": camp, "date": d, "run": run, "on_cancel": on_cancel,
+                "interactive": interactive, "pinned": not interactive,
+                "submitted": now, "last_poll": now, "running": False, "seq": next(self.seq),
+            }
+        Thread(target=self._dispatch, daemon=True).start()
+        return True
+
+    def touch(self, camp: str, d: str):
+        """클라이언트가 폴링할 때마다 호출 → 아직 누군가 기다리고 있음"""
+        with self.cond:
+            job = self.jobs.get((camp, d))
+            if job:
+                job["last_poll"] = time.time()
+
+    def _pick(self):
+        now = time.time()
+        cancelled = []
+        with self.cond:
+            for key, job in list(self.jobs.items()):
+                if job["running"] or job["pinned"]:
+                    continue
+                if now - job["last_poll"] > JOB_ABANDON_SEC:
+                    self.jobs.pop(key)
+                    self.cancelled += 1
+                    cancelled.append(job)
+            waiting = [j for j in self.jobs.values() if not j["running"]]
+            job = min(waiting, key=self._priority) if waiting else None
+            if job:
+                job["running"] = True
+                job["started"] = now
+        for j in cancelled:
+            print(f"[scheduler][{j['camp']}][{j['date']}] cancelled (no poll for {now - j['last_poll']:.0f}s)", flush=True)
+            if j["on_cancel"]:
+                j["on_cancel"]()
+        return job
+
+    def _dispatch(self):
+        with SELENIUM_SEM:
+            job = self._pick()
+            if job is None:
+                SELENIUM_SEM.skip()   # 실행한 게 없으니 지표에 넣지 않음
+                return
+            try:
+                with fetch_priority(PRIO_INTERACTIVE if job["interactive"] else PRIO_BACKGROUND):
+                    job["run"]()
+            finally:
+                with self.cond:
+                    self.jobs.pop((job["camp"], job["date"]), None)
+                    self.completed += 1
+
+    def metrics(self) -> dict:
+        now = time.time()
+        with self.cond:
+            jobs = sorted(self.jobs.values(), key=self._priority)
+            return {
+                "queued": sum(1 for j in jobs if not j["running"]),
+                "running": sum(1 for j in jobs if j["running"]),
+                "completed": self.completed,
+                "cancelled": self.cancelled,
+                "abandon_sec": JOB_ABANDON_SEC,
+                "jobs": [
+                    {"camp": j["camp"], "date": j["date"], "interactive": j["interactive"],
+                     "running": j["running"], "age_sec": round(now - j["submitted"], 1),
+                     "idle_sec": round(now - j["last_poll"], 1)}
+                    for j in jobs
+                ],
+            }
+
+
+SCHEDULER = ScrapeScheduler()
+METRICS_SECTIONS["scheduler"] = SCHEDULER.metrics
+
 def _progress_ticker(date_key: str):
     """INFLIGHT[date_key]['ticks'] 를 1초마다 올려서 (n/60) 표시 가능하게."""
     try:
@@ -83,16 +1501,22 @@ def _progress_ticker(date_key: str):
     except Exception:
         return
 
+def _yeongdo_publish_partial(d: str, key: str, part: dict):
+    """카테고리 하나가 끝나면 작업 상태(INFLIGHT)에 바로 올려서 /api/yeongdo 가 status="partial" 로 내려주게"""
+    with YEONGDO_LOCK:
+        rec = INFLIGHT.get(d)
+        if rec is not None:
+            rec.setdefault("partial", {})[key] = part
+
+
 def _yeongdo_worker(d, page_url):
+    """SCHEDULER가 브라우저 슬롯을 잡은 상태에서 호출"""
     data = None
-    ticker = None
     try:
-        # 진행률 티커 시작
-        ticker = Thread(target=_progress_ticker, args=(d,), daemon=True)
-        ticker.start()
-
-        with SELENIUM_SEM:
-            data = fetch_yeongdo(d, page_url)
+        data = fetch_yeongdo(d, page_url, on_category=lambda key, part: _yeongdo_publish_partial(d, key, part))
+        if not any((data or {}).get(k, {}).get("available") or (data or {}).get(k, {}).get("unavailable")
+                   for k in ("caravan", "auto", "general")):
+            SELENIUM_SEM.mark_failed()
     except Exception as e:
         print(f"[yeongdo][{d}] worker error:", repr(e), flush=True)
         data = {"error": f"크롤링 실패: {e}"}
@@ -104,17 +1528,35 @@ def _yeongdo_worker(d, page_url):
         with YEONGDO_LOCK:
             _cache_set(YEONGDO_CACHE, d, data)
             INFLIGHT.pop(d, None)  # 끝났으니 inflight 제거
+        record_snapshot("yeongdo", d, data)
+
+
+def _submit_yeongdo(d: str, interactive: bool):
+    """INFLIGHT[d] 등록 후 호출. 진행률 티커 시작 + 스케줄러에 작업 등록."""
+    def _on_cancel():
+        with YEONGDO_LOCK:
+            INFLIGHT.pop(d, None)
+    Thread(target=_progress_ticker, args=(d,), daemon=True).start()
+    SCHEDULER.submit("yeongdo", d, lambda: _yeongdo_worker(d, CAMPS["yeongdo"].url_page),
+                     interactive=interactive, on_cancel=_on_cancel)
 
 
 @app.route("/api/yeongdo")
 def api_yeongdo():
     d = request.args.get("date") or date.today().strftime("%Y-%m-%d")
-    page_url = CAMPING_TABS["yeongdo"]["url_page"]
+    if is_bot():
+        return bot_api_response("yeongdo", d)
+    limited = rate_limited("poll")
+    if limited:
+        return limited
 
     with YEONGDO_LOCK:
-        cached = _cache_get(YEONGDO_CACHE, d, YEONGDO_TTL)
+        cached = _cache_get(YEONGDO_CACHE, d, _ttl_for("yeongdo", d))
         if cached is not None:
-            return jsonify({"status": "ready", "date": d, "data": cached})
+            if request.args.get("enc") == "bits":
+                cached = encode_areas_bits(cached)
+            return jsonify({"status": "ready", "date": d, "data": cached,
+                            "version": snapshot_version("yeongdo", d), "epoch": CHANGE_EPOCH})
 
         # 오래된 inflight 강제 정리
         now = time.time()
@@ -125,20 +1567,47 @@ def api_yeongdo():
 
         if rec:  # 진행 중
             tries = int(rec.get("ticks", 0))
+            SCHEDULER.touch("yeongdo", d)
+            partial = dict(rec.get("partial") or {})
+            if partial:
+                # 끝난 카테고리만 먼저 (나머지는 계속 폴링)
+                if request.args.get("enc") == "bits":
+                    partial = encode_areas_bits(partial)
+                return jsonify({"status": "partial", "date": d, "tries": tries, "max": PROGRESS_MAX,
+                                "data": partial, "done": sorted(rec["partial"])})
             return jsonify({"status": "pending", "date": d, "tries": tries, "max": PROGRESS_MAX})
 
-        # 새 작업 등록
-        INFLIGHT[d] = {"ts": time.time(), "ticks": 0}
+    # 새 작업 등록 (클라이언트별 동시 작업 수 · scrape 버킷 확인).
+    # client_jobs 가 YEONGDO_LOCK/GUDEOK_LOCK 을 차례로 잡으므로 락 밖에서 확인하고, 등록 직전에 다시 본다.
+    limited = scrape_limited()
+    if limited:
+        return limited
+    with YEONGDO_LOCK:
+        rec = INFLIGHT.get(d)
+        if (rec and (time.time() - rec.get("ts", 0)) <= INFLIGHT_MAX) \
+                or _cache_get(YEONGDO_CACHE, d, _ttl_for("yeongdo", d)) is not None:
+            # 그 사이 다른 요청이 먼저 등록했거나 끝냈다 → 다음 폴링에서 받아 감
+            return jsonify({"status": "pending", "date": d, "tries": 0, "max": PROGRESS_MAX})
+        INFLIGHT[d] = {"ts": time.time(), "ticks": 0, "client": client_id()}
 
-    t = Thread(target=_yeongdo_worker, args=(d, page_url), daemon=True)
-    t.start()
+    _submit_yeongdo(d, interactive=True)
     return jsonify({"status": "pending", "date": d, "tries": 0, "max": PROGRESS_MAX})
 
+def start_yeongdo_job(d: str) -> bool:
+    """백그라운드(감시 루프 등)용: 진행 중인 작업이 없으면 새로 등록. 등록했으면 True."""
+    with YEONGDO_LOCK:
+        now = time.time()
+        rec = INFLIGHT.get(d)
+        if rec and (now - rec.get("ts", now)) <= INFLIGHT_MAX:
+            return False
+        INFLIGHT[d] = {"ts": now, "ticks": 0}
+    _submit_yeongdo(d, interactive=False)
+    return True
+
 
 # === Gudeok polling cache ===
 GUDEOK_CACHE = {}      # date -> (data, ts)
 GUDEOK_LOCK = Lock()
-GUDEOK_TTL  = 180
 GUDEOK_INFLIGHT = {}   # date -> {"ts": float, "ticks": int}
 
 def _progress_ticker_gudeok(date_key: str):
@@ -155,12 +1624,12 @@ def _progress_ticker_gudeok(date_key: str):
         return
 
 def _gudeok_worker(d: str, page_url: str):
+    """SCHEDULER가 브라우저 슬롯을 잡은 상태에서 호출"""
     data = None
-    ticker = Thread(target=_progress_ticker_gudeok, args=(d,), daemon=True)
-    ticker.start()
     try:
-        with SELENIUM_SEM:
-            data = fetch_gudeok_sites_with_retry(selected_date=d, page_url=page_url)
+        data = fetch_gudeok_sites_with_retry(selected_date=d, page_url=page_url)
+        if not (data or {}).get("deck", {}).get("total"):
+            SELENIUM_SEM.mark_failed()
     except Exception as e:
         print(f"[gudeok][{d}] worker error:", repr(e), flush=True)
         data = {"error": f"크롤링 실패: {e}"}
@@ -170,17 +1639,35 @@ def _gudeok_worker(d: str, page_url: str):
         with GUDEOK_LOCK:
             _cache_set(GUDEOK_CACHE, d, data)
             GUDEOK_INFLIGHT.pop(d, None)
+        record_snapshot("gudeok", d, data)
+
+
+def _submit_gudeok(d: str, interactive: bool):
+    """GUDEOK_INFLIGHT[d] 등록 후 호출. 진행률 티커 시작 + 스케줄러에 작업 등록."""
+    def _on_cancel():
+        with GUDEOK_LOCK:
+            GUDEOK_INFLIGHT.pop(d, None)
+    Thread(target=_progress_ticker_gudeok, args=(d,), daemon=True).start()
+    SCHEDULER.submit("gudeok", d, lambda: _gudeok_worker(d, CAMPS["gudeok"].url_page),
+                     interactive=interactive, on_cancel=_on_cancel)
 
 
 @app.route("/api/gudeok")
 def api_gudeok():
     d = request.args.get("date") or date.today().strftime("%Y-%m-%d")
-    page_url = CAMPING_TABS["gudeok"]["url_page"]
+    if is_bot():
+        return bot_api_response("gudeok", d)
+    limited = rate_limited("poll")
+    if limited:
+        return limited
 
     with GUDEOK_LOCK:
-        cached = _cache_get(GUDEOK_CACHE, d, GUDEOK_TTL)
+        cached = _cache_get(GUDEOK_CACHE, d, _ttl_for("gudeok", d))
         if cached is not None:
-            return jsonify({"status":"ready","date":d,"data":cached})
+            if request.args.get("enc") == "bits":
+                cached = encode_areas_bits(cached)
+            return jsonify({"status":"ready","date":d,"data":cached,
+                            "version":snapshot_version("gudeok", d),"epoch":CHANGE_EPOCH})
 
         now = time.time()
         rec = GUDEOK_INFLIGHT.get(d)
@@ -190,13 +1677,34 @@ def api_gudeok():
 
         if rec:
             tries = int(rec.get("ticks", 0))
+            SCHEDULER.touch("gudeok", d)
             return jsonify({"status":"pending","date":d,"tries":tries,"max":PROGRESS_MAX})
 
-        GUDEOK_INFLIGHT[d] = {"ts": time.time(), "ticks": 0}
+    # api_yeongdo 와 같이 락 밖에서 확인 후 등록 직전에 다시 본다
+    limited = scrape_limited()
+    if limited:
+        return limited
+    with GUDEOK_LOCK:
+        rec = GUDEOK_INFLIGHT.get(d)
+        if (rec and (time.time() - rec.get("ts", 0)) <= INFLIGHT_MAX) \
+                or _cache_get(GUDEOK_CACHE, d, _ttl_for("gudeok", d)) is not None:
+            return jsonify({"status":"pending","date":d,"tries":0,"max":PROGRESS_MAX})
+        GUDEOK_INFLIGHT[d] = {"ts": time.time(), "ticks": 0, "client": client_id()}
 
-    Thread(target=_gudeok_worker, args=(d, page_url), daemon=True).start()
+    _submit_gudeok(d, interactive=True)
     return jsonify({"status":"pending","date":d,"tries":0,"max":PROGRESS_MAX})
 
+def start_gudeok_job(d: str) -> bool:
+    """백그라운드(감시 루프 등)용: 진행 중인 작업이 없으면 새로 등록. 등록했으면 True."""
+    with GUDEOK_LOCK:
+        now = time.time()
+        rec = GUDEOK_INFLIGHT.get(d)
+        if rec and (now - rec.get("ts", now)) <= INFLIGHT_MAX:
+            return False
+        GUDEOK_INFLIGHT[d] = {"ts": now, "ticks": 0}
+    _submit_gudeok(d, interactive=False)
+    return True
+
 
 # ─────────────────────────────────────────────────────────
 
@@ -210,7 +1718,390 @@ def _accept_any_alert(driver, timeout=2):
     except TimeoutException:
         return ""
 
-def _new_driver(headless: bool = True, window: str = "1280,1600") -> webdriver.Chrome:
+# ===== 크롬 프로세스/임시 프로필 정리 + 메모리 감시 =====
+# Chrome 크래시, _run_with_timeout이 버린 스레드, gunicorn --max-requests 재시작 때
+# 남는 Chrome 프로세스와 chrome-profile-* 디렉토리를 주기적으로 치운다.
+# 프로필 디렉토리 이름에 소유 워커 pid를 넣어서, 다른 살아있는 워커의 브라우저는 건드리지 않는다.
+import signal
+import weakref
+
+CHROME_PROFILE_PREFIX = "chrome-profile-"
+CHROME_MIN_FREE_MB = int(os.getenv("CHROME_MIN_FREE_MB", "180"))       # 이보다 여유 메모리가 적으면 새 드라이버 거부
+CHROME_DRIVER_MAX_AGE = int(os.getenv("CHROME_DRIVER_MAX_AGE_SEC", "240"))  # 이보다 오래 살아있는 드라이버는 버려진 것으로 간주
+PROFILE_SWEEP_GRACE = int(os.getenv("PROFILE_SWEEP_GRACE_SEC", "60"))
+REAPER_INTERVAL = int(os.getenv("REAPER_INTERVAL_SEC", "30"))
+
+ACTIVE_DRIVERS = {}        # profile_dir -> {"started": float, "driver": weakref}
+ACTIVE_DRIVERS_LOCK = Lock()
+REAPER_STATS = {"runs": 0, "killed": 0, "swept_dirs": 0, "reclaimed_bytes": 0, "refused": 0, "last_run": None, "last_report": None}
+_REAPER_THREAD = None
+
+
+class ChromeMemoryError(RuntimeError):
+    """여유 메모리가 CHROME_MIN_FREE_MB 미만이라 브라우저를 띄우지 않음"""
+
+
+def _read_int(path: str):
+    try:
+        with open(path) as f:
+            v = f.read().strip()
+        return None if v == "max" else int(v)
+    except (OSError, ValueError):
+        return None
+
+def mem_available_mb() -> float:
+    """컨테이너(cgroup) 한도와 /proc/meminfo 중 더 빡빡한 쪽의 여유 메모리(MB)."""
+    cands = []
+    limit = _read_int("/sys/fs/cgroup/memory.max")                       # cgroup v2
+    usage = _read_int("/sys/fs/cgroup/memory.current")
+    if limit is None:
+        limit = _read_int("/sys/fs/cgroup/memory/memory.limit_in_bytes")  # cgroup v1
+        usage = _read_int("/sys/fs/cgroup/memory/memory.usage_in_bytes")
+    if limit and usage is not None and limit < (1 << 60):
+        cands.append((limit - usage) / 1048576)
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    cands.append(int(line.split()[1]) / 1024)
+                    break
+    except OSError:
+        pass
+    return min(cands) if cands else float("inf")
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+def _profile_owner(profile_dir: str):
+    """chrome-profile-<pid>-xxxx → pid (예전 형식이면 None)"""
+    m = re.match(rf"^{CHROME_PROFILE_PREFIX}(\d+)-", os.path.basename(profile_dir.rstrip("/")))
+    return int(m.group(1)) if m else None
+
+def _chrome_processes():
+    """/proc 에서 chrome/chromedriver 프로세스 목록: [{"pid", "ppid", "rss", "profile", "driver"}]"""
+    out = []
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        pid = int(name)
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                cmd = f.read().split(b"\0")
+            with open(f"/proc/{pid}/status") as f:
+                status = f.read()
+        except OSError:
+            continue
+        args = [a.decode("utf-8", "replace") for a in cmd if a]
+        if not args:
+            continue
+        exe = os.path.basename(args[0])
+        is_driver = "chromedriver" in exe
+        if not is_driver and "chrom" not in exe:
+            continue
+        profile = next((a.split("=", 1)[1] for a in args if a.startswith("--user-data-dir=")), None)
+        ppid = int(re.search(r"^PPid:\s+(\d+)", status, re.M).group(1))
+        m = re.search(r"^VmRSS:\s+(\d+)", status, re.M)
+        out.append({"pid": pid, "ppid": ppid, "rss": int(m.group(1)) * 1024 if m else 0,
+                    "profile": profile, "driver": is_driver})
+    return out
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for fn in files:
+            try:
+                total += os.lstat(os.path.join(root, fn)).st_size
+            except OSError:
+                pass
+    return total
+
+def _is_orphan_profile(profile_dir: str, now: float) -> bool:
+    owner = _profile_owner(profile_dir)
+    if owner is None:
+        # pid 없는 예전 형식: 충분히 오래됐을 때만
+        try:
+            return now - os.path.getmtime(profile_dir) > CHROME_DRIVER_MAX_AGE
+        except OSError:
+            return True
+    if owner != os.getpid():
+        return not _pid_alive(owner)
+    with ACTIVE_DRIVERS_LOCK:
+        rec = ACTIVE_DRIVERS.get(profile_dir)
+    if rec is not None and rec.get("pooled"):
+        return False
+    return rec is None or now - rec["started"] > CHROME_DRIVER_MAX_AGE
+
+def reap_chrome() -> dict:
+    """고아 Chrome 종료 + 오래된 프로필 삭제. 이번 실행에서 회수한 내역을 반환."""
+    now = time.time()
+    report = {"killed": [], "swept_dirs": 0, "reclaimed_bytes": 0}
+
+    # 1) 이 워커가 만든 드라이버 중 너무 오래 산 것(버려진 스레드) → quit 시도
+    with ACTIVE_DRIVERS_LOCK:
+        stale = [(p, r) for p, r in ACTIVE_DRIVERS.items()
+                 if not r.get("pooled") and now - r["started"] > CHROME_DRIVER_MAX_AGE]
+    for profile_dir, rec in stale:
+        drv = rec["driver"]() if rec["driver"] else None
+        if drv is not None:
+            _quit_driver(drv)
+        else:
+            with ACTIVE_DRIVERS_LOCK:
+                ACTIVE_DRIVERS.pop(profile_dir, None)
+
+    # 2) 프로세스: 우리 프로필인데 소유 워커가 죽었거나/등록이 없는 chrome, 또는 init(1)에 입양된 chromedriver
+    try:
+        procs = _chrome_processes()
+    except OSError:
+        procs = []
+    for p in procs:
+        if p["driver"]:
+            orphan = p["ppid"] == 1
+        else:
+            orphan = bool(p["profile"]) and CHROME_PROFILE_PREFIX in p["profile"] \
+                and _is_orphan_profile(p["profile"], now)
+        if not orphan:
+            continue
+        try:
+            os.kill(p["pid"], signal.SIGKILL)
+            report["killed"].append({"pid": p["pid"], "rss_mb": round(p["rss"] / 1048576, 1)})
+            report["reclaimed_bytes"] += p["rss"]
+        except OSError:
+            pass
+
+    # 3) 임시 프로필 디렉토리
+    tmp = tempfile.gettempdir()
+    for name in os.listdir(tmp):
+        if not name.startswith(CHROME_PROFILE_PREFIX):
+            continue
+        path = os.path.join(tmp, name)
+        try:
+            if now - os.path.getmtime(path) < PROFILE_SWEEP_GRACE:
+                continue
+        except OSError:
+            continue
+        if _is_orphan_profile(path, now):
+            size = _dir_size(path)
+            shutil.rmtree(path, ignore_errors=True)
+            if not os.path.exists(path):
+                report["swept_dirs"] += 1
+                report["reclaimed_bytes"] += size
+
+    REAPER_STATS["runs"] += 1
+    REAPER_STATS["killed"] += len(report["killed"])
+    REAPER_STATS["swept_dirs"] += report["swept_dirs"]
+    REAPER_STATS["reclaimed_bytes"] += report["reclaimed_bytes"]
+    REAPER_STATS["last_run"] = now
+    if report["killed"] or report["swept_dirs"]:
+        REAPER_STATS["last_report"] = report
+        print("[reaper]", report, flush=True)
+    return report
+
+def _reaper_loop():
+    while True:
+        try:
+            reap_chrome()
+        except Exception as e:
+            print("[reaper] error:", repr(e), flush=True)
+        time.sleep(REAPER_INTERVAL)
+
+def _ensure_reaper():
+    global _REAPER_THREAD
+    with ACTIVE_DRIVERS_LOCK:
+        if _REAPER_THREAD is None:
+            _REAPER_THREAD = Thread(target=_reaper_loop, daemon=True)
+            _REAPER_THREAD.start()
+
+def _check_memory_for_driver():
+    """여유 메모리가 부족하면 한 번 정리해 보고, 그래도 부족하면 ChromeMemoryError."""
+    free = mem_available_mb()
+    if free >= CHROME_MIN_FREE_MB:
+        return
+    reap_chrome()
+    free = mem_available_mb()
+    if free < CHROME_MIN_FREE_MB:
+        REAPER_STATS["refused"] += 1
+        raise ChromeMemoryError(f"메모리 부족으로 브라우저를 띄우지 않았습니다. (여유 {free:.0f}MB)")
+
+def _register_driver(profile_dir: str, driver=None):
+    """Chrome 기동 전에 먼저 등록(기동 중 reaper가 고아로 오인하지 않도록), 기동 후 driver 연결."""
+    with ACTIVE_DRIVERS_LOCK:
+        rec = ACTIVE_DRIVERS.setdefault(profile_dir, {"started": time.time(), "driver": None})
+        if driver is not None:
+            rec["driver"] = weakref.ref(driver)
+
+@traced("chrome.quit")
+def _quit_driver(driver):
+    """driver.quit + 임시 프로필 삭제 + 등록 해제 (각 fetch_* 의 finally에서 호출)"""
+    try:
+        driver.quit()
+    except Exception:
+        pass
+    profile_dir = getattr(driver, "temp_profile_dir", None)
+    if profile_dir:
+        # 임시 프로필/캐시 정리 (충돌 예방, 용량 누수 방지)
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        with ACTIVE_DRIVERS_LOCK:
+            ACTIVE_DRIVERS.pop(profile_dir, None)
+
+def _chrome_metrics() -> dict:
+    try:
+        procs = _chrome_processes()
+    except OSError:
+        procs = []
+    with ACTIVE_DRIVERS_LOCK:
+        active = len(ACTIVE_DRIVERS)
+    return {
+        "active_drivers": active,
+        "chrome_processes": len(procs),
+        "chrome_rss_mb": round(sum(p["rss"] for p in procs) / 1048576, 1),
+        "mem_available_mb": round(mem_available_mb(), 1),
+        "min_free_mb": CHROME_MIN_FREE_MB,
+        **REAPER_STATS,
+    }
+
+METRICS_SECTIONS["chrome"] = _chrome_metrics
+
+# ===== 셀레니움 동시 실행 수 자동 조절 =====
+# 고정 Semaphore 대신, 여유 메모리 / 최근 Chrome 기동·수집 시간 / 실패율을 보고
+# [SCRAPER_MIN_CONCURRENCY, SCRAPER_MAX_CONCURRENCY] 범위에서 허용 브라우저 수를 올리고 내린다.
+# 기존처럼 `with SELENIUM_SEM:` 으로 사용.
+# 기본 상한은 예전 Semaphore 와 같은 1 (512MB 인스턴스). 메모리가 넉넉한 배포만 SCRAPER_MAX_CONCURRENCY 로 올린다.
+SCRAPER_MIN_CONCURRENCY = int(os.getenv("SCRAPER_MIN_CONCURRENCY", "1"))
+SCRAPER_MAX_CONCURRENCY = int(os.getenv("SCRAPER_MAX_CONCURRENCY", "1"))  # ← 기본 1
+ADAPTIVE_TARGET_SEC = float(os.getenv("ADAPTIVE_TARGET_SEC", "45"))          # 수집 1건 목표 시간
+ADAPTIVE_LAUNCH_SLOW_SEC = float(os.getenv("ADAPTIVE_LAUNCH_SLOW_SEC", "15")) # Chrome 기동이 이보다 느리면 과부하
+ADAPTIVE_MAX_FAIL = float(os.getenv("ADAPTIVE_MAX_FAIL", "0.3"))
+ADAPTIVE_COOLDOWN = float(os.getenv("ADAPTIVE_COOLDOWN_SEC", "30"))
+ADAPTIVE_BROWSER_MB = float(os.getenv("ADAPTIVE_BROWSER_MB", "220"))         # 브라우저 1개 메모리 초기 추정치
+
+
+class AdaptiveLimiter:
+    def __init__(self, min_limit: int, max_limit: int):
+        self.min = max(1, min_limit)
+        self.max = max(self.min, max_limit)
+        self.limit = self.min
+        self.active = 0
+        self.waiting = 0
+        self.cond = Condition()
+        self.runs = deque(maxlen=20)      # (소요 초, 성공 여부)
+        self.launches = deque(maxlen=20)  # Chrome 기동 초
+        self.per_browser_mb = ADAPTIVE_BROWSER_MB
+        self.last_adjust = 0.0
+        self.adjustments = 0
+        self._local = threading.local()
+
+    def _mem_cap(self) -> int:
+        """지금 메모리로 추가로 띄울 수 있는 브라우저 수 + 현재 실행 중인 수"""
+        spare = mem_available_mb() - CHROME_MIN_FREE_MB
+        if spare == float("inf"):
+            return self.max
+        return self.active + max(0, int(spare // self.per_browser_mb))
+
+    def effective_limit(self) -> int:
+        return max(self.min, min(self.limit, self._mem_cap()))
+
+    def __enter__(self):
+        with self.cond:
+            self.waiting += 1
+            try:
+                # 메모리 상황이 바뀔 수 있으니 주기적으로 다시 판단
+                while self.active >= self.effective_limit():
+                    self.cond.wait(1.0)
+                self.active += 1
+            finally:
+                self.waiting -= 1
+        self._local.started = time.monotonic()
+        self._local.failed = False
+        self._local.skip = False
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        took = time.monotonic() - getattr(self._local, "started", time.monotonic())
+        with self.cond:
+            self.active -= 1
+            if not getattr(self._local, "skip", False):
+                self.runs.append((took, exc_type is None and not getattr(self._local, "failed", False)))
+                self._adjust()
+            self.cond.notify_all()
+        return False
+
+    def note_launch(self, sec: float):
+        with self.cond:
+            self.launches.append(sec)
+
+    def skip(self):
+        """with 블록 안에서: 실제로 실행한 작업이 없었음 (지표에서 제외)"""
+        self._local.skip = True
+
+    def mark_failed(self):
+        """with 블록 안에서: 예외는 없었지만 결과가 실패(빈 결과 등)였음을 표시"""
+        self._local.failed = True
+
+    def _update_browser_mb(self):
+        try:
+            rss = sum(p["rss"] for p in _chrome_processes() if not p["driver"])
+        except OSError:
+            return
+        with ACTIVE_DRIVERS_LOCK:
+            n = len(ACTIVE_DRIVERS)
+        if rss and n:
+            self.per_browser_mb = 0.7 * self.per_browser_mb + 0.3 * (rss / n / 1048576)
+
+    def _adjust(self):
+        now = time.monotonic()
+        if now - self.last_adjust < ADAPTIVE_COOLDOWN or len(self.runs) < 3:
+            return
+        self._update_browser_mb()
+        durations = sorted(t for t, _ in self.runs)
+        p50 = durations[len(durations) // 2]
+        fail = sum(1 for _, ok in self.runs if not ok) / len(self.runs)
+        launch = sorted(self.launches)[len(self.launches) // 2] if self.launches else 0.0
+
+        new = self.limit
+        if fail > ADAPTIVE_MAX_FAIL or p50 > ADAPTIVE_TARGET_SEC or launch > ADAPTIVE_LAUNCH_SLOW_SEC:
+            new = max(self.min, self.limit - 1)
+        elif (self.waiting > 0 and fail < ADAPTIVE_MAX_FAIL / 3 and p50 < ADAPTIVE_TARGET_SEC * 0.6
+              and self._mem_cap() > self.limit):
+            new = min(self.max, self.limit + 1)
+        if new != self.limit:
+            print(f"[selenium] concurrency {self.limit} -> {new} (p50={p50:.1f}s fail={fail:.0%} launch={launch:.1f}s)", flush=True)
+            self.limit = new
+            self.adjustments += 1
+            self.runs.clear()
+        self.last_adjust = now
+
+    def metrics(self) -> dict:
+        with self.cond:
+            durations = sorted(t for t, _ in self.runs)
+            return {
+                "limit": self.limit,
+                "effective_limit": self.effective_limit(),
+                "min": self.min,
+                "max": self.max,
+                "active": self.active,
+                "waiting": self.waiting,
+                "per_browser_mb": round(self.per_browser_mb, 1),
+                "recent_p50_sec": round(durations[len(durations) // 2], 1) if durations else None,
+                "recent_fail_rate": round(sum(1 for _, ok in self.runs if not ok) / len(self.runs), 2) if self.runs else None,
+                "adjustments": self.adjustments,
+            }
+
+
+# 동시에 여러 개 안 띄우도록 (영도/구덕 공용)
+SELENIUM_SEM = AdaptiveLimiter(SCRAPER_MIN_CONCURRENCY, SCRAPER_MAX_CONCURRENCY)
+METRICS_SECTIONS["selenium"] = SELENIUM_SEM.metrics
+
+@traced("chrome.launch")
+def _launch_driver(headless: bool = True, window: str = "1280,1600") -> webdriver.Chrome:
+    _ensure_reaper()
+    _check_memory_for_driver()
+
     opts = Options()
     if headless:
         opts.add_argument("--headless=new")
@@ -252,9 +2143,9 @@ def _new_driver(headless: bool = True, window: str = "1280,1600") -> webdriver.C
     }
     opts.add_experimental_option("prefs", prefs)
 
-    # 실행마다 고유 프로필/캐시 디렉토리(이미 적용한 구조 유지)
+    # 실행마다 고유 프로필/캐시 디렉토리(이미 적용한 구조 유지, 이름에 소유 워커 pid)
     import tempfile, shutil, os
-    profile_dir = tempfile.mkdtemp(prefix="chrome-profile-")
+    profile_dir = tempfile.mkdtemp(prefix=f"{CHROME_PROFILE_PREFIX}{os.getpid()}-")
     data_dir = os.path.join(profile_dir, "data")
     cache_dir = os.path.join(profile_dir, "cache")
     os.makedirs(data_dir, exist_ok=True)
@@ -262,26 +2153,131 @@ def _new_driver(headless: bool = True, window: str = "1280,1600") -> webdriver.C
     opts.add_argument(f"--user-data-dir={profile_dir}")
     opts.add_argument(f"--data-path={data_dir}")
     opts.add_argument(f"--disk-cache-dir={cache_dir}")
+    _register_driver(profile_dir)
 
     chrome_bin = os.environ.get("GOOGLE_CHROME_BIN")
     if chrome_bin:
         opts.binary_location = chrome_bin
 
     driver_path = os.environ.get("CHROMEDRIVER_PATH")
-    if driver_path:
-        from selenium.webdriver.chrome.service import Service
-        service = Service(executable_path=driver_path)
-        driver = webdriver.Chrome(service=service, options=opts)
-    else:
-        driver = webdriver.Chrome(options=opts)
+    t_launch = time.monotonic()
+    try:
+        if driver_path:
+            from selenium.webdriver.chrome.service import Service
+            service = Service(executable_path=driver_path)
+            driver = webdriver.Chrome(service=service, options=opts)
+        else:
+            driver = webdriver.Chrome(options=opts)
+    except Exception:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        with ACTIVE_DRIVERS_LOCK:
+            ACTIVE_DRIVERS.pop(profile_dir, None)
+        raise
+
+    SELENIUM_SEM.note_launch(time.monotonic() - t_launch)
 
     driver.set_page_load_timeout(20)
     driver.set_script_timeout(20)
 
     driver.temp_profile_dir = profile_dir
+    _register_driver(profile_dir, driver)
+    return driver
+
+
+# ── 예열된 브라우저 풀 ─────────────────────────
+# 워밍업 때 미리 띄워둔 headless 드라이버를 _new_driver 가 먼저 꺼내 쓴다 (Chrome 기동 시간 절약).
+# 풀에 있는 동안은 ACTIVE_DRIVERS 에 pooled=True 로 표시해 reaper 의 '너무 오래 산 드라이버' 대상에서 뺀다.
+# 풀에서 노는 Chrome 은 SELENIUM_SEM 슬롯도 메모리 예산도 잡지 않으므로 기본은 끔(0). 메모리 여유가 있는 배포만 켠다.
+BROWSER_POOL_SIZE = int(os.getenv("WARMUP_BROWSERS", "0"))
+BROWSER_POOL_MAX_IDLE = int(os.getenv("BROWSER_POOL_MAX_IDLE_SEC", "900"))   # 이보다 오래 논 드라이버는 버리고 새로
+BROWSER_POOL = deque()          # (driver, pooled_at)
+BROWSER_POOL_LOCK = Lock()
+BROWSER_POOL_STATS = {"hits": 0, "misses": 0, "expired": 0, "launched": 0}
+_POOL_FILLING = False
+
+
+def _set_pooled(driver, pooled: bool):
+    with ACTIVE_DRIVERS_LOCK:
+        rec = ACTIVE_DRIVERS.get(getattr(driver, "temp_profile_dir", None))
+        if rec is not None:
+            rec["pooled"] = pooled
+            rec["started"] = time.time()   # 꺼낸 시점부터 나이를 다시 셈
+
+
+def fill_browser_pool():
+    """풀을 BROWSER_POOL_SIZE 까지 채운다. 메모리가 모자라면(ChromeMemoryError) 거기서 멈춤. 띄운 수 반환.
+    한 개 띄울 때마다 SELENIUM_SEM 슬롯을 잡는다 → 수집 중인 브라우저가 닫힌 뒤에야 채워져 동시 Chrome 수가 상한을 넘지 않음."""
+    global _POOL_FILLING
+    with BROWSER_POOL_LOCK:
+        if _POOL_FILLING:
+            return 0
+        _POOL_FILLING = True
+    launched = 0
+    try:
+        while True:
+            with SELENIUM_SEM:
+                SELENIUM_SEM.skip()   # 예열은 수집 지표에 넣지 않음
+                with BROWSER_POOL_LOCK:
+                    if len(BROWSER_POOL) >= BROWSER_POOL_SIZE:
+                        break
+                try:
+                    driver = _launch_driver(headless=True)
+                except Exception as e:   # 메모리 부족(ChromeMemoryError)·Chrome 없음 등 → 다음 기회에
+                    print("[pool] launch skipped:", repr(e), flush=True)
+                    break
+            _set_pooled(driver, True)
+            with BROWSER_POOL_LOCK:
+                BROWSER_POOL.append((driver, time.time()))
+                BROWSER_POOL_STATS["launched"] += 1
+            launched += 1
+    finally:
+        with BROWSER_POOL_LOCK:
+            _POOL_FILLING = False
+    return launched
+
+
+def _take_pooled_driver():
+    """살아있는 예열 드라이버 하나 (없으면 None)"""
+    while True:
+        with BROWSER_POOL_LOCK:
+            if not BROWSER_POOL:
+                return None
+            driver, pooled_at = BROWSER_POOL.popleft()
+        if time.time() - pooled_at > BROWSER_POOL_MAX_IDLE:
+            BROWSER_POOL_STATS["expired"] += 1
+            _quit_driver(driver)
+            continue
+        try:
+            driver.current_url     # 죽은 세션이면 여기서 예외
+        except Exception:
+            _quit_driver(driver)
+            continue
+        _set_pooled(driver, False)
+        return driver
+
+
+def _new_driver(headless: bool = True, window: str = "1280,1600") -> webdriver.Chrome:
+    """예열 풀에 있으면 그걸, 없으면 새로 띄움. 풀에서 꺼냈으면 뒤에서 다시 채워 둔다
+    (채우는 스레드는 SELENIUM_SEM 을 기다리므로 지금 드라이버가 끝난 뒤에 띄움)."""
+    driver = _take_pooled_driver() if headless and BROWSER_POOL_SIZE > 0 else None
+    if driver is None:
+        BROWSER_POOL_STATS["misses"] += 1
+        return _launch_driver(headless=headless, window=window)
+    BROWSER_POOL_STATS["hits"] += 1
+    if window != "1280,1600":
+        w, h = (int(x) for x in window.split(","))
+        driver.set_window_size(w, h)
+    Thread(target=fill_browser_pool, daemon=True).start()
     return driver
 
 
+def _pool_metrics() -> dict:
+    with BROWSER_POOL_LOCK:
+        return {"size": BROWSER_POOL_SIZE, "idle": len(BROWSER_POOL), **BROWSER_POOL_STATS}
+
+METRICS_SECTIONS["browser_pool"] = _pool_metrics
+
+
 
 # 어딘가 공용 utils 근처에
 def _dismiss_alert_if_any(driver):
@@ -292,124 +2288,6 @@ def _dismiss_alert_if_any(driver):
         pass
 
 
-# ── 각 탭별 지도/요금표 데이터 ─────────────────────────
-def build_media(key: str):
-    """
-    탭별 지도 이미지 경로 + 요금표 메타데이터를 한 곳에서 반환.
-    템플릿은 camp.media.image_url / .price_table / .price_note만 사용.
-    """
-    image_url = url_for('static', filename=f"map_{key}.png")
-    
-    price_table = {"columns": [], "rows": []}
-    price_note = None
-
-    if key == "samnak":
-        price_table = {
-            "columns": ["평일", "주말"],
-            "rows": [
-                {"label": "오토 캠핑 SITE", "cols": {"평일": "30,000원", "주말": "35,000원"}, "color": "#DF846D"},
-                {"label": "일반 캠핑 SITE", "cols": {"평일": "20,000원", "주말": "25,000원"}, "color": "#AC81B4"},
-            ],
-        }
-    elif key == "daejeo":
-        price_table = {
-            "columns": ["평일", "주말"],
-            "rows": [
-                {"label": "A구역 (5x8)",   "cols": {"평일": "23,000원", "주말": "28,000원"}, "color": "#DF846D"},
-                {"label": "B구역 (12x12)","cols": {"평일": "35,000원", "주말": "40,000원"}, "color": "#73ABF7"},
-                {"label": "C구역 (10x12)","cols": {"평일": "32,000원", "주말": "37,000원"}, "color": "#D47EF1"},
-                {"label": "D구역 (10x10)","cols": {"평일": "30,000원", "주말": "35,000원"}, "color": "#ECEE4E"},
-            ],
-        }
-    elif key == "hwamyeong":
-        price_table = {
-            "columns": ["평일", "주말"],
-            "rows": [
-                {"label": "전 구역", "cols": {"평일": "30,000원", "주말": "35,000원"}, "color": "#DF846D"},
-            ],
-        }
-    elif key == "yeongdo":
-        price_table = {
-            "columns": ["평일", "주말", "성수기"],
-            "rows": [
-                {"label": "카라반 (6인용)", "cols": {"평일": "120,000원", "주말": "140,000원", "성수기": "160,000원"}, "color": "#623ECA"},
-                {"label": "카라반 (4인용)", "cols": {"평일": "100,000원", "주말": "120,000원", "성수기": "140,000원"}, "color": "#8979E4"},
-                {"label": "오토",           "cols": {"평일": "30,000원",  "주말": "35,000원",  "성수기": "40,000원"},  "color": "#DF846D"},
-                {"label": "일반",           "cols": {"평일": "20,000원",  "주말": "25,000원",  "성수기": "30,000원"},  "color": "#AC81B4"},
-            ],
-        }
-        price_note = "성수기: 7~8월 / 비수기: 그 외 기간"
-    elif key == "busan_port":
-        price_table = {
-            "columns": ["요금"],
-            "rows": [
-                {"label": "데크", "cols": {"요금": "25,000원"}, "color": "#AC81B4"},
-                {"label": "오토", "cols": {"요금": "30,000원"}, "color": "#DF846D"},
-            ],
-        }
-    elif key == "gudeok":
-        price_table = {
-            "columns": ["요금"],
-            "rows": [
-                {"label": "4인 이하",   "cols": {"요금": "10,000원"}, "color": "#A47D5C"},
-                {"label": "5~9인 이하", "cols": {"요금": "20,000원"}, "color": "#835A37"},
-            ],
-        }
-
-    return {
-        "image_url": image_url,
-        "price_table": price_table,
-        "price_note": price_note,
-    }
-
-
-# ===== 탭 정의 =====
-CAMPING_TABS = {
-    "all": { "name": "전체", "is_all": True },   # ✅ 추가 (맨 위에)
-    "samnak": {
-        "name": "삼락",
-        "url_base": (
-            "https://www.nakdongcamping.com/reservation/real_time?"
-            "user_id=&site_id=&site_type=&site_name=&dis_rate=0&user_dis_rate=&reqcode=&reqname=&reqphone=&"
-            "reservation_type=0&resdate={}&schGugun=1&price=0&bagprice=2000&allprice=0&percnt=0&g-recaptcha-response="
-        ),
-        "is_hwamyung": False,
-    },
-    "daejeo": {
-        "name": "대저",
-        "url_base": (
-            "https://www.daejeocamping.com/reservation/real_time?"
-            "user_id=&site_id=&site_type=&site_name=&dis_rate=0&user_dis_rate=&reqcode=&reqname=&reqphone=&"
-            "reservation_type=0&resdate={}&schGugun=1&price=0&bagprice=2000&allprice=0&percnt=0&g-recaptcha-response="
-        ),
-        "is_hwamyung": False,
-    },
-    "hwamyeong": {
-        "name": "화명",
-        "url_base": (
-            "https://hwamyungcamping.com/reservation/real_time?"
-            "user_id=&site_id=&site_type=&site_name=&dis_rate=0&user_dis_rate=&reqcode=&reqname=&reqphone=&"
-            "reservation_type=0&resdate={}&schGugun=1&price=0&bagprice=2000&allprice=0&percnt=0&g-recaptcha-response="
-        ),
-        "is_hwamyung": True,
-    },
-    "yeongdo": {
-        "name": "영도",
-        "url_page": "https://www.yeongdo.go.kr/marinocamping/00003/00015/00028.web",
-        "is_yeongdo": True,
-    },
-    "busan_port": {
-        "name": "부산항",
-        "url_page": "https://www.busanpa.com/redevelopment/Board.do?mCode=MN0082",
-        "is_busan_port": True,
-    },
-    'gudeok': {
-        'name': '구덕',
-        'url_page': "https://gudeok.go.kr/rent_camp01.php",
-        'is_gudeok': True
-    }
-}
-
 def _wait_until_interpark_main(driver, wait, max_secs: int = 25) -> bool:
     """인터파크 대기열/중간페이지를 거쳐 최종 BookMain.asp로 진입할 때까지 대기"""
     t0 = time.time()
@@ -534,42 +2412,82 @@ def _interpark_click_block(driver, region_code: str):
         return True
     return False
 
+# 좌석 후보 요소. 예전에는 요소마다 title/aria-label/class/disabled/img 를 따로 물어봐서
+# (요소당 최대 5번) chromedriver 왕복이 요소 수에 비례했다 → 스크립트 1번으로 필요한 필드를 한꺼번에.
+_INTERPARK_SEAT_SELECTOR = "[title], [aria-label], a, button, .seat, .unit, .block a"
+_SEAT_ON_HINTS = ("가능", "able", "on", "green")
+_SEAT_OFF_HINTS = ("불가", "sold", "off", "gray", "grey")
+_INTERPARK_SEATS_JS = """
+  const out = [];
+  for (const el of document.querySelectorAll(arguments[0])) {
+    const text = (el.getAttribute('title') || el.getAttribute('aria-label') || el.innerText || '').trim();
+    if (!text.includes('B-') && !text.includes('A-')) continue;
+    const img = el.querySelector('img');
+    out.push({
+      text: text,
+      cls: el.getAttribute('class') || '',
+      disabled: el.hasAttribute('disabled'),
+      alt: img ? (img.getAttribute('alt') || '') : null,
+    });
+  }
+  return out;
+"""
+
+
+def _interpark_seat_items_legacy(driver):
+    """스크립트 실행이 막혔을 때의 예전 방식 (요소별 get_attribute). 반환 형식은 _INTERPARK_SEATS_JS 와 같음."""
+    items = []
+    for el in driver.find_elements(By.CSS_SELECTOR, _INTERPARK_SEAT_SELECTOR):
+        t = (el.get_attribute("title") or el.get_attribute("aria-label") or el.text or "").strip()
+        if "B-" not in t and "A-" not in t:
+            continue
+        cls = el.get_attribute("class") or ""
+        disabled = el.get_attribute("disabled") is not None
+        alt = None
+        s = (t + " " + cls).lower()
+        if not disabled and not any(k in s for k in _SEAT_ON_HINTS + _SEAT_OFF_HINTS):
+            # 클래스/텍스트로 판단이 안 될 때만 img alt 조회
+            try:
+                alt = el.find_element(By.CSS_SELECTOR, "img").get_attribute("alt") or ""
+            except Exception:
+                pass
+        items.append({"text": t, "cls": cls, "disabled": disabled, "alt": alt})
+    return items
+
+
 def _interpark_parse_seats(driver):
     """
     좌석(사이트) 파싱.
     - 예약 가능: 초록색 아이콘(보통 '가능' 클래스/alt/title/aria-label로 구분)
     - 예약 불가: 흰색/회색 아이콘
     """
-    avail, unavail = [], []
+    try:
+        items = driver.execute_script(_INTERPARK_SEATS_JS, _INTERPARK_SEAT_SELECTOR)
+    except Exception:
+        items = None
+    if items is None:
+        items = _interpark_seat_items_legacy(driver)
 
-    # 1) title/aria-label에 'B-21' 같은 사이트명이 있는 경우
-    nodes = driver.find_elements(By.CSS_SELECTOR, "[title], [aria-label], a, button, .seat, .unit, .block a")
-    for el in nodes:
-        t = (el.get_attribute("title") or el.get_attribute("aria-label") or el.text or "").strip()
-        # [데크사이트] B-21 형태 → 마지막 토큰만 꺼냄
-        if "B-" in t or "A-" in t:
-            # 상태 추정: 클래스/disabled
-            cls = (el.get_attribute("class") or "").lower()
-            disabled = el.get_attribute("disabled") is not None
-            # 초록/가능 키워드 힌트
-            s = (t + " " + cls).lower()
-            site = t.split()[-1]  # 'B-21'
-            if any(k in s for k in ["가능", "able", "on", "green"]) and not disabled:
+    avail, unavail = [], []
+    # 1) title/aria-label에 'B-21' 같은 사이트명이 있는 경우 ([데크사이트] B-21 형태 → 마지막 토큰만)
+    for it in items:
+        t = it["text"]
+        # 상태 추정: 클래스/disabled + 초록/가능 키워드 힌트
+        cls = (it.get("cls") or "").lower()
+        disabled = bool(it.get("disabled"))
+        s = (t + " " + cls).lower()
+        site = t.split()[-1]  # 'B-21'
+        if any(k in s for k in _SEAT_ON_HINTS) and not disabled:
+            avail.append(site)
+        elif any(k in s for k in _SEAT_OFF_HINTS) or disabled:
+            unavail.append(site)
+        else:
+            # 이미지 alt 로 색 판단, img 가 없으면 불가 쪽으로 (보수적으로)
+            alt = (it.get("alt") or "").lower()
+            if it.get("alt") is not None and ("가능" in alt or "green" in alt):
                 avail.append(site)
-            elif any(k in s for k in ["불가", "sold", "off", "gray", "grey"]) or disabled:
-                unavail.append(site)
             else:
-                # 이미지로 색 판단이 필요할 수도 → 부모 span/img alt 속성 검사
-                try:
-                    img = el.find_element(By.CSS_SELECTOR, "img")
-                    alt = (img.get_attribute("alt") or "").lower()
-                    if "가능" in alt or "green" in alt:
-                        avail.append(site)
-                    else:
-                        unavail.append(site)
-                except Exception:
-                    # 모르면 불가 쪽으로 (보수적으로)
-                    unavail.append(site)
+                unavail.append(site)
 
     # 2) 중복 제거/정렬
     def key(x):
@@ -584,6 +2502,9 @@ def _interpark_parse_seats(driver):
     unavail = sorted(sorted(set(unavail)), key=key)
     return avail, unavail
 
+# 현재 부산항은 CAMPS 에 strategy "link" 로 등록되어 있어 이 수집기는 스케줄되지 않는다
+# (탭은 예약 페이지 링크만). 인터파크 세션/쿠키 재사용도 그래서 붙이지 않음 — 다시 수집하게 되면 그때.
+@traced("fetch_busan_port")
 def fetch_busan_port(selected_date: str, headless: bool = True, wait_sec: int = 25):
     """
     부산항 힐링 야영장(인터파크) 파서:
@@ -602,8 +2523,8 @@ def fetch_busan_port(selected_date: str, headless: bool = True, wait_sec: int =
     driver = _new_driver(headless=headless, window="1440,1600")
     try:
         # 1) 부산항 공홈 → 예약 바로가기 버튼(내부 JS) 호출
-        page_url = CAMPING_TABS["busan_port"]["url_page"]
-        driver.get(page_url)
+        page_url = CAMPS["busan_port"].url_page
+        driver_get(driver, page_url)
         _dismiss_alert_if_any(driver)
         wait = WebDriverWait(driver, wait_sec)
 
@@ -616,31 +2537,36 @@ def fetch_busan_port(selected_date: str, headless: bool = True, wait_sec: int =
         # 혹시 그냥 인터파크 메인으로 직접 이동
         if "PCampingBook/BookMain.asp" not in driver.current_url:
             try:
-                driver.get("https://ticket.interpark.com/PCampingBook/BookMain.asp")
+                driver_get(driver, "https://ticket.interpark.com/PCampingBook/BookMain.asp")
                 # ... 여기서 작업 ...
             except UnexpectedAlertPresentException:
                 msg = _accept_any_alert(driver, timeout=2)  # "먼저 로그인 하세요."가 들어옴
                 raise RuntimeError(f"로그인 필요로 자동 수집을 중단했습니다. ({msg})")
 
         # 2) 대기열 통과 대기
-        _wait_until_interpark_main(driver, wait, max_secs=35)
+        with span("busan.queue"):
+            _wait_until_interpark_main(driver, wait, max_secs=35)
 
         # 3) 공지 닫기
-        _interpark_close_notice(driver)
+        with span("busan.close_notice"):
+            _interpark_close_notice(driver)
 
         # 4) 날짜 선택
-        _interpark_pick_date(driver, wait, selected_date)
+        with span("busan.pick_date"):
+            _interpark_pick_date(driver, wait, selected_date)
 
         # 5) 1박 2일 선택
-        _interpark_select_period(driver, "1박 2일")
+        with span("busan.select_period"):
+            _interpark_select_period(driver, "1박 2일")
 
         # 6) 데크/오토 각각 파싱
         result = {}
 
         # 데크: RGN001
-        _interpark_click_block(driver, "RGN001")
-        time.sleep(0.4)
-        deck_av, deck_un = _interpark_parse_seats(driver)
+        with span("busan.block", block="RGN001"):
+            _interpark_click_block(driver, "RGN001")
+            time.sleep(0.4)
+            deck_av, deck_un = _interpark_parse_seats(driver)
         result["deck"] = {
             "available": deck_av,
             "unavailable": deck_un,
@@ -650,9 +2576,10 @@ def fetch_busan_port(selected_date: str, headless: bool = True, wait_sec: int =
         }
 
         # 오토: RGN002
-        _interpark_click_block(driver, "RGN002")
-        time.sleep(0.4)
-        auto_av, auto_un = _interpark_parse_seats(driver)
+        with span("busan.block", block="RGN002"):
+            _interpark_click_block(driver, "RGN002")
+            time.sleep(0.4)
+            auto_av, auto_un = _interpark_parse_seats(driver)
         result["auto"] = {
             "available": auto_av,
             "unavailable": auto_un,
@@ -664,20 +2591,12 @@ def fetch_busan_port(selected_date: str, headless: bool = True, wait_sec: int =
         return result
 
     finally:
-        try:
-            driver.quit()
-        except Exception:
-            pass
-        # 임시 프로필/캐시 정리 (충돌 예방, 용량 누수 방지)
-        try:
-            if hasattr(driver, "temp_profile_dir"):
-                shutil.rmtree(driver.temp_profile_dir, ignore_errors=True)
-        except Exception:
-            pass
+        _quit_driver(driver)
 
 
 
 # ===== 영도 버튼 파서 =====
+@traced("parse_yeongdo_buttons")
 def parse_yeongdo_buttons(html_soup: BeautifulSoup):
     """
     영도 예약 영역에서 '카라반/오토/일반' 사이트 버튼/링크를 파싱.
@@ -783,15 +2702,15 @@ def parse_yeongdo_buttons(html_soup: BeautifulSoup):
         bucket = result[key]["available"] if status == "available" else result[key]["unavailable"]
         bucket.append(num)
 
-    # 정렬/중복 제거
+    # 정렬/중복 제거 (비트셋 → 오름차순 번호)
     for k in result:
         for kk in ("available", "unavailable"):
-            vals = sorted(set(result[k][kk]))
-            result[k][kk] = vals
+            result[k][kk] = SiteBits.from_sites(result[k][kk]).labels("int")
 
     return result
 
 
+@traced("fetch_gudeok_sites_with_retry")
 def fetch_gudeok_sites_with_retry(selected_date: str, page_url: str | None = None) -> dict:
     try:
         return fetch_gudeok_sites(selected_date=selected_date, page_url=page_url, headless=True, wait_sec=25)
@@ -800,14 +2719,25 @@ def fetch_gudeok_sites_with_retry(selected_date: str, page_url: str | None = Non
         time.sleep(1.5)
         return fetch_gudeok_sites(selected_date=selected_date, page_url=page_url, headless=True, wait_sec=30)
 
+@traced("fetch_gudeok_sites")
+@taped("gudeok")
 def fetch_gudeok_sites(
     selected_date: str,
     page_url: str | None = None,
     headless: bool = True,
     wait_sec: int = 25
 ):
+    if SCRAPER_MODE == "replay":
+        soup = BeautifulSoup(tape_page_source("options"), "html.parser")
+        avail, unavail = [], []
+        for op in soup.select('select[name="camp_num"] option[value]'):
+            val = (op.get("value") or "").strip()
+            if val:
+                (unavail if op.has_attr("disabled") else avail).append(val)
+        return _gudeok_result(avail, unavail)
+
     if not page_url:
-        page_url = CAMPING_TABS['gudeok']['url_page']
+        page_url = CAMPS["gudeok"].url_page
 
     start_str = selected_date
     end_str = (datetime.strptime(selected_date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
@@ -875,118 +2805,139 @@ def fetch_gudeok_sites(
             return False
 
     try:
-        driver.get(page_url)
+        driver_get(driver, page_url)
         _dismiss_alert_if_any(driver)
         wait = WebDriverWait(driver, wait_sec)
 
         # 1) 먼저 JS로 날짜 주입 시도
-        if not try_js_set_dates():
-            # 2) 실패 시 팝업 방식 폴백
-            try:
-                agree = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "input.selectAllC")))
-                if not agree.is_selected():
-                    driver.execute_script("arguments[0].click();", agree)
-                time.sleep(0.2)
-            except Exception:
-                pass
-
-            def pick_date(input_id: str, date_str: str):
-                base = driver.current_window_handle
-                before = set(driver.window_handles)
-
-                field = wait.until(EC.element_to_be_clickable((By.ID, input_id)))
-                driver.execute_script("arguments[0].click();", field)
+        with span("gudeok.js_dates"):
+            js_ok = try_js_set_dates()
+            span_attrs(ok=js_ok)
+        if not js_ok:
+            with span("gudeok.popup_fallback"):
+                # 2) 실패 시 팝업 방식 폴백
+                try:
+                    agree = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "input.selectAllC")))
+                    if not agree.is_selected():
+                        driver.execute_script("arguments[0].click();", agree)
+                    time.sleep(0.2)
+                except Exception:
+                    pass
 
-                # 팝업 창 뜨는 것 확실히 기다림
-                wait.until(lambda d: len(set(d.window_handles) - before) >= 1)
-                new_handle = list(set(driver.window_handles) - before)[0]
-                driver.switch_to.window(new_handle)
+                def pick_date(input_id: str, date_str: str):
+                    base = driver.current_window_handle
+                    before = set(driver.window_handles)
+
+                    field = wait.until(EC.element_to_be_clickable((By.ID, input_id)))
+                    driver.execute_script("arguments[0].click();", field)
+
+                    # 팝업 창 뜨는 것 확실히 기다림
+                    wait.until(lambda d: len(set(d.window_handles) - before) >= 1)
+                    new_handle = list(set(driver.window_handles) - before)[0]
+                    driver.switch_to.window(new_handle)
+
+                    # onclick="copy('YYYY-MM-DD')" 요소 클릭
+                    day_el = WebDriverWait(driver, 15).until(
+                        EC.element_to_be_clickable((By.XPATH, f"//span[contains(@onclick, \"copy('{date_str}')\")]"))
+                    )
+                    driver.execute_script("arguments[0].click();", day_el)
+
+                    # 원창 복귀
+                    _switch_back(base)
+                    time.sleep(0.2)
+
+                pick_date("sdate", start_str)
+                pick_date("edate", end_str)
+
+                # '다 음'
+                clicked_next = False
+                for xp in [
+                    "//span[contains(normalize-space(.),'다 음')]",
+                    "//button[contains(normalize-space(.),'다 음')]",
+                    "//a[contains(normalize-space(.),'다 음')]",
+                    "//input[@type='submit' and @value='다 음']",
+                ]:
+                    try:
+                        el = driver.find_element(By.XPATH, xp)
+                        driver.execute_script("arguments[0].click();", el)
+                        clicked_next = True
+                        break
+                    except Exception:
+                        continue
+                if not clicked_next:
+                    raise RuntimeError("다음 버튼을 찾지 못했습니다.")
 
-                # onclick="copy('YYYY-MM-DD')" 요소 클릭
-                span = WebDriverWait(driver, 15).until(
-                    EC.element_to_be_clickable((By.XPATH, f"//span[contains(@onclick, \"copy('{date_str}')\")]"))
-                )
-                driver.execute_script("arguments[0].click();", span)
+                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'select[name="camp_num"]')))
 
-                # 원창 복귀
-                _switch_back(base)
-                time.sleep(0.2)
+        # 옵션 파싱
+        with span("gudeok.parse_options"):
+            tape_snapshot(driver, "options")
+            avail, unavail = [], []
+            for val, disabled in _gudeok_option_items(driver):
+                if not val:
+                    continue
+                (unavail if disabled else avail).append(val)
+            span_attrs(options=len(avail) + len(unavail))
 
-            pick_date("sdate", start_str)
-            pick_date("edate", end_str)
+        return _gudeok_result(avail, unavail)
 
-            # '다 음'
-            clicked_next = False
-            for xp in [
-                "//span[contains(normalize-space(.),'다 음')]",
-                "//button[contains(normalize-space(.),'다 음')]",
-                "//a[contains(normalize-space(.),'다 음')]",
-                "//input[@type='submit' and @value='다 음']",
-            ]:
-                try:
-                    el = driver.find_element(By.XPATH, xp)
-                    driver.execute_script("arguments[0].click();", el)
-                    clicked_next = True
-                    break
-                except Exception:
-                    continue
-            if not clicked_next:
-                raise RuntimeError("다음 버튼을 찾지 못했습니다.")
+    finally:
+        _quit_driver(driver)
 
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'select[name="camp_num"]')))
 
-        # 옵션 파싱
-        avail, unavail = [], []
-        options = driver.find_elements(By.CSS_SELECTOR, 'select[name="camp_num"] option[value]')
-        for op in options:
-            val = (op.get_attribute("value") or "").strip()
-            if not val:
-                continue
-            if op.get_attribute("disabled") is not None:
-                unavail.append(val)
-            else:
-                avail.append(val)
+_GUDEOK_OPTION_SELECTOR = 'select[name="camp_num"] option[value]'
+_GUDEOK_OPTIONS_JS = """
+  return Array.from(document.querySelectorAll(arguments[0]),
+                    op => [(op.getAttribute('value') || '').trim(), op.disabled]);
+"""
 
-        def sort_key(v: str):
-            a, b = v.split("-")
-            try:
-                return (int(a), int(b))
-            except Exception:
-                return (a, b)
 
-        avail.sort(key=sort_key)
-        unavail.sort(key=sort_key)
+def _gudeok_option_items(driver):
+    """[(value, disabled)] 를 스크립트 1번으로. 실패하면 예전처럼 옵션마다 get_attribute 2번."""
+    try:
+        items = driver.execute_script(_GUDEOK_OPTIONS_JS, _GUDEOK_OPTION_SELECTOR)
+    except Exception:
+        items = None
+    if items is not None:
+        return [(val, bool(disabled)) for val, disabled in items]
+    return [((op.get_attribute("value") or "").strip(), op.get_attribute("disabled") is not None)
+            for op in driver.find_elements(By.CSS_SELECTOR, _GUDEOK_OPTION_SELECTOR)]
 
-        return {
-            "deck": {
-                "available": avail,
-                "unavailable": unavail,
-                "num_available": len(avail),
-                "num_unavailable": len(unavail),
-                "total": len(avail) + len(unavail),
-            }
-        }
 
-    finally:
-        try:
-            driver.quit()
-        except Exception:
-            pass
+def _gudeok_result(avail: list, unavail: list) -> dict:
+    def sort_key(v: str):
+        a, b = v.split("-")
         try:
-            if hasattr(driver, "temp_profile_dir"):
-                shutil.rmtree(driver.temp_profile_dir, ignore_errors=True)
+            return (int(a), int(b))
         except Exception:
-            pass
+            return (a, b)
 
+    avail.sort(key=sort_key)
+    unavail.sort(key=sort_key)
+
+    return {
+        "deck": {
+            "available": avail,
+            "unavailable": unavail,
+            "num_available": len(avail),
+            "num_unavailable": len(unavail),
+            "total": len(avail) + len(unavail),
+        }
+    }
 
-# ===== 영도: 셀레니움(날짜 클릭 → 라디오 전환) =====
 
 # ===== 영도: 셀레니움(날짜 클릭 → 라디오 전환) =====
-def fetch_yeongdo_via_selenium_dateclick(selected_date: str, page_url: str, headless: bool = True, wait_sec: int = 20, total_max_sec: int = 40):
+@traced("fetch_yeongdo_via_selenium_dateclick")
+@taped("yeongdo")
+def fetch_yeongdo_via_selenium_dateclick(selected_date: str, page_url: str, headless: bool = True, wait_sec: int = 20,
+                                        total_max_sec: int = 40, on_category=None):
     """
     라디오(카라반/오토/일반) 전환 직후 '현재 화면에 보이는 버튼들'만 긁는다.
     버튼 텍스트에 '카라반/오토/일반' 라벨이 없으면 현재 탭으로 귀속.
+    on_category(key, {"available", "unavailable"}): 카테고리 하나가 끝날 때마다 호출 (부분 결과 공개용)
     """
+    if SCRAPER_MODE == "replay":
+        return _replay_yeongdo_selenium(on_category)
     t0 = time.time()
     driver = _new_driver(headless=headless, window="1280,1600")
     def _extract_visible_items(_driver):
@@ -1075,7 +3026,7 @@ def fetch_yeongdo_via_selenium_dateclick(selected_date: str, page_url: str, head
         return []
 
     try:
-        driver.get(page_url)
+        driver_get(driver, page_url)
         _dismiss_alert_if_any(driver)
         wait = WebDriverWait(driver, wait_sec)
 
@@ -1083,41 +3034,44 @@ def fetch_yeongdo_via_selenium_dateclick(selected_date: str, page_url: str, head
         def date_cell_exists():
             return len(driver.find_elements(By.CSS_SELECTOR, f'td.date-td[data-date-string="{selected_date}"]')) > 0
 
-        jumps = 0
-        while not date_cell_exists() and jumps < 24:
-            clicked = False
-            for sel in [
-                ".ui-datepicker-next", ".ui-datepicker-next > a",
-                ".btn.next", "button.next", "a.next",
-                ".calendar .next", ".cal-next", ".month-next",
-                'a[title="다음달"]', "button.cal-next",
-            ]:
-                btns = driver.find_elements(By.CSS_SELECTOR, sel)
-                if btns:
-                    try: btns[0].click()
-                    except Exception: driver.execute_script("arguments[0].click();", btns[0])
-                    clicked = True
+        with span("yeongdo.calendar"):
+            jumps = 0
+            while not date_cell_exists() and jumps < 24:
+                clicked = False
+                for sel in [
+                    ".ui-datepicker-next", ".ui-datepicker-next > a",
+                    ".btn.next", "button.next", "a.next",
+                    ".calendar .next", ".cal-next", ".month-next",
+                    'a[title="다음달"]', "button.cal-next",
+                ]:
+                    btns = driver.find_elements(By.CSS_SELECTOR, sel)
+                    if btns:
+                        try: btns[0].click()
+                        except Exception: driver.execute_script("arguments[0].click();", btns[0])
+                        clicked = True
+                        time.sleep(0.35)
+                        break
+                if not clicked:
+                    driver.execute_script("""
+                        if (typeof goMonth === 'function') { goMonth(1); }
+                        else if (typeof nextMonth === 'function') { nextMonth(); }
+                    """)
                     time.sleep(0.35)
-                    break
-            if not clicked:
-                driver.execute_script("""
-                    if (typeof goMonth === 'function') { goMonth(1); }
-                    else if (typeof nextMonth === 'function') { nextMonth(); }
-                """)
-                time.sleep(0.35)
-            jumps += 1
+                jumps += 1
+            span_attrs(jumps=jumps)
 
-        try:
-            cell = wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, f'td.date-td[data-date-string="{selected_date}"]'))
-            )
-            anchor = cell.find_element(By.CSS_SELECTOR, "a") if cell.find_elements(By.CSS_SELECTOR, "a") else cell
-            driver.execute_script("arguments[0].scrollIntoView({block:'center'});", anchor)
-            try: anchor.click()
-            except Exception: driver.execute_script("arguments[0].click();", anchor)
-            time.sleep(0.4)
-        except TimeoutException:
-            pass
+        with span("yeongdo.date_click"):
+            try:
+                cell = wait.until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, f'td.date-td[data-date-string="{selected_date}"]'))
+                )
+                anchor = cell.find_element(By.CSS_SELECTOR, "a") if cell.find_elements(By.CSS_SELECTOR, "a") else cell
+                driver.execute_script("arguments[0].scrollIntoView({block:'center'});", anchor)
+                try: anchor.click()
+                except Exception: driver.execute_script("arguments[0].click();", anchor)
+                time.sleep(0.4)
+            except TimeoutException:
+                pass
 
         # 라디오 전환 util
         def click_radio_and_wait(value_value: str, keywords: list[str]):
@@ -1244,61 +3198,82 @@ def fetch_yeongdo_via_selenium_dateclick(selected_date: str, page_url: str, head
         merged = {c["key"]: {"available": [], "unavailable": []} for c in categories}
 
         for cat in categories:
-            if time.time() - t0 > total_max_sec:
-                break
-            # 라디오 전환 후 잠깐 대기
-            click_radio_and_wait(cat["value"], cat["kws"])
-            time.sleep(0.3)
-
-            # 이용인원 선택(필요 시)
-            _pick_person_if_needed()
-            time.sleep(0.3)
-
-            # 좌석 리스트 로드 재시도(메인/프레임 모두 탐색)
-            items = []
-            for _ in range(8):  # 최대 ~4초 정도 기다림
-                items = _extract_from_any_frame(driver)
-                if items:
+            with span("yeongdo.category", key=cat["key"]):
+                if time.time() - t0 > total_max_sec:
                     break
-                time.sleep(0.5)
-
-            # 디버그 로그는 items 만든 '후'에 찍기 (순서 버그 방지)
-            print("[yeongdo]", cat["key"], "items:", len(items), items[:8], flush=True)
-
-            # 현재 탭으로 귀속 (라벨 없으면 unknown → 현재 탭)
-            cur_av, cur_un = [], []
-            for it in (items or []):
-                area = (it.get('area') or 'unknown')
-                num  = it.get('num')
-                st   = it.get('state')
-                if not isinstance(num, int):
-                    continue
-                if area == 'unknown':
-                    area = cat['key']
-                if area != cat['key']:
-                    continue
-                (cur_av if st == 'available' else cur_un).append(num)
+                # 라디오 전환 후 잠깐 대기
+                with span("yeongdo.radio"):
+                    click_radio_and_wait(cat["value"], cat["kws"])
+                    time.sleep(0.3)
+
+                # 이용인원 선택(필요 시)
+                with span("yeongdo.person"):
+                    _pick_person_if_needed()
+                    time.sleep(0.3)
+
+                # 좌석 리스트 로드 재시도(메인/프레임 모두 탐색)
+                with span("yeongdo.extract"):
+                    items = []
+                    for tries in range(1, 9):  # 최대 ~4초 정도 기다림
+                        items = _extract_from_any_frame(driver)
+                        if items:
+                            break
+                        time.sleep(0.5)
+                    span_attrs(tries=tries, items=len(items))
+
+                # 디버그 로그는 items 만든 '후'에 찍기 (순서 버그 방지)
+                print("[yeongdo]", cat["key"], "items:", len(items), items[:8], flush=True)
+                tape_snapshot(driver, cat["key"])
+
+                # 현재 탭으로 귀속 (라벨 없으면 unknown → 현재 탭)
+                cur_av, cur_un = [], []
+                for it in (items or []):
+                    area = (it.get('area') or 'unknown')
+                    num  = it.get('num')
+                    st   = it.get('state')
+                    if not isinstance(num, int):
+                        continue
+                    if area == 'unknown':
+                        area = cat['key']
+                    if area != cat['key']:
+                        continue
+                    (cur_av if st == 'available' else cur_un).append(num)
 
-            cur = {
-                "available": sorted(set(cur_av)),
-                "unavailable": sorted(set(cur_un)),
-            }
+                cur = {
+                    "available": SiteBits.from_sites(cur_av),
+                    "unavailable": SiteBits.from_sites(cur_un),
+                }
 
-            for kk in ("available", "unavailable"):
-                if cur.get(kk):
-                    merged[cat["key"]][kk] = sorted(set(merged[cat["key"]][kk] + cur[kk]))
+                for kk in ("available", "unavailable"):
+                    if cur[kk]:
+                        merged[cat["key"]][kk] = (SiteBits.from_sites(merged[cat["key"]][kk]) | cur[kk]).labels("int")
+                _publish_category(on_category, cat["key"], merged[cat["key"]])
 
 
         return merged
 
     finally:
-        try: driver.quit()
-        except Exception: pass
-        try:
-            if hasattr(driver, "temp_profile_dir"):
-                shutil.rmtree(driver.temp_profile_dir, ignore_errors=True)
-        except Exception:
-            pass
+        _quit_driver(driver)
+
+
+def _replay_yeongdo_selenium(on_category=None) -> dict:
+    """replay: 카테고리별 page_source 스냅샷을 parse_yeongdo_buttons 로 다시 파싱"""
+    merged = {}
+    for key in ("caravan", "auto", "general"):
+        parsed = parse_yeongdo_buttons(BeautifulSoup(tape_page_source(key), "html.parser"))
+        merged[key] = {k: SiteBits.from_sites(parsed[key][k]).labels("int") for k in ("available", "unavailable")}
+        _publish_category(on_category, key, merged[key])
+    return merged
+
+
+def _publish_category(on_category, key: str, part: dict):
+    """부분 결과 콜백 (콜백 오류로 수집이 멈추지 않게)"""
+    if on_category is None:
+        return
+    try:
+        on_category(key, {"available": list(part["available"]), "unavailable": list(part["unavailable"])})
+    except Exception as e:
+        print(f"[yeongdo] on_category({key}) error:", repr(e), flush=True)
 
 
 def _run_with_timeout(fn, timeout_sec, *args, **kwargs):
@@ -1318,7 +3293,13 @@ def _run_with_timeout(fn, timeout_sec, *args, **kwargs):
     return ("ok", val) if ok else ("err", val)
 
 # ===== 영도 크롤러 엔트리 (GET/POST → 실패 시 Selenium 폴백) =====
-def fetch_yeongdo(selected_date: str, page_url: str):
+@traced("fetch_yeongdo")
+@taped("yeongdo")
+def fetch_yeongdo(selected_date: str, page_url: str, on_category=None):
+    """
+    GET/POST 파싱으로 안 되면 셀레니움 폴백. on_category 를 주면 셀레니움 단계에서
+    카테고리가 끝날 때마다 (GET/POST 결과와 합친) 부분 결과를 넘긴다.
+    """
 
     if not page_url:
         raise ValueError("yeongdo.url_page is empty")
@@ -1335,11 +3316,11 @@ def fetch_yeongdo(selected_date: str, page_url: str):
     soup = None
     # 1) GET
     try:
-        r = sess.get(page_url, headers=headers, timeout=20)
+        r = http_get(page_url, session=sess, headers=headers, timeout=20)
         r.raise_for_status()
         soup = BeautifulSoup(r.text, "html.parser")
         parsed_get = parse_yeongdo_buttons(soup)
-    except requests.RequestException:
+    except (requests.RequestException, UpstreamError):   # 호스트 대기열 초과(UpstreamThrottled)·TapeMiss 도 폴백으로
         parsed_get = {"caravan": {"available": [], "unavailable": []},
                       "auto": {"available": [], "unavailable": []},
                       "general": {"available": [], "unavailable": []}}
@@ -1387,7 +3368,7 @@ def fetch_yeongdo(selected_date: str, page_url: str):
 
             action = form.get("action") or page_url
             post_url = urljoin(page_url, action)
-            r2 = sess.post(post_url, data=payload, headers=headers, timeout=15)
+            r2 = http_post(post_url, session=sess, data=payload, headers=headers, timeout=15)
             r2.raise_for_status()
             soup2 = BeautifulSoup(r2.text, "html.parser")
             parsed_post = parse_yeongdo_buttons(soup2)
@@ -1408,15 +3389,6 @@ def fetch_yeongdo(selected_date: str, page_url: str):
                 return True
         return False
 
-    def _merge_list(a, b):
-        sa = set(a or [])
-        sb = set(b or [])
-        ss = sa | sb
-        try:
-            return sorted(ss, key=lambda x: int(x))
-        except Exception:
-            return sorted(ss)
-
     candidate = parsed_post or parsed_get or {
         "caravan": {"available": [], "unavailable": []},
         "auto":    {"available": [], "unavailable": []},
@@ -1424,25 +3396,26 @@ def fetch_yeongdo(selected_date: str, page_url: str):
     }
 
     if _empty_or_missing(candidate):
+        def _merged_part(key, part):
+            on_category(key, {
+                "available":  merge_sites(candidate.get(key, {}).get("available"),  part["available"]),
+                "unavailable":merge_sites(candidate.get(key, {}).get("unavailable"), part["unavailable"]),
+            })
         try:
             # 타임아웃 래퍼 없이 직접 호출 (아래 3번의 '시간 예산' 보강을 같이 쓰면 안정적)
             parsed_click = fetch_yeongdo_via_selenium_dateclick(
-                selected_date, page_url, headless=True, wait_sec=20
+                selected_date, page_url, headless=True, wait_sec=20,
+                on_category=_merged_part if on_category else None,
             )
         except Exception:
             parsed_click = None
 
         if parsed_click:
-            def _merge_list(a, b):
-                sa, sb = set(a or []), set(b or [])
-                try:  return sorted(sa | sb, key=lambda x: int(x))
-                except: return sorted(sa | sb)
-
             merged = {}
             for k in ("caravan", "auto", "general"):
                 merged[k] = {
-                    "available":  _merge_list(candidate.get(k, {}).get("available"),  parsed_click.get(k, {}).get("available")),
-                    "unavailable":_merge_list(candidate.get(k, {}).get("unavailable"), parsed_click.get(k, {}).get("unavailable")),
+                    "available":  merge_sites(candidate.get(k, {}).get("available"),  parsed_click.get(k, {}).get("available")),
+                    "unavailable":merge_sites(candidate.get(k, {}).get("unavailable"), parsed_click.get(k, {}).get("unavailable")),
                 }
             return merged
 
@@ -1451,7 +3424,1052 @@ def fetch_yeongdo(selected_date: str, page_url: str):
     return candidate
 
 
+# ===== 탭별 데이터 수집 =====
+# 삼락/대저/화명(직접 HTTP) 결과 캐시
+CAMP_CACHE = {}        # (camp, date) -> (area_info, ts)
+CAMP_LOCK = Lock()
+SINGLEFLIGHT_WAIT = float(os.getenv("SINGLEFLIGHT_WAIT_SEC", "45"))   # 대기열(30s)+요청(10s)보다 길게
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 호출은 먼저 온 1건(leader)만 실제로 실행하고,
+    나머지(follower)는 그 결과나 예외를 그대로 공유한다.
+    leader가 실패해도 finally에서 항상 완료 신호를 보내므로 follower가 갇히지 않는다.
+    """
+
+    class _Call:
+        __slots__ = ("done", "result", "error", "followers")
+
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+            self.followers = 0
+
+    def __init__(self, name: str):
+        self.name = name
+        self.lock = Lock()
+        self.calls = {}
+        self.leaders = 0
+        self.shared = 0
+        self.follower_timeouts = 0
+
+    def do(self, key, fn, *args, timeout: float | None = None, **kwargs):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = SingleFlight._Call()
+                self.leaders += 1
+            else:
+                call.followers += 1
+                self.shared += 1
+
+        if leader:
+            try:
+                call.result = fn(*args, **kwargs)
+                return call.result
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self.lock:
+                    self.calls.pop(key, None)
+                call.done.set()
+
+        if not call.done.wait(timeout):
+            with self.lock:
+                self.follower_timeouts += 1
+            raise UpstreamError("응답이 지연되고 있습니다. 잠시 후 다시 시도해 주세요.")
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def metrics(self) -> dict:
+        with self.lock:
+            return {"leaders": self.leaders, "shared": self.shared,
+                    "follower_timeouts": self.follower_timeouts, "in_flight": len(self.calls)}
+
+
+HTTP_FLIGHT = SingleFlight("http")
+METRICS_SECTIONS["singleflight"] = lambda: {HTTP_FLIGHT.name: HTTP_FLIGHT.metrics()}
+
+@traced("fetch_realtime_areas")
+def fetch_realtime_areas(camp_key: str, selected_date: str) -> dict:
+    """
+    삼락/대저/화명(낙동 계열 real_time 페이지) 1회 수집 → 구역별 area_info.
+    요청 컨텍스트 없이도 호출 가능 (감시 루프 등 백그라운드에서 사용).
+    """
+    span_attrs(camp=camp_key)
+    spec = CAMPS[camp_key]
+    camping_url = spec.url_base.format(selected_date)
+
+    with tape_scope(camp_key, selected_date):
+        r = http_get(camping_url, timeout=10)
+    if r.status_code != 200:
+        raise UpstreamError(f"웹사이트 접속 실패: {r.status_code}")
+    with span("parse"):
+        area_info = _parse_realtime(r.text, spec.split_de)
+
+    with CAMP_LOCK:
+        _cache_set(CAMP_CACHE, (camp_key, selected_date), area_info)
+    record_snapshot(camp_key, selected_date, area_info)
+    return area_info
+
+
+def _parse_realtime(html: str, split_de: bool) -> dict:
+    soup = BeautifulSoup(html, "html.parser")
+    areas_to_process = ["area_a", "area_b", "area_c", "area_d"]
+    area_info = {}
+    if split_de:
+        areas_to_process = ["area_a", "area_b", "area_c"]
+        area_info["area_d"] = {"available": [], "unavailable": [], "num_available": 0, "num_unavailable": 0, "max_site_num": 0}
+        area_info["area_e"] = {"available": [], "unavailable": [], "num_available": 0, "num_unavailable": 0, "max_site_num": 0}
+        all_site_numbers_d, all_site_numbers_e = [], []
+
+    for area in areas_to_process:
+        available, unavailable, all_nums = [], [], []
+        for a in soup.find_all("a", class_=[area]):
+            tag = a.find("input", class_="sitename")
+            site_str = tag.get("value") if tag else None
+            if not site_str:
+                continue
+            try:
+                all_nums.append(int(site_str))
+            except ValueError:
+                continue
+            cls = a.get("class", [])
+            if "cbtn_on" in cls:
+                available.append(site_str)
+            elif "cbtn_Pcomplete" in cls:
+                unavailable.append(site_str)
+        area_info[area] = {
+            "available": available,
+            "unavailable": unavailable,
+            "num_available": len(available),
+            "num_unavailable": len(unavailable),
+            "max_site_num": max(all_nums) if all_nums else 0,
+        }
+
+    if split_de:
+        all_d_sites = soup.find_all("a", class_="area_d")
+        for a in all_d_sites:
+            nm = (a.contents[0].strip() if a.contents else "")
+            if not nm: continue
+            s = nm[1:]
+            try:
+                num = int(s)
+            except ValueError:
+                num = 0
+            cls = a.get("class", [])
+            if nm.startswith("D"):
+                target = "area_d"
+            elif nm.startswith("E"):
+                target = "area_e"
+            else:
+                continue
+            if "cbtn_on" in cls:
+                area_info[target]["available"].append(nm)
+            elif "cbtn_Pcomplete" in cls:
+                area_info[target]["unavailable"].append(nm)
+        for k in ["area_d", "area_e"]:
+            area_info[k]["num_available"] = len(area_info[k]["available"])
+            area_info[k]["num_unavailable"] = len(area_info[k]["unavailable"])
+    return area_info
+
+
+def fetch_realtime_areas_shared(camp_key: str, selected_date: str) -> dict:
+    """같은 (camp, date)를 동시에 요청하면 업스트림 호출/파싱은 1번만."""
+    return HTTP_FLIGHT.do((camp_key, selected_date), fetch_realtime_areas, camp_key, selected_date,
+                          timeout=SINGLEFLIGHT_WAIT)
+
+
+def get_realtime_areas(camp_key: str, selected_date: str) -> dict:
+    """캐시 우선, 없으면 fetch_realtime_areas_shared."""
+    cached = CAMPS[camp_key].cached(selected_date)
+    if cached is not None:
+        return cached
+    return fetch_realtime_areas_shared(camp_key, selected_date)
+
+
+# ===== 캠핑장 레지스트리 =====
+class CampSpec:
+    """
+    캠핑장 1곳의 선언. build_one / 월간 / 감시 / API 는 플래그 분기 없이 spec 만 보고 처리한다.
+      strategy    : "http"(real_time 페이지 GET 1회) | "selenium"(스케줄러 작업 + 폴링) | "link"(수집 없음, 링크만)
+      batchable   : 여러 날짜를 병렬 HTTP 로 싸게 채울 수 있는지 (월간 API 가 빈 날짜를 직접 채울지)
+      concurrency : "http"(HTTP_FLIGHT + 호스트 토큰버킷) | "selenium"(SCHEDULER + SELENIUM_SEM) | None
+      ttl_scale   : _ttl_for() 에 곱하는 배수 (수집 비용이 큰 셀레니움은 더 길게)
+      totals      : 수집 전 골격에 쓸 구역별 총 사이트 수
+      watch_areas : 감시/월간 대상 구역 (비면 감시 불가)
+    media(지도 이미지 + 요금표)는 build_registry() 에서 한 번만 만든다.
+    """
+
+    def __init__(self, key, name, strategy, *, url_base=None, url_page=None,
+                 ttl_scale=1.0, cache=None, lock=None, start_job=None,
+                 totals=None, watch_areas=(), split_de=False,
+                 price_columns=(), price_rows=(), price_note=None):
+        self.key = key
+        self.name = name
+        self.strategy = strategy
+        self.batchable = strategy == "http"
+        self.concurrency = {"http": "http", "selenium": "selenium"}.get(strategy)
+        self.url_base = url_base
+        self.url_page = url_page
+        self.ttl_scale = ttl_scale
+        self.cache = cache
+        self.lock = lock
+        self.start_job = start_job
+        self.totals = dict(totals or {})
+        self.watch_areas = list(watch_areas)
+        self.split_de = split_de      # 화명: area_d 안의 D/E 사이트를 이름으로 나눔
+        self.price_table = {"columns": list(price_columns), "rows": list(price_rows)}
+        self.price_note = price_note
+        self.media = None
+
+    def cache_key(self, d: str):
+        # HTTP 캠핑장은 CAMP_CACHE 하나를 같이 쓰므로 (camp, date), 셀레니움은 캠핑장별 캐시라 date
+        return (self.key, d) if self.cache is CAMP_CACHE else d
+
+    def cached(self, d: str):
+        """TTL 이내 캐시 (없거나 수집 안 하는 캠핑장이면 None)"""
+        if self.cache is None:
+            return None
+        with self.lock:
+            return _cache_get(self.cache, self.cache_key(d), _ttl_for(self.key, d))
+
+    def skeleton(self) -> dict:
+        """수집 전 빈 골격 (lazy 로딩/폴링 전에 그리는 표)"""
+        return {area: {"available": [], "unavailable": [], "num_available": 0, "num_unavailable": 0, "total": n}
+                for area, n in self.totals.items()}
+
+    def refresh(self, d: str):
+        """백그라운드 재수집 (감시 루프). 셀레니움은 작업 등록만, HTTP는 낮은 우선순위로 바로 수집."""
+        if self.strategy == "selenium":
+            self.start_job(d)
+        elif self.strategy == "http":
+            with fetch_priority(PRIO_BACKGROUND):
+                fetch_realtime_areas_shared(self.key, d)
+
+
+def _nakdong_url(host: str) -> str:
+    return (
+        f"https://{host}/reservation/real_time?"
+        "user_id=&site_id=&site_type=&site_name=&dis_rate=0&user_dis_rate=&reqcode=&reqname=&reqphone=&"
+        "reservation_type=0&resdate={}&schGugun=1&price=0&bagprice=2000&allprice=0&percnt=0&g-recaptcha-response="
+    )
+
+
+_WEEK = ("평일", "주말")
+_WEEK_PEAK = ("평일", "주말", "성수기")
+_NAKDONG_AREAS = ["area_a", "area_b", "area_c", "area_d"]
+
+# 탭 순서 = 등록 순서
+CAMPS = {spec.key: spec for spec in [
+    CampSpec(
+        "samnak", "삼락", "http", url_base=_nakdong_url("www.nakdongcamping.com"),
+        cache=CAMP_CACHE, lock=CAMP_LOCK, watch_areas=_NAKDONG_AREAS,
+        price_columns=_WEEK, price_rows=[
+            {"label": "오토 캠핑 SITE", "cols": {"평일": "30,000원", "주말": "35,000원"}, "color": "#DF846D"},
+            {"label": "일반 캠핑 SITE", "cols": {"평일": "20,000원", "주말": "25,000원"}, "color": "#AC81B4"},
+        ],
+    ),
+    CampSpec(
+        "daejeo", "대저", "http", url_base=_nakdong_url("www.daejeocamping.com"),
+        cache=CAMP_CACHE, lock=CAMP_LOCK, watch_areas=_NAKDONG_AREAS,
+        price_columns=_WEEK, price_rows=[
+            {"label": "A구역 (5x8)",   "cols": {"평일": "23,000원", "주말": "28,000원"}, "color": "#DF846D"},
+            {"label": "B구역 (12x12)", "cols": {"평일": "35,000원", "주말": "40,000원"}, "color": "#73ABF7"},
+            {"label": "C구역 (10x12)", "cols": {"평일": "32,000원", "주말": "37,000원"}, "color": "#D47EF1"},
+            {"label": "D구역 (10x10)", "cols": {"평일": "30,000원", "주말": "35,000원"}, "color": "#ECEE4E"},
+        ],
+    ),
+    CampSpec(
+        "hwamyeong", "화명", "http", url_base=_nakdong_url("hwamyungcamping.com"),
+        cache=CAMP_CACHE, lock=CAMP_LOCK, split_de=True, watch_areas=_NAKDONG_AREAS + ["area_e"],
+        price_columns=_WEEK, price_rows=[
+            {"label": "전 구역", "cols": {"평일": "30,000원", "주말": "35,000원"}, "color": "#DF846D"},
+        ],
+    ),
+    CampSpec(
+        "yeongdo", "영도", "selenium", url_page="https://www.yeongdo.go.kr/marinocamping/00003/00015/00028.web",
+        ttl_scale=1.5, cache=YEONGDO_CACHE, lock=YEONGDO_LOCK, start_job=start_yeongdo_job,
+        totals={"caravan": 15, "auto": 40, "general": 12}, watch_areas=["caravan", "auto", "general"],
+        price_columns=_WEEK_PEAK, price_rows=[
+            {"label": "카라반 (6인용)", "cols": {"평일": "120,000원", "주말": "140,000원", "성수기": "160,000원"}, "color": "#623ECA"},
+            {"label": "카라반 (4인용)", "cols": {"평일": "100,000원", "주말": "120,000원", "성수기": "140,000원"}, "color": "#8979E4"},
+            {"label": "오토",           "cols": {"평일": "30,000원",  "주말": "35,000원",  "성수기": "40,000원"},  "color": "#DF846D"},
+            {"label": "일반",           "cols": {"평일": "20,000원",  "주말": "25,000원",  "성수기": "30,000원"},  "color": "#AC81B4"},
+        ],
+        price_note=f"성수기: {PEAK_MONTHS[0]}~{PEAK_MONTHS[-1]}월 / 비수기: 그 외 기간",
+    ),
+    CampSpec(
+        "busan_port", "부산항", "link", url_page="https://www.busanpa.com/redevelopment/Board.do?mCode=MN0082",
+        totals={"auto": 16, "deck": 24},
+        price_columns=("요금",), price_rows=[
+            {"label": "데크", "cols": {"요금": "25,000원"}, "color": "#AC81B4"},
+            {"label": "오토", "cols": {"요금": "30,000원"}, "color": "#DF846D"},
+        ],
+    ),
+    CampSpec(
+        "gudeok", "구덕", "selenium", url_page="https://gudeok.go.kr/rent_camp01.php",
+        ttl_scale=1.5, cache=GUDEOK_CACHE, lock=GUDEOK_LOCK, start_job=start_gudeok_job,
+        totals={"deck": 18}, watch_areas=["deck"],
+        price_columns=("요금",), price_rows=[
+            {"label": "4인 이하",   "cols": {"요금": "10,000원"}, "color": "#A47D5C"},
+            {"label": "5~9인 이하", "cols": {"요금": "20,000원"}, "color": "#835A37"},
+        ],
+    ),
+]}
+
+# 탭 버튼용 (템플릿 camp_tabs). '전체'는 수집 대상이 아니라 레지스트리 밖에 둔다.
+CAMPING_TABS = {"all": {"name": "전체"}, **{k: {"name": spec.name} for k, spec in CAMPS.items()}}
+
+
+def build_registry():
+    """
+    시작 시 1회: 캠핑장별 media(지도 <picture> URL + 요금표)를 미리 만들어 둔다.
+    url_for 가 필요해서 임시 요청 컨텍스트 안에서 계산 (이미지 변환본은 import 때 manifest 에서 이미 읽어 둠).
+    """
+    with app.test_request_context():
+        for key, spec in CAMPS.items():
+            spec.media = {
+                **image_media(f"map_{key}.png"),
+                "price_table": spec.price_table,
+                "price_note": spec.price_note,
+            }
+
+
+build_registry()
+
+
+def build_one(camp_key: str, selected_date: str, lazy: bool = False):
+    """
+    탭 하나의 표시용 데이터(구역별 잔여/총 + media)를 만든다.
+    lazy=True면 삼락/대저/화명도 캐시에 있을 때만 채우고, 없으면 빈 골격 + lazy_camp 플래그
+    (→ 브라우저가 /api/camp/<key> 로 받아 채움).
+    """
+    spec = CAMPS[camp_key]
+    base = {"key": camp_key, "name": spec.name, "media": spec.media, "error": None}
+
+    # 부산항: 수집 없이 골격만
+    if spec.strategy == "link":
+        return {**base, "areas": spec.skeleton()}
+
+    # 영도/구덕: 즉시 빈 골격 + lazy 플래그만, 데이터는 /api/yeongdo · /api/gudeok 폴링으로
+    if spec.strategy == "selenium":
+        if DISABLE_SCRAPERS:
+            return {**base, "areas": spec.skeleton(), "error": "셀레니움 수집이 꺼져 있습니다."}
+        return {**base, "areas": spec.skeleton(), f"lazy_{camp_key}": True}   # ⬅️ 템플릿 트리거 플래그
+
+    # 삼락/대저/화명
+    if lazy:
+        cached = spec.cached(selected_date)
+        if cached is None:
+            return {**base, "areas": {}, "lazy_camp": True}
+        return {**base, "areas": cached}
+    try:
+        return {**base, "areas": get_realtime_areas(camp_key, selected_date)}
+    except UpstreamError as e:
+        return {**base, "areas": {}, "error": str(e)}
+    except Exception as e:
+        return {**base, "areas": {}, "error": f"데이터 수집 오류: {e}"}
+
+
+@app.route("/api/camp/<camp_key>")
+def api_camp(camp_key):
+    """build_one() 결과 그대로 (캐시 → 없으면 수집). 전체 보기에서 캠핑장별로 채울 때 사용."""
+    if camp_key not in CAMPS:
+        return jsonify({"error": f"unknown camp: {camp_key}"}), 404
+    d = request.args.get("date") or date.today().strftime("%Y-%m-%d")
+    try:
+        datetime.strptime(d, "%Y-%m-%d")
+    except ValueError:
+        return jsonify({"error": "date must be YYYY-MM-DD"}), 400
+    if is_bot():
+        return jsonify(build_one(camp_key, d, lazy=True))   # 봇이면 캐시에 없어도 수집하지 않음
+    limited = rate_limited("poll") or rate_limited("fetch", uncached_http_camps([camp_key], d))
+    if limited:
+        return limited
+    return jsonify(build_one(camp_key, d))
+
+
+# ===== 월간 달력 API =====
+import calendar
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+MONTH_FETCH_CONCURRENCY = int(os.getenv("MONTH_FETCH_CONCURRENCY", "4"))
+MONTH_FETCH_MAX = int(os.getenv("MONTH_FETCH_MAX", "10"))        # 요청 1건이 직접 수집하는 날짜 수 상한 (나머지는 unknown)
+MONTH_WINDOW_DAYS = int(os.getenv("MONTH_WINDOW_DAYS", "62"))    # 예약 가능 기간: 오늘부터 이 일수까지 (이번 달 ~ 그 날짜가 있는 달만 조회)
+
+def _cached_areas(camp_key: str, d: str):
+    """
+    (camp, date)의 캐시된 구역 데이터. 반환: (areas, status)
+    status: "cached"(TTL 이내) | "stale"(TTL은 지났지만 마지막 스냅샷) | None
+    """
+    data = CAMPS[camp_key].cached(d)
+    if data is not None and not data.get("error"):
+        return data, "cached"
+
+    snap = load_snapshot(camp_key, d)
+    snap = _snapshot_view(snap) if snap else None
+    if snap:
+        return snap["areas"], "stale"
+    return None, None
+
+def _free_counts(areas: dict) -> dict:
+    out = {}
+    for area, info in (areas or {}).items():
+        if isinstance(info, dict) and "available" in info:
+            out[area] = len(info.get("available") or [])
+    return out
+
+
+@app.route("/api/month")
+def api_month():
+    """
+    ?camp=samnak&ym=YYYY-MM
+    한 달 치 날짜별/구역별 잔여 수. 캐시(또는 마지막 스냅샷)를 우선 쓰고,
+    직접 HTTP 캠핑장(spec.batchable)은 빈 날짜를 가까운 날부터 MONTH_FETCH_MAX 개까지만
+    MONTH_FETCH_CONCURRENCY 개씩 병렬로 채운다. 상한을 넘은 날짜와 예약 가능 기간 밖의 날짜는 status="unknown".
+    batchable 이 아닌 셀레니움 캠핑장(영도/구덕)은 날짜마다 브라우저를 띄우지 않고 status="missing"으로 둔다.
+    ym 이 예약 가능 기간(이번 달 ~ 오늘+MONTH_WINDOW_DAYS 가 있는 달) 밖이면 400.
+    """
+    camp_key = request.args.get("camp", "samnak")
+    spec = CAMPS.get(camp_key)
+    if not spec or not spec.watch_areas:
+        return jsonify({"error": f"월간 조회를 지원하지 않는 캠핑장입니다: {camp_key}"}), 400
+
+    today = date.today()
+    ym = request.args.get("ym") or today.strftime("%Y-%m")
+    try:
+        first = datetime.strptime(ym, "%Y-%m").date()
+    except ValueError:
+        return jsonify({"error": "ym은 YYYY-MM 형식이어야 합니다."}), 400
+    last_day = today + timedelta(days=MONTH_WINDOW_DAYS)
+    if not (today.replace(day=1) <= first <= last_day.replace(day=1)):
+        return jsonify({"error": f"ym은 {today:%Y-%m} ~ {last_day:%Y-%m} 사이여야 합니다."}), 400
+    n_days = calendar.monthrange(first.year, first.month)[1]
+
+    days, missing = {}, []
+    for i in range(n_days):
+        day = first + timedelta(days=i)
+        d = day.strftime("%Y-%m-%d")
+        if day < today:
+            days[d] = {"status": "past", "free": None, "areas": None}
+            continue
+        if day > last_day:
+            days[d] = {"status": "unknown", "free": None, "areas": None}
+            continue
+        areas, status = _cached_areas(camp_key, d)
+        if areas is not None:
+            counts = _free_counts(areas)
+            days[d] = {"status": status, "free": sum(counts.values()), "areas": counts}
+        else:
+            missing.append(d)
+            days[d] = {"status": "missing", "free": None, "areas": None}
+
+    if missing and spec.batchable and not is_bot():
+        limited = rate_limited("bulk")
+        if limited:
+            return limited
+        for d in missing[MONTH_FETCH_MAX:]:     # 가까운 날짜부터 상한까지만 (나머지는 다음 조회 때 캐시로)
+            days[d] = {"status": "unknown", "free": None, "areas": None}
+        with ThreadPoolExecutor(max_workers=MONTH_FETCH_CONCURRENCY) as ex:
+            futs = {ex.submit(with_priority, PRIO_BULK, get_realtime_areas, camp_key, d): d
+                    for d in missing[:MONTH_FETCH_MAX]}
+            for fut in as_completed(futs):
+                d = futs[fut]
+                try:
+                    counts = _free_counts(fut.result())
+                    days[d] = {"status": "fetched", "free": sum(counts.values()), "areas": counts}
+                except Exception as e:
+                    days[d] = {"status": "error", "free": None, "areas": None, "error": str(e)}
+
+    return jsonify({"camp": camp_key, "ym": ym, "days": days})
+
+
+# ===== 빈자리 감시(watch) =====
+# 사용자는 (camp, date, area)를 등록만 하고, 서버의 공용 루프가
+# 감시 중인 (camp, date) 키마다 WATCH_INTERVAL에 한 번만 재수집한다.
+# → 부하는 클라이언트 수가 아니라 '서로 다른 감시 키 수'에 비례.
+# 감시 목록·local 알림함은 공유 STATE_DB 에 둔다 → 어느 워커로 GET/DELETE 가 가도 같고, 워커가 재시작돼도 남는다.
+# 루프는 워커마다 돌 수 있지만 watch_runs 행을 먼저 잡은(claim) 워커만 그 키를 재수집한다.
+WATCH_SCHEMA = """
+CREATE TABLE IF NOT EXISTS watches (
+    id        TEXT    PRIMARY KEY,
+    camp      TEXT    NOT NULL,
+    resdate   TEXT    NOT NULL,
+    area      TEXT,
+    sink      TEXT    NOT NULL,   -- JSON {"type": ..., ...}
+    client    TEXT    NOT NULL,
+    created   REAL    NOT NULL,
+    notified  INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_watches_key    ON watches (camp, resdate);
+CREATE INDEX IF NOT EXISTS idx_watches_client ON watches (client);
+CREATE TABLE IF NOT EXISTS watch_runs (
+    camp      TEXT NOT NULL,
+    resdate   TEXT NOT NULL,
+    last_run  REAL NOT NULL,
+    PRIMARY KEY (camp, resdate)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS watch_inbox (
+    id        INTEGER PRIMARY KEY,
+    watch_id  TEXT NOT NULL,
+    payload   TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_watch_inbox ON watch_inbox (watch_id, id);
+"""
+_state_db().executescript(WATCH_SCHEMA)
+
+import ipaddress
+import socket
+
+WATCH_LOCK = Lock()
+WATCH_INTERVAL = int(os.getenv("WATCH_INTERVAL_SEC", "300"))
+WATCH_MAX = int(os.getenv("WATCH_MAX", "500"))
+WATCH_MAX_PER_CLIENT = int(os.getenv("WATCH_MAX_PER_CLIENT", "5"))
+WEBHOOK_ALLOW_PRIVATE = os.getenv("WEBHOOK_ALLOW_PRIVATE", "0") == "1"   # 로컬 개발에서 127.0.0.1 수신기를 쓸 때만
+_WATCH_THREAD = None
+
+# 감시 가능한 캠핑장 → 구역 키 (레지스트리의 watch_areas)
+WATCHABLE_AREAS = {k: spec.watch_areas for k, spec in CAMPS.items() if spec.watch_areas}
+
+
+def _blocked_ip(ip) -> bool:
+    if ip.version == 6 and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return (not ip.is_global or ip.is_private or ip.is_loopback or ip.is_link_local
+            or ip.is_reserved or ip.is_multicast or ip.is_unspecified)
+
+
+def check_public_url(url: str):
+    """
+    webhook 대상이 공인 주소인지 확인 (SSRF 방지). 호스트가 가리키는 모든 주소를 풀어서
+    사설/루프백/링크로컬(169.254.169.254 메타데이터 포함)/예약 대역이 하나라도 있으면 ValueError.
+    """
+    p = urlparse(url)
+    if p.scheme not in ("http", "https") or not p.hostname:
+        raise ValueError("webhook url은 http(s)://호스트 형식이어야 합니다.")
+    if WEBHOOK_ALLOW_PRIVATE:
+        return
+    try:
+        infos = socket.getaddrinfo(p.hostname, p.port or (443 if p.scheme == "https" else 80),
+                                   proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, UnicodeError, ValueError):
+        raise ValueError(f"webhook 호스트를 찾을 수 없습니다: {p.hostname}")
+    for info in infos:
+        if _blocked_ip(ipaddress.ip_address(info[4][0].split("%")[0])):
+            raise ValueError(f"webhook 으로 내부/예약 주소는 쓸 수 없습니다: {p.hostname}")
+
+
+class WebhookSink:
+    """알림을 JSON으로 POST. 등록할 때와 보낼 때 모두 대상 주소를 다시 확인한다 (DNS 가 바뀌었을 수 있음)."""
+    kind = "webhook"
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        if not isinstance(url, str) or not re.match(r"^https?://", url):
+            raise ValueError("webhook url은 http(s)://로 시작해야 합니다.")
+        self.url = url
+        self.timeout = timeout
+
+    def check(self):
+        check_public_url(self.url)
+
+    def send(self, payload: dict):
+        self.check()
+        # 리다이렉트를 따라가면 검사한 주소를 벗어날 수 있으므로 따라가지 않음
+        requests.post(self.url, json=payload, timeout=self.timeout, allow_redirects=False)
+
+    def spec(self) -> dict:
+        return {"type": self.kind, "url": self.url}
+
+    def describe(self):
+        return {"type": self.kind, "url": self.url}
+
+
+class LocalSink:
+    """로컬/테스트용: 알림을 공유 DB(watch_inbox)에 쌓아두고 GET /api/watch/<id> 로 꺼내 본다."""
+    kind = "local"
+
+    def __init__(self, watch_id: str, maxlen: int = 50):
+        self.watch_id = watch_id
+        self.maxlen = maxlen
+
+    def check(self):
+        pass
+
+    def send(self, payload: dict):
+        with _state_tx() as conn:
+            conn.execute("INSERT INTO watch_inbox (watch_id, payload) VALUES (?, ?)",
+                         (self.watch_id, json.dumps(payload, ensure_ascii=False)))
+            conn.execute("DELETE FROM watch_inbox WHERE watch_id = ? AND id NOT IN"
+                         " (SELECT id FROM watch_inbox WHERE watch_id = ? ORDER BY id DESC LIMIT ?)",
+                         (self.watch_id, self.watch_id, self.maxlen))
+
+    def drain(self) -> list:
+        with _state_tx() as conn:
+            rows = conn.execute("SELECT id, payload FROM watch_inbox WHERE watch_id = ? ORDER BY id",
+                                (self.watch_id,)).fetchall()
+            conn.execute("DELETE FROM watch_inbox WHERE watch_id = ?", (self.watch_id,))
+        return [json.loads(p) for _, p in rows]
+
+    def spec(self) -> dict:
+        return {"type": self.kind}
+
+    def describe(self):
+        n = _state_db().execute("SELECT COUNT(*) FROM watch_inbox WHERE watch_id = ?", (self.watch_id,)).fetchone()[0]
+        return {"type": self.kind, "pending": n}
+
+
+# sink 종류 확장 지점: ({"type": ..., ...}, watch_id) → sink 인스턴스. spec 은 그대로 DB 에 저장된다.
+WATCH_SINKS = {
+    "webhook": lambda spec, wid: WebhookSink(spec.get("url")),
+    "local":   lambda spec, wid: LocalSink(wid),
+}
+
+
+def _sink_for(sink_json: str, wid: str):
+    spec = json.loads(sink_json)
+    return WATCH_SINKS[spec["type"]](spec, wid)
+
+
+def _deliver(sink, payload: dict):
+    try:
+        sink.send(payload)
+    except Exception as e:
+        print(f"[watch] {sink.kind} delivery error:", repr(e), flush=True)
+
+
+def _notify_watchers(event: dict):
+    """record_snapshot이 만든 변경 이벤트 중 '새로 예약 가능'만 해당 감시자에게 전달."""
+    if not event or event.get("initial"):
+        return  # 첫 스냅샷은 기준점일 뿐 (취소표 아님)
+    rows = _state_db().execute(
+        "SELECT id, camp, resdate, area, sink FROM watches WHERE camp = ? AND resdate = ?",
+        (event["camp"], event["date"]),
+    ).fetchall()
+    for wid, camp, d, area, sink_json in rows:
+        opened = {
+            a: ch["opened"] for a, ch in event["changes"].items()
+            if ch.get("opened") and (not area or area == a)
+        }
+        if not opened:
+            continue
+        with _state_tx() as conn:
+            conn.execute("UPDATE watches SET notified = notified + 1 WHERE id = ?", (wid,))
+        payload = {
+            "watch_id": wid,
+            "camp": camp,
+            "date": d,
+            "opened": opened,
+            "version": event["version"],
+            "ts": event["ts"],
+        }
+        try:
+            sink = _sink_for(sink_json, wid)
+        except (KeyError, ValueError) as e:
+            print(f"[watch][{wid}] bad sink:", repr(e), flush=True)
+            continue
+        Thread(target=_deliver, args=(sink, payload), daemon=True).start()
+
+
+def _rescrape_key(camp: str, d: str):
+    """감시 키 1개 재수집. 결과는 record_snapshot → _notify_watchers 로 흘러간다."""
+    CAMPS[camp].refresh(d)
+
+
+def _claim_watch_key(camp: str, d: str, now: float) -> bool:
+    """이 워커가 이번 주기에 (camp, date)를 재수집할 차례인지. 다른 워커가 먼저 잡았으면 False."""
+    with _state_tx() as conn:
+        cur = conn.execute(
+            "INSERT INTO watch_runs (camp, resdate, last_run) VALUES (?, ?, ?)"
+            " ON CONFLICT (camp, resdate) DO UPDATE SET last_run = excluded.last_run"
+            " WHERE watch_runs.last_run <= ?",
+            (camp, d, now, now - WATCH_INTERVAL),
+        )
+        return cur.rowcount == 1
+
+
+def _purge_past_watches(today: str):
+    """지난 날짜 감시는 자동 해제"""
+    with _state_tx() as conn:
+        conn.execute("DELETE FROM watch_inbox WHERE watch_id IN (SELECT id FROM watches WHERE resdate < ?)", (today,))
+        conn.execute("DELETE FROM watches WHERE resdate < ?", (today,))
+        conn.execute("DELETE FROM watch_runs WHERE resdate < ?", (today,))
+
+
+def _watch_loop():
+    global _WATCH_THREAD
+    while True:
+        today = date.today().strftime("%Y-%m-%d")
+        _purge_past_watches(today)
+        with WATCH_LOCK:
+            keys = _state_db().execute("SELECT DISTINCT camp, resdate FROM watches").fetchall()
+            if not keys:
+                _WATCH_THREAD = None
+                return
+
+        now = time.time()
+        for camp, d in keys:
+            # 다른 요청이 이미 최근에 수집했다면(스냅샷 ts) 이번 주기는 건너뜀
+            snap = load_snapshot(camp, d)
+            last_seen = snap["ts"] if snap else 0
+            if now - last_seen < WATCH_INTERVAL or not _claim_watch_key(camp, d, now):
+                continue
+            try:
+                _rescrape_key(camp, d)
+            except Exception as e:
+                print(f"[watch][{camp}][{d}] rescrape error:", repr(e), flush=True)
+        time.sleep(min(5, WATCH_INTERVAL))
+
+
+def _ensure_watch_loop():
+    global _WATCH_THREAD
+    with WATCH_LOCK:
+        if _WATCH_THREAD is None or not _WATCH_THREAD.is_alive():
+            _WATCH_THREAD = Thread(target=_watch_loop, daemon=True)
+            _WATCH_THREAD.start()
+
+
+def _load_watch(wid: str):
+    row = _state_db().execute(
+        "SELECT id, camp, resdate, area, sink, created, notified FROM watches WHERE id = ?", (wid,)).fetchone()
+    if not row:
+        return None
+    return dict(zip(("id", "camp", "date", "area", "sink", "created", "notified"), row))
+
+
+def _watch_view(rec: dict) -> dict:
+    return {
+        "id": rec["id"], "camp": rec["camp"], "date": rec["date"], "area": rec["area"],
+        "sink": _sink_for(rec["sink"], rec["id"]).describe(), "created": rec["created"], "notified": rec["notified"],
+    }
+
+
+def _watch_not_found(wid: str):
+    """감시 목록은 워커 공용이므로 404 = 없는 id 이거나 지난 날짜라 자동 해제된 것"""
+    return jsonify({"error": "not found", "id": wid, "reason": "unknown_or_expired"}), 404
+
+
+@app.route("/api/watch", methods=["POST"])
+def api_watch_create():
+    """
+    body(JSON): {"camp": "yeongdo", "date": "YYYY-MM-DD", "area": "auto"(선택),
+                 "sink": {"type": "webhook", "url": "..."} (생략 시 local)}
+    """
+    if is_bot():
+        return jsonify({"error": "crawler"}), 403
+    limited = rate_limited("watch")
+    if limited:
+        return limited
+    body = request.get_json(silent=True)
+    if body is None:
+        body = {}
+    if not isinstance(body, dict):
+        return jsonify({"error": "요청 본문은 JSON 객체여야 합니다."}), 400
+    camp = body.get("camp")
+    d = body.get("date")
+    area = body.get("area") or None
+
+    if not isinstance(camp, str) or camp not in WATCHABLE_AREAS:
+        return jsonify({"error": f"감시할 수 없는 캠핑장입니다: {camp}"}), 400
+    try:
+        if datetime.strptime(d if isinstance(d, str) else "", "%Y-%m-%d").date() < date.today():
+            return jsonify({"error": "지난 날짜는 감시할 수 없습니다."}), 400
+    except ValueError:
+        return jsonify({"error": "date는 YYYY-MM-DD 형식이어야 합니다."}), 400
+    if area and (not isinstance(area, str) or area not in WATCHABLE_AREAS[camp]):
+        return jsonify({"error": f"알 수 없는 구역입니다: {area}"}), 400
+
+    spec = body.get("sink") or {"type": "local"}
+    if not isinstance(spec, dict):
+        return jsonify({"error": "sink 는 JSON 객체여야 합니다."}), 400
+    factory = WATCH_SINKS.get(spec["type"]) if isinstance(spec.get("type"), str) else None
+    if not factory:
+        return jsonify({"error": f"알 수 없는 sink 입니다: {spec.get('type')}"}), 400
+    wid = uuid4().hex
+    try:
+        sink = factory(spec, wid)
+        sink.check()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    client = client_id()
+    with _state_tx() as conn:
+        if conn.execute("SELECT COUNT(*) FROM watches").fetchone()[0] >= WATCH_MAX:
+            return jsonify({"error": "감시 등록이 가득 찼습니다."}), 503
+        if conn.execute("SELECT COUNT(*) FROM watches WHERE client = ?", (client,)).fetchone()[0] >= WATCH_MAX_PER_CLIENT:
+            return jsonify({"error": f"감시는 한 사용자당 {WATCH_MAX_PER_CLIENT}개까지 등록할 수 있습니다."}), 429
+        conn.execute(
+            "INSERT INTO watches (id, camp, resdate, area, sink, client, created) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (wid, camp, d, area, json.dumps(sink.spec()), client, time.time()),
+        )
+    _ensure_watch_loop()
+    return jsonify(_watch_view(_load_watch(wid))), 201
+
+
+@app.route("/api/watch/<wid>", methods=["GET"])
+def api_watch_get(wid):
+    rec = _load_watch(wid)
+    if not rec:
+        return _watch_not_found(wid)
+    view = _watch_view(rec)
+    # local sink면 쌓인 알림을 꺼내서 같이 돌려줌
+    sink = _sink_for(rec["sink"], wid)
+    if isinstance(sink, LocalSink):
+        view["notifications"] = sink.drain()
+    return jsonify(view)
+
+
+@app.route("/api/watch/<wid>", methods=["DELETE"])
+def api_watch_delete(wid):
+    with _state_tx() as conn:
+        deleted = conn.execute("DELETE FROM watches WHERE id = ?", (wid,)).rowcount
+        conn.execute("DELETE FROM watch_inbox WHERE watch_id = ?", (wid,))
+    if not deleted:
+        return _watch_not_found(wid)
+    return jsonify({"deleted": wid})
+
+
+# 다른 워커가 등록한 감시가 남아 있으면 이 워커도 루프를 돌린다 (워커 재시작 후에도 감시가 이어지도록)
+if _state_db().execute("SELECT 1 FROM watches LIMIT 1").fetchone():
+    _ensure_watch_loop()
+
+
+# ===== 클라이언트별 요청 제한 =====
+# 한 클라이언트가 날짜를 바꿔 가며 /api/yeongdo 를 돌리면 날짜마다 Chrome 작업이 뜨고,
+# 캐시에 없는 ?camp=all 은 한 번에 업스트림 세 곳을 긁는다.
+# (클라이언트 IP, 요청 등급)마다 TokenBucket(업스트림 제한과 같은 클래스)을 두고,
+# 새 수집을 시작하는 요청(fetch/scrape/bulk)은 캐시 응답·폴링(page/poll)보다 훨씬 빡빡하게 제한한다.
+# 넘으면 429 + Retry-After. 셀레니움 작업은 클라이언트당 동시 CLIENT_MAX_JOBS 개까지만 → SELENIUM_SEM 독점 방지.
+CLIENT_RATE_LIMIT = os.getenv("CLIENT_RATE_LIMIT", "1") == "1"
+# 앞단 프록시 수. 0 이면 remote_addr 만 (X-Forwarded-For 는 클라이언트가 마음대로 넣을 수 있음).
+# N 이면 X-Forwarded-For 오른쪽에서 N 번째 = 가장 바깥 신뢰 프록시가 붙인 주소 (werkzeug ProxyFix x_for 와 같은 규칙)
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
+# 등급 -> (초당 토큰, 버스트)
+CLIENT_RATE_DEFAULTS = {
+    "page":   (1.0, 30),      # 화면 렌더
+    "poll":   (3.0, 60),      # /api/* 캐시 응답 · 진행 중 작업 폴링 (브라우저가 1초 간격)
+    "fetch":  (0.2, 10),      # 캐시에 없는 HTTP 캠핑장 수집 (삼락/대저/화명, 1건 = 1토큰)
+    "scrape": (1 / 20, 4),    # 새 셀레니움 작업 (영도/구덕): 한 번에 4건, 이후 20초에 1건
+    "bulk":   (1 / 60, 2),    # 월간 조회 일괄 수집
+    "watch":  (1 / 60, 5),    # 감시 등록
+}
+CLIENT_RATES = {**CLIENT_RATE_DEFAULTS, **_parse_rate_limits(os.getenv("CLIENT_RATE_LIMITS", ""))}
+CLIENT_MAX_JOBS = int(os.getenv("CLIENT_MAX_JOBS", "2"))
+CLIENT_BUCKETS_MAX = int(os.getenv("CLIENT_BUCKETS_MAX", "5000"))
+CLIENT_BUCKETS = {}           # (client, 등급) -> TokenBucket
+CLIENT_LIMIT_LOCK = Lock()
+CLIENT_LIMIT_STATS = {kind: {"allowed": 0, "limited": 0} for kind in CLIENT_RATES}
+CLIENT_JOBS_REFUSED = 0
+
+
+def client_id() -> str:
+    """요청 제한 키. 신뢰 프록시가 붙인 주소만 쓰고, 클라이언트가 넣은 왼쪽 항목은 보지 않는다."""
+    if TRUSTED_PROXY_HOPS > 0:
+        hops = [h.strip() for h in request.headers.get("X-Forwarded-For", "").split(",") if h.strip()]
+        if len(hops) >= TRUSTED_PROXY_HOPS:
+            return hops[-TRUSTED_PROXY_HOPS]
+    return request.remote_addr or "-"
+
+
+def _prune_client_buckets():
+    """가득 찬(한동안 안 쓴) 버킷부터 버리고, 그래도 많으면 오래된 순으로. CLIENT_LIMIT_LOCK 안에서 호출."""
+    for key in [k for k, b in CLIENT_BUCKETS.items() if b.idle_full()]:
+        del CLIENT_BUCKETS[key]
+    over = len(CLIENT_BUCKETS) - CLIENT_BUCKETS_MAX // 2
+    if over > 0:
+        for key, _ in sorted(CLIENT_BUCKETS.items(), key=lambda kv: kv[1].last)[:over]:
+            del CLIENT_BUCKETS[key]
+
+
+def client_allow(kind: str, cost: float = 1) -> float:
+    """이 요청의 클라이언트 버킷에서 cost 만큼 쓴다. 통과면 0, 아니면 기다려야 할 초."""
+    if not CLIENT_RATE_LIMIT or cost <= 0:
+        return 0.0
+    key = (client_id(), kind)
+    with CLIENT_LIMIT_LOCK:
+        bucket = CLIENT_BUCKETS.get(key)
+        if bucket is None:
+            if len(CLIENT_BUCKETS) >= CLIENT_BUCKETS_MAX:
+                _prune_client_buckets()
+            bucket = CLIENT_BUCKETS[key] = TokenBucket(*CLIENT_RATES[kind])
+        delay = bucket.take_or_delay(cost)
+        CLIENT_LIMIT_STATS[kind]["limited" if delay else "allowed"] += 1
+    return delay
+
+
+def too_many_requests(delay: float, html: bool = False):
+    """429 + Retry-After. API 는 폴링 코드가 알아보도록 status="limited" JSON."""
+    retry = max(1, int(delay + 0.999))
+    msg = f"요청이 너무 많습니다. {retry}초 후 다시 시도해 주세요."
+    if html:
+        resp = app.make_response((msg, 429))
+    else:
+        resp = jsonify({"status": "limited", "error": msg, "retry_after": retry})
+        resp.status_code = 429
+    resp.headers["Retry-After"] = str(retry)
+    return resp
+
+
+def rate_limited(kind: str, cost: float = 1, html: bool = False):
+    """제한에 걸리면 429 응답, 아니면 None"""
+    delay = client_allow(kind, cost)
+    return too_many_requests(delay, html) if delay else None
+
+
+def client_jobs(client: str) -> int:
+    """
+    이 클라이언트가 시작해서 아직 진행 중인 셀레니움 작업 수 (영도 + 구덕).
+    각 INFLIGHT 는 자기 락 안에서만 복사한다 → 두 락 중 어느 것도 잡지 않은 상태에서 호출할 것.
+    """
+    with YEONGDO_LOCK:
+        jobs = list(INFLIGHT.values())
+    with GUDEOK_LOCK:
+        jobs += list(GUDEOK_INFLIGHT.values())
+    return sum(1 for rec in jobs if rec.get("client") == client)
+
+
+def scrape_limited():
+    """새 셀레니움 작업을 시작해도 되는지: 동시 작업 수 → scrape 버킷 순. 막히면 429 응답. (INFLIGHT 락 밖에서 호출)"""
+    global CLIENT_JOBS_REFUSED
+    if not CLIENT_RATE_LIMIT:
+        return None
+    if client_jobs(client_id()) >= CLIENT_MAX_JOBS:
+        CLIENT_JOBS_REFUSED += 1
+        return too_many_requests(INFLIGHT_MAX / 10)   # 앞 작업이 끝날 즈음 다시
+    return rate_limited("scrape")
+
+
+def uncached_http_camps(keys, d: str) -> int:
+    """keys 중 이 요청이 업스트림을 직접 긁게 될 HTTP 캠핑장 수"""
+    return sum(1 for k in keys if CAMPS[k].strategy == "http" and CAMPS[k].cached(d) is None)
+
+
+METRICS_SECTIONS["client_limits"] = lambda: {
+    "enabled": CLIENT_RATE_LIMIT,
+    "rates": {k: {"rate": round(r, 4), "burst": b} for k, (r, b) in CLIENT_RATES.items()},
+    "by_kind": {k: dict(v) for k, v in CLIENT_LIMIT_STATS.items()},
+    "jobs_refused": CLIENT_JOBS_REFUSED,
+    "tracked_buckets": len(CLIENT_BUCKETS),
+}
+
+
+# ===== 크롤러 대응 (봇 감지 + 스냅샷 페이지 + 동적 sitemap) =====
+# 검색 크롤러가 페이지를 렌더링하면 lazy-load JS 가 /api/yeongdo · /api/gudeok 를 불러 임의 날짜로 Chrome 작업을 띄운다.
+# 봇/링크 미리보기에는 캐시(또는 마지막 스냅샷)만으로 만든 정적 페이지를 BOT_PAGE_TTL 마다 다시 만들어 주고,
+# API 도 봇 요청으로는 수집을 시작하지 않는다. → 크롤링 트래픽은 업스트림/브라우저 비용 0.
+from xml.sax.saxutils import escape
+
+BOT_UA_RE = re.compile(os.getenv(
+    "BOT_UA_PATTERN",
+    r"bot|crawl|spider|slurp|yeti|daumoa|facebookexternalhit|kakaotalk-scrap|slack|discord|whatsapp|"
+    r"telegram|preview|embedly|headlesschrome|lighthouse"), re.I)
+SITE_URL = os.getenv("SITE_URL", "https://campingbusan.onrender.com").rstrip("/")
+BOT_PAGE_TTL = int(os.getenv("BOT_PAGE_TTL_SEC", "600"))
+BOT_PAGE_MAX = int(os.getenv("BOT_PAGE_MAX", "200"))
+BOT_PAGES = {}             # (camp, date) -> (html, ts)
+BOT_PAGES_LOCK = Lock()
+BOT_STATS = {"pages": 0, "rendered": 0, "api_cached_only": 0}
+
+
+def is_bot() -> bool:
+    """User-Agent 로 크롤러/링크 미리보기 판별 (UA 가 없으면 사람 취급 — 워밍업 test_client 등)"""
+    ua = request.headers.get("User-Agent", "")
+    return bool(ua) and bool(BOT_UA_RE.search(ua))
+
+
+def build_cached(camp_key: str, selected_date: str) -> dict:
+    """build_one 의 캐시 전용판: 캐시 → 마지막 스냅샷 → 빈 골격. 수집은 절대 시작하지 않음."""
+    spec = CAMPS[camp_key]
+    areas, status = _cached_areas(camp_key, selected_date) if spec.cache is not None else (None, None)
+    camp = {"key": camp_key, "name": spec.name, "media": spec.media, "error": None,
+            "areas": areas or spec.skeleton(), "snapshot_status": status}
+    if areas is None and spec.strategy == "http":
+        # 탭 표는 수집 결과 형태(max_site_num 등)가 필요 → 수집 실패와 같은 모양으로 안내, 전체 보기는 '…'
+        camp.update(areas={}, lazy_camp=True, error="저장된 현황이 없습니다. 예약 페이지에서 확인하세요.")
+    return camp
+
+
+def bot_page(camp_key: str, selected_date: str) -> str:
+    key = (camp_key, selected_date)
+    now = time.time()
+    BOT_STATS["pages"] += 1
+    with BOT_PAGES_LOCK:
+        rec = BOT_PAGES.get(key)
+        if rec and now - rec[1] < BOT_PAGE_TTL:
+            return rec[0]
+    keys = list(CAMPS) if camp_key == "all" else [camp_key]
+    html = render_template(
+        "index.html",
+        all_camps=[build_cached(k, selected_date) for k in keys],
+        selected_date=selected_date,
+        camp_tabs=CAMPING_TABS,
+        selected_camp_key=camp_key,
+        snapshot=True,
+        snapshot_at=datetime.now().strftime("%Y-%m-%d %H:%M"),
+    )
+    BOT_STATS["rendered"] += 1
+    with BOT_PAGES_LOCK:
+        BOT_PAGES[key] = (html, now)
+        if len(BOT_PAGES) > BOT_PAGE_MAX:
+            for k, _ in sorted(BOT_PAGES.items(), key=lambda kv: kv[1][1])[:len(BOT_PAGES) - BOT_PAGE_MAX]:
+                BOT_PAGES.pop(k, None)
+    return html
+
+
+def bot_api_response(camp_key: str, d: str):
+    """봇이 부른 /api/yeongdo · /api/gudeok: 캐시만 (없으면 skipped, 작업 등록 안 함)"""
+    BOT_STATS["api_cached_only"] += 1
+    areas, status = _cached_areas(camp_key, d)
+    if areas is None:
+        return jsonify({"status": "skipped", "date": d, "reason": "crawler"})
+    return jsonify({"status": "ready", "date": d, "data": areas, "cache": status,
+                    "version": snapshot_version(camp_key, d), "epoch": CHANGE_EPOCH})
+
+
+@app.route('/sitemap.xml')
+def serve_sitemap():
+    """탭(캠핑장)마다 URL 하나. 날짜별 URL 은 넣지 않음 (크롤러가 임의 날짜를 돌지 않게)"""
+    today = date.today().strftime("%Y-%m-%d")
+    urls = [("/", "1.0")] + [(f"/?camp={k}", "0.8") for k in CAMPING_TABS]
+    body = "".join(
+        f"<url><loc>{escape(SITE_URL + path)}</loc><lastmod>{today}</lastmod>"
+        f"<changefreq>hourly</changefreq><priority>{prio}</priority></url>"
+        for path, prio in urls
+    )
+    xml = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+           f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{body}</urlset>\n')
+    resp = Response(xml, mimetype="application/xml")
+    resp.headers["Cache-Control"] = "public, max-age=3600"
+    return resp
+
+
+METRICS_SECTIONS["bots"] = lambda: {**BOT_STATS, "cached_pages": len(BOT_PAGES)}
+
+
 # ===== Flask 라우트 =====
+# 전체 보기 렌더링 방식:
+#   progressive(기본) — 셸 먼저 + /api/camp 로 채움
+#   stream            — 헤더/탭을 먼저 보내고 캠핑장 섹션을 수집 완료 순서대로 흘려보냄 (JS 없이도 완성된 HTML)
+#   blocking          — 예전처럼 모두 수집 후 응답
+ALL_RENDER_MODE = os.getenv("ALL_RENDER_MODE", "progressive")
+
+
+def _build_as_completed(keys, selected_date):
+    """build_one 을 동시에 돌리고 끝나는 순서대로 yield (템플릿의 all_camps 로 그대로 전달)"""
+    pool = ThreadPoolExecutor(max_workers=len(keys), thread_name_prefix="build-one")
+    try:
+        # media 는 레지스트리에 미리 만들어져 있어 요청 컨텍스트 없이 돌려도 됨
+        futures = [pool.submit(build_one, k, selected_date) for k in keys]
+        for fut in as_completed(futures):
+            yield fut.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
 @app.route("/", methods=["GET", "POST"])
 def home():
     today = date.today().strftime("%Y-%m-%d")
@@ -1464,127 +4482,42 @@ def home():
     selected_date = request.args.get("resdate", today)
     selected_camp_key = request.args.get("camp", "samnak")
 
-    def build_one(camp_key: str):
-        camp_info = CAMPING_TABS.get(camp_key)
-        media = build_media(camp_key)
-        # 아래 기존 분기 로직을 camp_info 기준으로 그대로 사용 (내용은 기존 코드에서 복붙)
-        # ─────────────────────────────────────────
-        # 0) 부산항
-        if camp_info.get("is_busan_port"):
-            areas = {
-                "auto": {"available": [], "unavailable": [], "num_available": 0, "total": 16},
-                "deck": {"available": [], "unavailable": [], "num_available": 0, "total": 24},
-            }
-            return {"key": camp_key, "name": camp_info["name"], "areas": areas, "media": media, "error": None}
-
-        # 1) 구덕
-        if camp_info.get("is_gudeok") and not DISABLE_SCRAPERS:
-            # 즉시 비어있는 골격만 내려주고, 실제 데이터는 /api/gudeok에서 폴링
-            area = {"deck": {"available": [], "unavailable": [], "num_available": 0, "num_unavailable": 0, "total": 18}}
-            return {
-                "key": camp_key,
-                "name": camp_info["name"],
-                "areas": area,
-                "media": media,
-                "error": None,
-                "lazy_gudeok": True,   # ⬅️ 템플릿 트리거 플래그
-            }
-
-        # 2) 영도 — 서버에서는 즉시 빈 골격 + lazy 플래그만, 데이터는 /api/yeongdo로
-        if camp_info.get("is_yeongdo") and not DISABLE_SCRAPERS:
-            area_info = {
-                "caravan": {"available": [], "unavailable": [], "num_available": 0, "num_unavailable": 0, "total": 15},
-                "auto":    {"available": [], "unavailable": [], "num_available": 0, "num_unavailable": 0, "total": 40},
-                "general": {"available": [], "unavailable": [], "num_available": 0, "num_unavailable": 0, "total": 12},
-            }
-            return {
-                "key": camp_key,
-                "name": camp_info["name"],
-                "areas": area_info,
-                "media": media,
-                "error": None,
-                "lazy_yeongdo": True,   # ⬅️ 템플릿에서 이 플래그로 JS 로딩 트리거
-            }
-
-        # 3) 삼락/대저/화명
-        camping_url = (camp_info.get("url_base") or "").format(selected_date)
-        is_hwamyung = camp_info.get("is_hwamyung", False)
+    # 크롤러/링크 미리보기: 캐시로 만든 정적 스냅샷 (lazy-load JS 없음 → 수집 작업도 없음)
+    if is_bot():
+        if selected_camp_key not in CAMPING_TABS:
+            return "not found", 404
         try:
-            r = requests.get(camping_url, timeout=10)
-            if r.status_code != 200:
-                return {"key": camp_key, "name": camp_info["name"], "areas": {}, "media": media,
-                        "error": f"웹사이트 접속 실패: {r.status_code}"}
-            soup = BeautifulSoup(r.text, "html.parser")
-            areas_to_process = ["area_a", "area_b", "area_c", "area_d"]
-            area_info = {}
-            if is_hwamyung:
-                areas_to_process = ["area_a", "area_b", "area_c"]
-                area_info["area_d"] = {"available": [], "unavailable": [], "num_available": 0, "num_unavailable": 0, "max_site_num": 0}
-                area_info["area_e"] = {"available": [], "unavailable": [], "num_available": 0, "num_unavailable": 0, "max_site_num": 0}
-                all_site_numbers_d, all_site_numbers_e = [], []
-
-            for area in areas_to_process:
-                available, unavailable, all_nums = [], [], []
-                for a in soup.find_all("a", class_=[area]):
-                    tag = a.find("input", class_="sitename")
-                    site_str = tag.get("value") if tag else None
-                    if not site_str:
-                        continue
-                    try:
-                        all_nums.append(int(site_str))
-                    except ValueError:
-                        continue
-                    cls = a.get("class", [])
-                    if "cbtn_on" in cls:
-                        available.append(site_str)
-                    elif "cbtn_Pcomplete" in cls:
-                        unavailable.append(site_str)
-                area_info[area] = {
-                    "available": available,
-                    "unavailable": unavailable,
-                    "num_available": len(available),
-                    "num_unavailable": len(unavailable),
-                    "max_site_num": max(all_nums) if all_nums else 0,
-                }
-
-            if is_hwamyung:
-                all_d_sites = soup.find_all("a", class_="area_d")
-                for a in all_d_sites:
-                    nm = (a.contents[0].strip() if a.contents else "")
-                    if not nm: continue
-                    s = nm[1:]
-                    try:
-                        num = int(s)
-                    except ValueError:
-                        num = 0
-                    cls = a.get("class", [])
-                    if nm.startswith("D"):
-                        target = "area_d"
-                    elif nm.startswith("E"):
-                        target = "area_e"
-                    else:
-                        continue
-                    if "cbtn_on" in cls:
-                        area_info[target]["available"].append(nm)
-                    elif "cbtn_Pcomplete" in cls:
-                        area_info[target]["unavailable"].append(nm)
-                for k in ["area_d", "area_e"]:
-                    area_info[k]["num_available"] = len(area_info[k]["available"])
-                    area_info[k]["num_unavailable"] = len(area_info[k]["unavailable"])
-
-            return {"key": camp_key, "name": camp_info["name"], "areas": area_info, "media": media, "error": None}
-        except Exception as e:
-            return {"key": camp_key, "name": camp_info["name"], "areas": {}, "media": media,
-                    "error": f"데이터 수집 오류: {e}"}
-        # ─────────────────────────────────────────
+            datetime.strptime(selected_date, "%Y-%m-%d")
+        except ValueError:
+            selected_date = today
+        resp = app.make_response(bot_page(selected_camp_key, selected_date))
+        resp.headers["Cache-Control"] = f"public, max-age={BOT_PAGE_TTL}"
+        return resp
 
     # ✅ ‘전체’면 모두 순회, 아니면 해당 탭만
     if selected_camp_key == "all":
-        keys_to_fetch = [k for k in CAMPING_TABS.keys() if k != "all"]
+        keys_to_fetch = list(CAMPS)
     else:
         keys_to_fetch = [selected_camp_key]
 
-    camping_data = [build_one(k) for k in keys_to_fetch]
+    # 화면 1건 + 이 요청이 직접 긁게 될(캐시에 없는) HTTP 캠핑장 수만큼 fetch 토큰
+    lazy = selected_camp_key == "all" and ALL_RENDER_MODE == "progressive"
+    limited = rate_limited("page", html=True) or rate_limited(
+        "fetch", 0 if lazy else uncached_http_camps([k for k in keys_to_fetch if k in CAMPS], selected_date), html=True)
+    if limited:
+        return limited
+
+    if selected_camp_key == "all" and ALL_RENDER_MODE == "stream":
+        return stream_template(
+            "index.html",
+            all_camps=_build_as_completed(keys_to_fetch, selected_date),
+            selected_date=selected_date,
+            camp_tabs=CAMPING_TABS,
+            selected_camp_key=selected_camp_key,
+        )
+
+    # 전체 보기(progressive): 캐시에 없는 캠핑장은 골격만 → 가장 느린 업스트림을 기다리지 않고 바로 응답
+    camping_data = [build_one(k, selected_date, lazy=lazy) for k in keys_to_fetch]
 
     return render_template(
         "index.html",
@@ -1595,11 +4528,154 @@ def home():
     )
 
 
+# ===== 워밍업 + 준비 상태 =====
+# 배포(gunicorn 마스터)당 한 번, 처음 뜬 워커가 백그라운드로: 브라우저 예열 → 오늘(+WARMUP_DAYS-1일) 전 캠핑장 수집
+# → 템플릿 미리 렌더. --max-requests 로 워커가 재시작돼도 다시 돌지 않는다.
+# 진행 상태는 공유 SQLite(STATE_DB)에 두고 /ready 는 그걸 읽음 → 헬스체크가 어느 워커로 가든 같은 답.
+# /health 는 살아있음(liveness)만, /ready 는 워밍업이 끝나야 200 → 플랫폼 헬스체크 경로를 /ready 로 두면
+# 배포 직후 첫 사용자가 콜드 Chrome·빈 캐시를 떠안지 않는다.
+WARMUP = os.getenv("WARMUP", "0") == "1"
+WARMUP_DAYS = int(os.getenv("WARMUP_DAYS", "1"))           # 1=오늘만, 2=오늘+내일
+WARMUP_TIMEOUT = float(os.getenv("WARMUP_TIMEOUT_SEC", "90"))
+WARMUP_STATE = {"state": "off" if not WARMUP else "pending", "started": None, "finished": None,
+                "steps": {}, "errors": []}
+
+WARMUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS warmup_runs (
+    run      TEXT PRIMARY KEY,   -- gunicorn 마스터 pid:시작 시각
+    pid      INTEGER NOT NULL,   -- 워밍업을 맡은 워커
+    state    TEXT    NOT NULL,   -- running | ready | failed
+    started  REAL    NOT NULL,
+    finished REAL,
+    detail   TEXT                -- 끝난 뒤 WARMUP_STATE JSON
+);
+"""
+_state_db().executescript(WARMUP_SCHEMA)
+
+
+def _warmup_run_id() -> str:
+    """같은 마스터 아래 워커들이 공유하는 값. 워커 재시작엔 그대로, 재배포(마스터 재시작)면 바뀜."""
+    ppid = os.getppid()
+    try:
+        with open(f"/proc/{ppid}/stat") as f:
+            started = f.read().rsplit(")", 1)[1].split()[19]   # 22번째 필드 starttime
+    except (OSError, IndexError):
+        started = "0"
+    return f"{ppid}:{started}"
+
+
+WARMUP_RUN = _warmup_run_id()
+
+
+def _claim_warmup() -> bool:
+    """이 워커가 워밍업을 맡을지. 이미 누가 끝냈거나 진행 중이면 False (진행 중인 채 2×TIMEOUT 넘게 멈춰 있으면 넘겨받음)."""
+    now = time.time()
+    with _state_tx() as conn:
+        cur = conn.execute(
+            "INSERT INTO warmup_runs (run, pid, state, started) VALUES (?, ?, 'running', ?)"
+            " ON CONFLICT (run) DO UPDATE SET pid = excluded.pid, started = excluded.started"
+            " WHERE warmup_runs.state = 'running' AND warmup_runs.started < ?",
+            (WARMUP_RUN, os.getpid(), now, now - 2 * WARMUP_TIMEOUT),
+        )
+        return cur.rowcount == 1
+
+
+def _warm_step(name: str, fn):
+    t0 = time.monotonic()
+    try:
+        result = fn()
+        WARMUP_STATE["steps"][name] = {"ms": round((time.monotonic() - t0) * 1000), "result": result}
+    except Exception as e:
+        WARMUP_STATE["steps"][name] = {"ms": round((time.monotonic() - t0) * 1000), "error": repr(e)}
+        WARMUP_STATE["errors"].append(f"{name}: {e!r}")
+
+
+def _warm_fetch(dates, deadline: float) -> dict:
+    """HTTP 캠핑장은 바로 수집, 셀레니움은 작업 등록 후 캐시가 찰 때까지(또는 deadline) 대기"""
+    pending = []
+    for d in dates:
+        for key, spec in CAMPS.items():
+            if spec.strategy == "selenium" and DISABLE_SCRAPERS:
+                continue
+            try:
+                spec.refresh(d)
+            except Exception as e:
+                WARMUP_STATE["errors"].append(f"fetch {key} {d}: {e!r}")
+                continue
+            if spec.strategy == "selenium":
+                pending.append((spec, d))
+    while pending and time.time() < deadline:
+        pending = [(spec, d) for spec, d in pending if spec.cached(d) is None]
+        time.sleep(0.5)
+    return {"dates": list(dates), "unfinished": [f"{spec.key}:{d}" for spec, d in pending]}
+
+
+def _warm_render(d: str) -> dict:
+    """전체 보기 + 탭별 페이지를 한 번씩 렌더 (Jinja 컴파일 캐시 + build_one 경로 예열)"""
+    client = app.test_client()
+    codes = {}
+    for key in CAMPING_TABS:
+        codes[key] = client.get("/", query_string={"camp": key, "resdate": d}).status_code
+    return codes
+
+
+def warmup():
+    WARMUP_STATE.update(state="running", started=time.time())
+    state = "failed"
+    try:
+        deadline = time.time() + WARMUP_TIMEOUT
+        today = date.today()
+        dates = [(today + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(max(1, WARMUP_DAYS))]
+        if not DISABLE_SCRAPERS and SCRAPER_MODE != "replay" and BROWSER_POOL_SIZE > 0:
+            _warm_step("browsers", fill_browser_pool)
+        _warm_step("fetch", lambda: _warm_fetch(dates, deadline))
+        _warm_step("render", lambda: _warm_render(dates[0]))
+        state = "ready"
+    except Exception as e:
+        WARMUP_STATE["errors"].append(f"warmup: {e!r}")
+    finally:
+        # 중간에 죽어도 running 으로 남지 않게 (그러면 /ready 가 계속 503)
+        WARMUP_STATE.update(state=state, finished=time.time())
+        with _state_tx() as conn:
+            conn.execute("UPDATE warmup_runs SET state = ?, finished = ?, detail = ? WHERE run = ?",
+                         (state, WARMUP_STATE["finished"], json.dumps(WARMUP_STATE, default=str), WARMUP_RUN))
+    print(f"[warmup] {state} in {WARMUP_STATE['finished'] - WARMUP_STATE['started']:.1f}s "
+          f"errors={len(WARMUP_STATE['errors'])}", flush=True)
+
+
+METRICS_SECTIONS["warmup"] = lambda: dict(WARMUP_STATE)
+
+
+@app.route("/ready")
+def ready():
+    """
+    이번 배포의 워밍업이 끝났으면 200, 진행 중이면 503 (WARMUP=0 이면 항상 200). 워커와 무관하게 같은 답.
+    워밍업이 실패(failed)해도 200: 예열만 못 했을 뿐 요청은 받을 수 있으므로 배포를 막지 않는다.
+    """
+    if not WARMUP:
+        return jsonify({"pid": os.getpid(), **WARMUP_STATE}), 200
+    row = _state_db().execute(
+        "SELECT pid, state, started, finished, detail FROM warmup_runs WHERE run = ?", (WARMUP_RUN,)
+    ).fetchone()
+    if row is None:
+        return jsonify({"pid": os.getpid(), "run": WARMUP_RUN, "state": "pending"}), 503
+    warmed_by, state, started, finished, detail = row
+    body = {**(json.loads(detail) if detail else {}), "pid": os.getpid(), "run": WARMUP_RUN,
+            "warmed_by": warmed_by, "state": state, "started": started, "finished": finished}
+    return jsonify(body), 200 if state in ("ready", "failed") else 503
+
+
 # app.py 맨 아래쯤에 추가
 @app.route("/health")
 def health():
     return "OK", 200
 
+if WARMUP:
+    if _claim_warmup():
+        Thread(target=warmup, daemon=True, name="warmup").start()
+    else:
+        WARMUP_STATE["state"] = "delegated"   # 같은 배포의 다른 워커가 맡음 (/ready 참고)
+
 if __name__ == "__main__":
     app.run(debug=True, use_reloader=False, threaded=False)
 
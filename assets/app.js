@@ -0,0 +1,573 @@
+function formatDate(date) {
+    const y = date.getFullYear();
+    const m = String(date.getMonth() + 1).padStart(2, '0'); 
+    const d = String(date.getDate()).padStart(2, '0');
+    return `${y}-${m}-${d}`;
+}
+function setTodayAndSubmit() {
+    document.getElementById('resdate').value = formatDate(new Date());
+    document.getElementById('dateForm').submit();
+}
+function moveDate(dayChange) {
+    const input = document.getElementById('resdate');
+    const [yy, mm, dd] = input.value.split('-').map(v=>parseInt(v,10));
+    const dt = new Date(yy, mm-1, dd);
+    dt.setDate(dt.getDate() + dayChange);
+    input.value = formatDate(dt);
+    document.getElementById('dateForm').submit();
+}
+function openReservationLink() {
+    const key = document.getElementById('campTabInput').value;
+    const d = document.getElementById('resdate').value;
+    let url_base;
+    if (key === 'daejeo') {
+        url_base = "https://www.daejeocamping.com/reservation/real_time?resdate=";
+    } else if (key === 'hwamyeong') {
+        url_base = "https://hwamyungcamping.com/reservation/real_time?resdate=";
+    } else if (key === 'yeongdo') {
+        window.open("https://www.yeongdo.go.kr/marinocamping/00003/00015/00028.web", "_blank"); return;
+    } else if (key === 'busan_port') {
+      window.open("https://www.busanpa.com/redevelopment/Board.do?mCode=MN0082", "_blank"); 
+      return;
+    } else if (key === 'gudeok') {
+        window.open("https://gudeok.go.kr/rent_camp01.php", "_blank"); return;
+
+    } else { // samnak 등
+        url_base = "https://www.nakdongcamping.com/reservation/real_time?resdate=";
+    }
+    const reservationUrl = url_base + d + "&schGugun=1&price=0&bagprice=2000&allprice=0&percnt=0&g-recaptcha-response=";
+    window.open(reservationUrl, '_blank');
+}
+function switchCamp(campKey) {
+    document.getElementById('campTabInput').value = campKey;
+    document.getElementById('dateForm').submit();
+}
+
+let YEONGDO_POLLING = null;
+
+// ALL 화면에서는 표 개요(잔여/총)만 쓰므로, 탭 전용 DOM이 없으면 아무 것도 안 함.
+function renderYeongdo(data, suffix, partial=false) {
+  // 탭 모드에서만 있는 컨테이너(예: #yeongdo-auto-0 ...)가 실제 있을 때만 렌더
+  const hasTabContainer =
+    document.querySelector(`[id^="yeongdo-caravan"]`) ||
+    document.querySelector(`[id^="yeongdo-auto"]`) ||
+    document.querySelector(`[id^="yeongdo-general"]`);
+
+  if (!hasTabContainer) return;
+
+  const areas = [
+    { key: "caravan", label: "카라반" },
+    { key: "auto",    label: "오토"    },
+    { key: "general", label: "일반"    },
+  ];
+
+  areas.forEach(({ key }) => {
+    const wrap = document.getElementById(`yeongdo-${key}${suffix}`);
+    if (!wrap) return;
+    // 부분 결과(status: partial)면 아직 안 끝난 카테고리는 그대로 둠
+    if (partial && !data?.[key]) return;
+
+    const cntEl = wrap.querySelector(".cnt-available");
+    const list  = wrap.querySelector(".site-list");
+    const av    = (data?.[key]?.available || []).map(n => String(n).padStart(2, "0"));
+    const un    = (data?.[key]?.unavailable || []).map(n => String(n).padStart(2, "0"));
+
+    if (cntEl) cntEl.textContent = av.length;
+    if (list) {
+      list.innerHTML = "";
+      const all = [...av.map(v => ({ v, cls: "text-available" })), ...un.map(v => ({ v, cls: "text-unavailable" }))];
+      // 번호 오름차순 정렬
+      all.sort((a, b) => parseInt(a.v, 10) - parseInt(b.v, 10));
+      all.forEach(({ v, cls }) => {
+        const div = document.createElement("div");
+        div.className = `site-item ${cls}`;
+        div.textContent = v;
+        list.appendChild(div);
+      });
+    }
+  });
+}
+
+// (기존) loadYeongdo/stopYeongdoPolling 그대로 유지
+
+// 영도 완료를 기다린 뒤(ready) 구덕을 시작하되,
+// 오래 걸리면 일정 시간 후 구덕을 "추가로" 시작하기 위한 지연(ms)
+const YEONGDO_GUDEOK_DELAY_MS = 120000; // ← 120초. 원하면 0~180000 등으로 조정
+
+// 429(클라이언트 요청 제한): 서버가 준 retry_after 초 뒤에 다시 폴링
+function retryAfterMs(json){
+  return Math.max(1, Number(json && json.retry_after) || 5) * 1000;
+}
+
+function loadYeongdo(dateStr, suffix="", onGudeokKickoff=null) {
+  stopYeongdoPolling();
+  const maxTries = 60;
+  let tries = 0;
+  const url = `/api/yeongdo?date=${encodeURIComponent(dateStr)}`;
+  const hint = document.getElementById(`yeongdo-hint${suffix}`) || document.getElementById('yeongdo-hint');
+
+  // 지연 후 "구덕도 시작해!" 콜백을 불러주는 타이머 (영도 취소 X)
+  let delayedKickTimer = null;
+  if (typeof onGudeokKickoff === 'function' && YEONGDO_GUDEOK_DELAY_MS > 0) {
+    delayedKickTimer = setTimeout(() => {
+      try { onGudeokKickoff(); } catch(e){}
+      // 지연 시작은 1회만
+    }, YEONGDO_GUDEOK_DELAY_MS);
+  }
+
+  const tick = () => {
+    fetch(url, {cache:'no-store'})
+      .then(r => r.json())
+      .then(json => {
+        if (json.status === 'ready') {
+          if (json.data && json.data.error) {
+            if (hint) hint.textContent = '영도 오류: ' + json.data.error;
+          } else if (hint) {
+            hint.textContent = '영도 데이터를 가져왔습니다.';
+          }
+          renderYeongdo(json.data, suffix);
+          renderYeongdoAllSummary(json.data);
+          followChanges('yeongdo', dateStr, json, (d) => { renderYeongdo(d, suffix); renderYeongdoAllSummary(d); });
+
+          // 영도가 준비됐으면, 아직 구덕을 안 시작했다면 지금 시작하도록 콜백 호출
+          if (typeof onGudeokKickoff === 'function') {
+            try { onGudeokKickoff(); } catch(e){}
+          }
+
+          // 지연 타이머가 걸려 있었다면 정리
+          if (delayedKickTimer) { clearTimeout(delayedKickTimer); delayedKickTimer = null; }
+
+          stopYeongdoPolling();
+        } else if (json.status === 'partial') {
+          // 끝난 카테고리부터 먼저 그림 (카라반이 보통 10~20초 먼저 나옴)
+          renderYeongdo(json.data, suffix, true);
+          renderYeongdoAllSummary(json.data);
+          const LABELS = { caravan: '카라반', auto: '오토', general: '일반' };
+          tries++;
+          if (hint) hint.textContent = `영도 수집 중… ${(json.done || []).map(k => LABELS[k] || k).join('·')} 완료 (${tries}/${maxTries})`;
+          YEONGDO_POLLING = setTimeout(tick, 1000);
+        } else if (json.status === 'pending') {
+          if (tries++ < maxTries) {
+            if (hint) hint.textContent = `영도 수집 중… (${tries}/${maxTries})`;
+            YEONGDO_POLLING = setTimeout(tick, 1000);
+          } else {
+            if (hint) hint.textContent = '처리가 지연되고 있어요. 계속 확인 중…';
+            tries = 0;
+            YEONGDO_POLLING = setTimeout(tick, 5000);
+          }
+        } else if (json.status === 'limited') {
+          if (hint) hint.textContent = json.error || '요청이 많아 잠시 후 다시 확인합니다.';
+          YEONGDO_POLLING = setTimeout(tick, retryAfterMs(json));
+        } else {
+          if (hint) hint.textContent = '알 수 없는 응답입니다.';
+          stopYeongdoPolling();
+        }
+      })
+      .catch(_ => {
+        if (tries++ < maxTries) {
+          if (hint) hint.textContent = `재시도 중… (${tries}/${maxTries})`;
+          YEONGDO_POLLING = setTimeout(tick, 1200);
+        } else {
+          if (hint) hint.textContent = '네트워크 오류가 발생했습니다.';
+          stopYeongdoPolling();
+        }
+      });
+  };
+
+  tick();
+}
+
+function stopYeongdoPolling(){
+  if (YEONGDO_POLLING) {
+    clearTimeout(YEONGDO_POLLING);
+    YEONGDO_POLLING = null;
+  }
+}
+
+function renderYeongdoAllSummary(data){
+  // caravan(공유), auto, general
+  const counts = {
+    caravan: (data.caravan?.available || []).length,
+    auto:    (data.auto?.available    || []).length,
+    general: (data.general?.available || []).length,
+  };
+
+  const map = {
+    caravan6: 'yeongdo-all-caravan6-remain',
+    caravan4: 'yeongdo-all-caravan4-remain',
+    auto:     'yeongdo-all-auto-remain',
+    general:  'yeongdo-all-general-remain',
+  };
+
+  // 카라반 6/4 둘 다 같은 잔여 수로 표기 (서버 파싱은 단일 'caravan' 그룹)
+  const values = {
+    caravan6: counts.caravan,
+    caravan4: counts.caravan,
+    auto:     counts.auto,
+    general:  counts.general,
+  };
+
+  Object.keys(values).forEach(k=>{
+    // 부분 결과에 아직 없는 카테고리는 건드리지 않음
+    if (!data[k.startsWith('caravan') ? 'caravan' : k]) return;
+    const el = document.getElementById(map[k]);
+    if (el) el.textContent = String(values[k]);
+  });
+}
+
+let GUDEOK_TAB_POLLING = null;
+
+function loadGudeok(dateStr){
+  stopGudeokTabPolling();
+  const maxTries = 60;
+  let tries = 0;
+  const url = `/api/gudeok?date=${encodeURIComponent(dateStr)}`;
+  const hint = document.getElementById('gudeok-hint');
+
+  if (hint) hint.textContent = `구덕 수집 중… (${tries}/${maxTries})`;
+
+  const tick = () => {
+    fetch(url, { cache: 'no-store' })
+      .then(async (r) => {
+        if (r.status === 429) return r.json();
+        if (!r.ok) {
+          const body = await r.text().catch(()=>'');
+          // 디버깅 도움: 상태/일부 바디를 콘솔로
+          console.warn('[gudeok] non-OK', r.status, body.slice(0,120));
+          throw new Error(`HTTP ${r.status}`);
+        }
+        const ct = r.headers.get('content-type') || '';
+        if (!ct.includes('application/json')) {
+          const body = await r.text().catch(()=> '');
+          console.warn('[gudeok] not JSON', ct, body.slice(0,120));
+          throw new Error('Non-JSON');
+        }
+        return r.json();
+      })
+      .then((json) => {
+        if (json.status === 'ready'){
+          if (hint) hint.textContent = '구덕 데이터를 가져왔습니다.';
+          // 성공 시 캐시에도 저장
+          window.__GUDEOK_CACHE = window.__GUDEOK_CACHE || {};
+          window.__GUDEOK_CACHE[dateStr] = json.data;
+          renderGudeok(json.data);
+          followChanges('gudeok', dateStr, json, renderGudeok);
+          stopGudeokTabPolling();
+        } else if (json.status === 'pending'){
+          if (tries < maxTries){
+            tries++;
+            if (hint) hint.textContent = `구덕 수집 중… (${tries}/${maxTries})`;
+            GUDEOK_TAB_POLLING = setTimeout(tick, 1000);
+          } else {
+            if (hint) hint.textContent = '처리가 지연되고 있어요. 계속 확인 중…';
+            tries = 0;
+            GUDEOK_TAB_POLLING = setTimeout(tick, 5000);
+          }
+        } else if (json.status === 'limited'){
+          if (hint) hint.textContent = json.error || '요청이 많아 잠시 후 다시 확인합니다.';
+          GUDEOK_TAB_POLLING = setTimeout(tick, retryAfterMs(json));
+        } else {
+          if (hint) hint.textContent = '알 수 없는 응답입니다.';
+          stopGudeokTabPolling();
+        }
+      })
+      .catch((err) => {
+        if (tries < maxTries){
+          tries++;
+          if (hint) hint.textContent = `재시도 중… (${tries}/${maxTries})`;
+          GUDEOK_TAB_POLLING = setTimeout(tick, 1200);
+        } else {
+          if (hint) hint.textContent = '네트워크/서버 오류가 발생했습니다. (캐시가 있으면 그대로 표시됩니다)';
+          stopGudeokTabPolling();
+        }
+      });
+  };
+
+  tick();
+}
+
+function stopGudeokTabPolling(){
+  if (GUDEOK_TAB_POLLING){
+    clearTimeout(GUDEOK_TAB_POLLING);
+    GUDEOK_TAB_POLLING = null;
+  }
+}
+
+// 전체 보기: 캐시에 없던 캠핑장(data-lazy-camp)을 /api/camp 로 하나씩 받아 표에 채움
+function renderCampAll(key, camp){
+  const areas = camp.areas || {};
+  document.querySelectorAll(`.camp-remain[data-camp="${key}"]`).forEach((el)=>{
+    const a = areas[el.dataset.area];
+    el.textContent = camp.error ? '—' : String((a && a.num_available) || 0);
+    if (camp.error) el.title = camp.error;
+  });
+  document.querySelectorAll(`.camp-total[data-camp="${key}"]`).forEach((el)=>{
+    const a = areas[el.dataset.area] || {};
+    el.textContent = camp.error ? '—' : String(el.dataset.totalFrom === 'max'
+      ? (a.max_site_num || 0)
+      : (a.available || []).length + (a.unavailable || []).length);
+  });
+}
+
+function loadCampsAll(dateStr){
+  const hint = document.getElementById('camp-hint-all');
+  const load = (key) => {
+    fetch(`/api/camp/${encodeURIComponent(key)}?date=${encodeURIComponent(dateStr)}`, {cache:'no-store'})
+      .then(r => r.json())
+      .then(camp => {
+        if (camp.status === 'limited') { setTimeout(() => load(key), retryAfterMs(camp)); return; }
+        renderCampAll(key, camp);
+        if (camp.error && hint) hint.textContent += `${camp.name}: ${camp.error} `;
+      })
+      .catch(_ => renderCampAll(key, {error: '네트워크 오류'}));
+  };
+  document.querySelectorAll('tr[data-lazy-camp]').forEach((tr)=> load(tr.dataset.lazyCamp));
+}
+
+// 스트리밍으로 완료 순서대로 붙은 캠핑장 tbody 를 탭 순서로 되돌림
+function sortAllTable(){
+  const table = document.querySelector('.all-table');
+  if (!table) return;
+  [...table.tBodies]
+    .sort((a, b) => Number(a.dataset.order) - Number(b.dataset.order))
+    .forEach(tb => table.appendChild(tb));
+}
+
+// 전체 보기: 영도 시작 → 준비되면(또는 지연 후) 구덕 시작
+function startAllView(dateStr){
+  sortAllTable();
+  loadCampsAll(dateStr);
+
+  // 힌트(영도)
+  const hintAll = document.getElementById('yeongdo-hint-all');
+  if (hintAll && !document.getElementById('yeongdo-hint')) {
+    const alias = document.createElement('span');
+    alias.id = 'yeongdo-hint';
+    hintAll.appendChild(alias);
+  }
+  // 힌트(구덕)
+  if (!document.getElementById('gudeok-hint-all')) {
+    const p = document.createElement('div');
+    p.id = 'gudeok-hint-all';
+    p.style.cssText = 'margin:4px 0; color:#6c757d;';
+    const anchor = document.getElementById('yeongdo-hint-all') || document.body;
+    anchor.insertAdjacentElement('afterend', p);
+  }
+  const gudeokHint = document.getElementById('gudeok-hint-all');
+  if (gudeokHint) gudeokHint.textContent = '구덕 수집 중… (대기 중)';
+
+  // 영도 시작: 준비되면 구덕 시작
+  // (또는 YEONGDO_GUDEOK_DELAY_MS 후 자동으로 구덕도 시작)
+  loadYeongdo(dateStr, '', function(){
+    if (gudeokHint) gudeokHint.textContent = '구덕 수집 중…';
+    loadGudeokAll(dateStr);
+  });
+}
+
+let GUDEOK_ALL_POLLING = null;
+
+function loadGudeokAll(dateStr){
+  stopGudeokAllPolling();
+  const url = `/api/gudeok?date=${encodeURIComponent(dateStr)}`;
+  let tries = 0, maxTries = 60;
+
+  // 힌트 엘리먼트 (없으면 생성하지 말고 조용히 패스)
+  const hint = document.getElementById('gudeok-hint-all');
+
+  const tick = () => {
+    fetch(url, {cache:'no-store'})
+      .then(r=>r.json())
+      .then(json=>{
+        if (json.status === 'ready') {
+          if (hint) hint.textContent = '구덕 데이터를 가져왔습니다.';
+          renderGudeokAll(json.data);
+          followChanges('gudeok', dateStr, json, renderGudeokAll);
+          window.__GUDEOK_CACHE = window.__GUDEOK_CACHE || {};
+          window.__GUDEOK_CACHE[dateStr] = json.data;
+          stopGudeokAllPolling();
+        } else if (json.status === 'pending') {
+          if (tries++ < maxTries) {
+            if (hint) hint.textContent = `구덕 수집 중… (${tries}/${maxTries})`;
+            GUDEOK_ALL_POLLING = setTimeout(tick, 1000);
+          } else {
+            if (hint) hint.textContent = '처리가 지연되고 있어요. 계속 확인 중…';
+            tries = 0;
+            GUDEOK_ALL_POLLING = setTimeout(tick, 5000);
+          }
+        } else if (json.status === 'limited') {
+          if (hint) hint.textContent = json.error || '요청이 많아 잠시 후 다시 확인합니다.';
+          GUDEOK_ALL_POLLING = setTimeout(tick, retryAfterMs(json));
+        } else {
+          if (hint) hint.textContent = '알 수 없는 응답입니다.';
+          stopGudeokAllPolling();
+        }
+      })
+      .catch(_=>{
+        if (tries++ < maxTries) {
+          if (hint) hint.textContent = `재시도 중… (${tries}/${maxTries})`;
+          GUDEOK_ALL_POLLING = setTimeout(tick, 1200);
+        } else {
+          if (hint) hint.textContent = '네트워크 오류가 발생했습니다.';
+          stopGudeokAllPolling();
+        }
+      });
+  };
+  // 최초 한 번 “수집 중…” 초기화
+  if (hint) hint.textContent = '구덕 수집 중… (0/60)';
+  tick();
+}
+
+function stopGudeokAllPolling(){
+  if (GUDEOK_ALL_POLLING){ clearTimeout(GUDEOK_ALL_POLLING); GUDEOK_ALL_POLLING = null; }
+}
+
+/* 전체 표(1~6야영장) 갱신 */
+function renderGudeokAll(data){
+  const deck = (data && data.deck) ? data.deck : {available:[],unavailable:[]};
+
+  // ID 정규화: "1-01" / "1 - 1" / "1_1" → "1-1"
+  const normId = (v) => {
+    if (v == null) return "";
+    let s = String(v).trim();
+    s = s.replace(/\s+/g, "");
+    s = s.replace(/[^\d\-]/g, "-");
+    const m = s.match(/(\d+)\D+(\d+)/);
+    if (m) return `${parseInt(m[1],10)}-${parseInt(m[2],10)}`;
+    const m2 = s.match(/^(\d+)-(\d+)$/);
+    if (m2) return `${parseInt(m2[1],10)}-${parseInt(m2[2],10)}`;
+    return s;
+  };
+
+  const avSet = new Set((deck.available  || []).map(normId));
+  const unSet = new Set((deck.unavailable|| []).map(normId));
+
+  const groups = [
+    ['1',['1-1','1-2']],
+    ['2',['2-1','2-2','2-3','2-4']],
+    ['3',['3-1','3-2','3-3']],
+    ['4',['4-1','4-2','4-3']],
+    ['5',['5-1','5-2','5-3','5-4']],
+    ['6',['6-1','6-2']],
+  ];
+
+  groups.forEach(([idx, ids])=>{
+    let cnt = 0;
+    ids.forEach(id => { if (avSet.has(normId(id))) cnt++; });
+    const el = document.getElementById(`gudeok-all-${idx}-remain`);
+    if (el) el.textContent = String(cnt);
+  });
+}
+
+// 구덕 탭: 캐시가 있으면 먼저 그리고 폴링 시작
+function startGudeokTab(dateStr){
+  const hint = document.getElementById('gudeok-hint');
+
+  // ① 캐시가 있으면 즉시 그려서 '빈 화면'을 없앰
+  if (window.__GUDEOK_CACHE && window.__GUDEOK_CACHE[dateStr]) {
+    try {
+      renderGudeok(window.__GUDEOK_CACHE[dateStr]);
+      if (hint) hint.textContent = '캐시로 표시 중… (서버 최신 확인 중)';
+    } catch (_) {}
+  } else {
+    if (hint) hint.textContent = '구덕 수집 중… (0/60)';
+  }
+
+  // ② 서버 최신 확인(폴링) 시작
+  loadGudeok(dateStr);
+}
+
+function renderGudeok(data){
+  const deck = data?.deck || {};
+  const normId = (v) => {
+    if (v == null) return "";
+    let s = String(v).trim();
+    s = s.replace(/\s+/g, "");
+    s = s.replace(/[^\d\-]/g, "-");
+    const m = s.match(/(\d+)\D+(\d+)/);
+    if (m) return `${parseInt(m[1],10)}-${parseInt(m[2],10)}`;
+    const m2 = s.match(/^(\d+)-(\d+)$/);
+    if (m2) return `${parseInt(m2[1],10)}-${parseInt(m2[2],10)}`;
+    return s;
+  };
+
+  const av = (deck.available || []).map(normId);
+  const un = (deck.unavailable || []).map(normId);
+
+  document.querySelectorAll('.area-container[id^="gudeok-"]').forEach((wrap)=>{
+    const listEl = wrap.querySelector('.site-list');
+    const cntEl  = wrap.querySelector('.cnt-available');
+    const sites  = (listEl.getAttribute('data-sites') || '').split(',').map(s=>s.trim()).filter(Boolean);
+
+    const avCnt = sites.reduce((n, id)=> n + (av.includes(normId(id)) ? 1 : 0), 0);
+    if (cntEl) cntEl.textContent = avCnt;
+
+    listEl.innerHTML = '';
+    sites.forEach(id=>{
+      const isAv = av.includes(normId(id));
+      const isUn = un.includes(normId(id));
+      const div = document.createElement('div');
+      div.className = 'site-item ' + (isAv ? 'text-available' : (isUn ? 'text-unavailable' : ''));
+      div.textContent = id;
+      listEl.appendChild(div);
+    });
+  });
+}
+
+// 변경 피드(/api/changes): 전체를 다시 받지 않고 델타만 받아 화면 데이터에 반영
+const CHANGE_POLL_MS = 30000;
+const CHANGE_FOLLOWERS = {};
+
+function applySiteChanges(data, changes){
+  Object.keys(changes || {}).forEach((area)=>{
+    const cur = data[area] = data[area] || {available:[], unavailable:[]};
+    const av = new Set(cur.available || []);
+    const un = new Set(cur.unavailable || []);
+    (changes[area].opened || []).forEach(v => { av.add(v); un.delete(v); });
+    (changes[area].taken  || []).forEach(v => { av.delete(v); un.add(v); });
+    cur.available = [...av];
+    cur.unavailable = [...un];
+    cur.num_available = cur.available.length;
+    cur.num_unavailable = cur.unavailable.length;
+  });
+}
+
+function followChanges(camp, dateStr, json, render){
+  if (CHANGE_FOLLOWERS[camp]) clearTimeout(CHANGE_FOLLOWERS[camp]);
+  const data = JSON.parse(JSON.stringify(json.data || {}));
+  let since = json.version || 0;
+  let epoch = json.epoch || '';
+
+  const tick = () => {
+    const url = `/api/changes?camp=${encodeURIComponent(camp)}&date=${encodeURIComponent(dateStr)}`
+              + `&since=${since}&epoch=${encodeURIComponent(epoch)}`;
+    let delay = CHANGE_POLL_MS;
+    fetch(url, {cache:'no-store'})
+      .then(r => r.json())
+      .then(feed => {
+        // 429(limited)·오류 응답이면 since/epoch 는 그대로 두고 기다렸다가 다시
+        if (feed.status === 'limited') { delay = Math.max(CHANGE_POLL_MS, retryAfterMs(feed)); return; }
+        if (!feed.epoch || !Array.isArray(feed.changes)) return;
+        epoch = feed.epoch;
+        if (feed.reset) {
+          // 피드 보존 범위를 벗어났거나 상태 DB 가 새로 만들어짐 → 스냅샷으로 교체
+          if (feed.snapshot) {
+            Object.keys(feed.snapshot.areas).forEach((area)=>{
+              const a = feed.snapshot.areas[area];
+              data[area] = Object.assign(data[area] || {}, {
+                available: a.available, unavailable: a.unavailable,
+                num_available: a.available.length, num_unavailable: a.unavailable.length,
+              });
+            });
+            render(data);
+          }
+        } else if (feed.changes.length) {
+          feed.changes.forEach(e => applySiteChanges(data, e.changes));
+          render(data);
+        }
+        since = feed.version;
+      })
+      .catch(_ => {})
+      .finally(() => { CHANGE_FOLLOWERS[camp] = setTimeout(tick, delay); });
+  };
+  CHANGE_FOLLOWERS[camp] = setTimeout(tick, CHANGE_POLL_MS);
+}
@@ -0,0 +1,146 @@
+"""
+셀레니움 DOM 파싱의 chromedriver 왕복 횟수 비교 (오프라인, Chrome 불필요).
+
+WebDriver 호출(find_elements / get_attribute / .text / find_element / execute_script)은 전부
+chromedriver 로 가는 HTTP 요청 1번이다. 가짜 드라이버가 고정 HTML 을 BeautifulSoup 으로 들고 있다가
+호출마다 횟수를 세고, 같은 파서를 두 경로로 돌려 결과가 같은지와 왕복 수를 비교한다.
+  - before : execute_script 를 막아서 요소별 get_attribute 폴백 경로
+  - after  : 추출 스크립트 1번
+
+    python loadtest/dom_roundtrips.py --seats 40 --noise 120 --options 18 --rtt-ms 3
+"""
+import argparse
+import os
+import random
+import sys
+
+from bs4 import BeautifulSoup
+from selenium.common.exceptions import JavascriptException, NoSuchElementException
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import app  # noqa: E402
+
+
+class FakeElement:
+    def __init__(self, driver, tag):
+        self._d = driver
+        self._tag = tag
+
+    def get_attribute(self, name):
+        self._d.calls += 1
+        if name == "disabled":
+            return "true" if self._tag.has_attr(name) else None
+        v = self._tag.get(name)
+        return " ".join(v) if isinstance(v, list) else v
+
+    @property
+    def text(self):
+        self._d.calls += 1
+        return self._tag.get_text(" ", strip=True)
+
+    def find_element(self, by, sel):
+        self._d.calls += 1
+        found = self._tag.select_one(sel)
+        if found is None:
+            raise NoSuchElementException(sel)
+        return FakeElement(self._d, found)
+
+
+class FakeDriver:
+    """호출 1번 = chromedriver 왕복 1번으로 센다. scripts=False 면 execute_script 가 실패(폴백 유도)."""
+
+    def __init__(self, html: str, scripts: bool):
+        self.soup = BeautifulSoup(html, "html.parser")
+        self.scripts = scripts
+        self.calls = 0
+
+    def find_elements(self, by, sel):
+        self.calls += 1
+        return [FakeElement(self, t) for t in self.soup.select(sel)]
+
+    def execute_script(self, script, *args):
+        if not self.scripts:
+            # 예전 코드에는 없던 호출이므로 before 에는 세지 않음
+            raise JavascriptException("scripts disabled")
+        self.calls += 1
+        # 브라우저에서 돌 스크립트와 같은 결과를 파이썬으로 흉내
+        if script == app._INTERPARK_SEATS_JS:
+            out = []
+            for t in self.soup.select(args[0]):
+                text = (t.get("title") or t.get("aria-label") or t.get_text(" ", strip=True) or "").strip()
+                if "B-" not in text and "A-" not in text:
+                    continue
+                img = t.select_one("img")
+                out.append({"text": text, "cls": " ".join(t.get("class") or []),
+                            "disabled": t.has_attr("disabled"),
+                            "alt": (img.get("alt") or "") if img is not None else None})
+            return out
+        if script == app._GUDEOK_OPTIONS_JS:
+            return [[(o.get("value") or "").strip(), o.has_attr("disabled")] for o in self.soup.select(args[0])]
+        raise JavascriptException("unknown script")
+
+
+def interpark_html(rng: random.Random, seats: int, noise: int) -> str:
+    parts = []
+    for i in range(1, seats + 1):
+        kind = rng.choice(["on", "off", "disabled", "img-green", "img-gray", "plain"])
+        title = f"[데크사이트] B-{i}"
+        if kind == "on":
+            parts.append(f'<a class="seat on" title="{title}"></a>')
+        elif kind == "off":
+            parts.append(f'<a class="seat off" title="{title}"></a>')
+        elif kind == "disabled":
+            parts.append(f'<button class="seat" title="{title}" disabled></button>')
+        elif kind == "img-green":
+            parts.append(f'<a class="seat" title="{title}"><img alt="green"></a>')
+        elif kind == "img-gray":
+            parts.append(f'<a class="seat" title="{title}"><img alt="x"></a>')
+        else:
+            parts.append(f'<a class="seat" title="{title}"></a>')
+    for i in range(noise):
+        parts.append(f'<a href="#m{i}">메뉴 {i}</a>' if i % 2 else f'<button title="닫기">닫기 {i}</button>')
+    rng.shuffle(parts)
+    return f"<html><body><div class='block'>{''.join(parts)}</div></body></html>"
+
+
+def gudeok_html(rng: random.Random, n: int) -> str:
+    opts = "".join(f'<option value="{i // 3 + 1}-{i % 3 + 1}"{" disabled" if rng.random() < 0.6 else ""}>x</option>'
+                   for i in range(n))
+    return f'<html><body><select name="camp_num"><option value="">선택</option>{opts}</select></body></html>'
+
+
+def measure(name: str, html: str, parse):
+    rows = {}
+    for label, scripts in (("before", False), ("after", True)):
+        drv = FakeDriver(html, scripts)
+        result = parse(drv)
+        rows[label] = (drv.calls, result)
+    assert rows["before"][1] == rows["after"][1], f"{name}: 결과 불일치"
+    return rows
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="DOM 파싱 chromedriver 왕복 횟수 비교")
+    p.add_argument("--seats", type=int, default=40, help="인터파크 좌석 요소 수")
+    p.add_argument("--noise", type=int, default=120, help="선택자에 같이 걸리는 좌석 아닌 요소 수")
+    p.add_argument("--options", type=int, default=18, help="구덕 <option> 수")
+    p.add_argument("--rtt-ms", type=float, default=3.0, help="chromedriver 왕복 1번 추정 시간")
+    p.add_argument("--seed", default="dom")
+    args = p.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    cases = [
+        ("interpark_seats", interpark_html(rng, args.seats, args.noise), app._interpark_parse_seats),
+        ("gudeok_options", gudeok_html(rng, args.options), app._gudeok_option_items),
+    ]
+    print(f"{'parser':<18}{'before':>8}{'after':>8}{'saved':>8}{'est ms before':>15}{'after':>8}")
+    for name, html, parse in cases:
+        rows = measure(name, html, parse)
+        b, a = rows["before"][0], rows["after"][0]
+        print(f"{name:<18}{b:>8}{a:>8}{b - a:>8}{b * args.rtt_ms:>15.0f}{a * args.rtt_ms:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
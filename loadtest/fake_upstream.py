@@ -0,0 +1,177 @@
+"""
+부하 테스트용 가짜 업스트림 서버 (표준 라이브러리만 사용, 오프라인 실행).
+
+앱을 UPSTREAM_OVERRIDE=http://127.0.0.1:<port> 로 띄우면 모든 업스트림 요청이
+http://127.0.0.1:<port>/<원래 호스트>/<원래 경로>?<쿼리> 로 들어온다.
+
+  - 낙동 계열 real_time (삼락/대저/화명): a.area_x.cbtn_on / cbtn_Pcomplete + input.sitename
+  - 영도 예약 페이지: 날짜 form + 카라반/오토/일반 .b1 버튼 (GET/POST 모두)
+  - 구덕 신청 페이지: #sdate/#edate + '다 음' → select[name=camp_num] 옵션
+
+잔여 현황은 (호스트, 날짜, --churn-sec 구간) 으로 시드를 잡아 같은 구간 안에서는 항상 같은 응답.
+
+    python loadtest/fake_upstream.py --port 9000 --latency-ms 300 --jitter-ms 200 --error-rate 0.02
+"""
+import argparse
+import hashlib
+import random
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+NAKDONG_HOSTS = {
+    # 호스트 -> 구역별 사이트 수 (app.py 의 템플릿 총계와 맞춤)
+    "www.nakdongcamping.com": {"area_a": 36, "area_b": 31, "area_c": 50},
+    "www.daejeocamping.com": {"area_a": 36, "area_b": 7, "area_c": 16, "area_d": 52},
+    "hwamyungcamping.com": {"area_a": 30, "area_b": 30, "area_c": 30},
+}
+HWAMYUNG_DE = ["D01", "D02", "D03", "D04", "D05", "E01", "E02", "E03"]
+YEONGDO_HOST = "www.yeongdo.go.kr"
+YEONGDO_SITES = {"카라반": 15, "오토사이트": 40, "일반사이트": 12}
+GUDEOK_HOST = "gudeok.go.kr"
+GUDEOK_SITES = ["1-1", "1-2", "2-1", "2-2", "2-3", "2-4", "3-1", "3-2", "3-3",
+                "4-1", "4-2", "4-3", "5-1", "5-2", "5-3", "5-4", "6-1", "6-2"]
+
+
+def _rng(args, host: str, d: str) -> random.Random:
+    bucket = int(time.time() // args.churn_sec) if args.churn_sec > 0 else 0
+    seed = hashlib.sha256(f"{args.seed}|{host}|{d}|{bucket}".encode()).hexdigest()
+    return random.Random(int(seed[:16], 16))
+
+
+def _free(rng: random.Random, args) -> bool:
+    return rng.random() < args.free_ratio
+
+
+def nakdong_page(args, host: str, d: str) -> str:
+    rng = _rng(args, host, d)
+    rows = []
+    for area, n in NAKDONG_HOSTS[host].items():
+        for i in range(1, n + 1):
+            cls = "cbtn_on" if _free(rng, args) else "cbtn_Pcomplete"
+            rows.append(f'<a class="cbtn {area} {cls}" href="#">{i:02d}'
+                        f'<input type="hidden" class="sitename" value="{i:02d}"></a>')
+    if host == "hwamyungcamping.com":
+        for nm in HWAMYUNG_DE:
+            cls = "cbtn_on" if _free(rng, args) else "cbtn_Pcomplete"
+            rows.append(f'<a class="cbtn area_d {cls}" href="#">{nm}</a>')
+    return f"<html><body><h1>실시간 예약 {d}</h1><div class='site'>{''.join(rows)}</div></body></html>"
+
+
+def yeongdo_page(args, path: str, d: str) -> str:
+    rng = _rng(args, YEONGDO_HOST, d)
+    buttons = []
+    for label, n in YEONGDO_SITES.items():
+        for i in range(1, n + 1):
+            state = "예약가능" if _free(rng, args) else "예약불가"
+            buttons.append(f'<button type="button" class="b1" title="{label} {i} {state}">{label} {i}</button>')
+    return (
+        "<html><body>"
+        f'<form method="post" action="{path}"><input type="date" name="resdate" value="{d}"></form>'
+        f"<div class='reserve'>{''.join(buttons)}</div></body></html>"
+    )
+
+
+def gudeok_form(path: str) -> str:
+    return (
+        "<html><body>"
+        f'<form id="f" method="get" action="{path}">'
+        '<input type="text" id="sdate" name="sdate" readonly>'
+        '<input type="text" id="edate" name="edate" readonly>'
+        '<input type="checkbox" class="selectAllC" name="agree" value="1">'
+        '<input type="hidden" name="step" value="2">'
+        "</form>"
+        "<span onclick=\"document.getElementById('f').submit()\">다 음</span>"
+        "</body></html>"
+    )
+
+
+def gudeok_sites(args, d: str) -> str:
+    rng = _rng(args, GUDEOK_HOST, d)
+    opts = "".join(
+        f'<option value="{s}">{s}</option>' if _free(rng, args) else f'<option value="{s}" disabled>{s}</option>'
+        for s in GUDEOK_SITES
+    )
+    return f'<html><body><select name="camp_num"><option value="">선택</option>{opts}</select></body></html>'
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "fake-upstream/1.0"
+    args = None   # main() 에서 주입
+
+    def log_message(self, fmt, *a):
+        if self.args.verbose:
+            super().log_message(fmt, *a)
+
+    def _send(self, status: int, body: str):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self, form: dict):
+        args = self.args
+        if self.path == "/healthz":
+            return self._send(200, "ok")
+        delay = max(0.0, random.gauss(args.latency_ms, args.jitter_ms)) / 1000.0
+        time.sleep(delay)
+        if random.random() < args.error_rate:
+            return self._send(500, "<html><body>Internal Server Error</body></html>")
+
+        u = urlparse(self.path)
+        host = u.path.lstrip("/").partition("/")[0]
+        q = {k: v[-1] for k, v in parse_qs(u.query).items()}
+        q.update(form)
+        today = date.today().strftime("%Y-%m-%d")
+
+        if host in NAKDONG_HOSTS:
+            return self._send(200, nakdong_page(args, host, q.get("resdate") or today))
+        if host == YEONGDO_HOST:
+            return self._send(200, yeongdo_page(args, u.path, q.get("resdate") or today))
+        if host == GUDEOK_HOST:
+            if q.get("step") == "2":
+                return self._send(200, gudeok_sites(args, q.get("sdate") or today))
+            return self._send(200, gudeok_form(u.path))
+        return self._send(404, f"<html><body>unknown host {host}</body></html>")
+
+    def do_GET(self):
+        self._handle({})
+
+    def do_POST(self):
+        n = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(n).decode("utf-8", "replace") if n else ""
+        self._handle({k: v[-1] for k, v in parse_qs(body).items()})
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="campingbusan 가짜 업스트림")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=9000)
+    p.add_argument("--latency-ms", type=float, default=300, help="평균 응답 지연")
+    p.add_argument("--jitter-ms", type=float, default=150, help="지연 표준편차")
+    p.add_argument("--error-rate", type=float, default=0.0, help="500 응답 비율 (0~1)")
+    p.add_argument("--free-ratio", type=float, default=0.3, help="예약 가능 사이트 비율")
+    p.add_argument("--churn-sec", type=float, default=300, help="이 주기마다 잔여 현황이 바뀜 (0=고정)")
+    p.add_argument("--seed", default="campingbusan")
+    p.add_argument("--verbose", action="store_true")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    Handler.args = args
+    srv = ThreadingHTTPServer((args.host, args.port), Handler)
+    srv.daemon_threads = True
+    print(f"[fake-upstream] http://{args.host}:{args.port} latency={args.latency_ms}±{args.jitter_ms}ms "
+          f"error_rate={args.error_rate}", flush=True)
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
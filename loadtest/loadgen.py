@@ -0,0 +1,178 @@
+"""
+부하 생성기: 실제 사용 패턴에 가까운 요청 묶음을 동시에 흘리고 p50/p99/처리량을 집계.
+
+가상 사용자(--users)마다 --mix 가중치로 시나리오를 골라 반복한다.
+  - tab     : GET /?camp=<삼락|대저|화명>&resdate=...
+  - all     : GET /?camp=all&resdate=...
+  - yeongdo : /api/yeongdo 를 브라우저처럼 1초 간격으로 ready 까지 폴링 (세션 1건 = 폴링 여러 번)
+  - gudeok  : /api/gudeok 동일
+날짜는 오늘부터 --days 일 중에서 고른다 (앞쪽 날짜일수록 자주).
+
+    python loadtest/loadgen.py --target http://127.0.0.1:8000 --users 20 --duration 60
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import date, timedelta
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+DEFAULT_MIX = "tab=4,all=2,yeongdo=2,gudeok=1"
+TAB_CAMPS = ["samnak", "daejeo", "hwamyeong"]
+
+
+def percentile(values, p: float) -> float:
+    if not values:
+        return 0.0
+    s = sorted(values)
+    k = min(len(s) - 1, max(0, int(round(p / 100.0 * (len(s) - 1)))))
+    return s[k]
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.lat = {}        # 이름 -> [초]
+        self.errors = {}     # 이름 -> 개수
+        self.count = {}
+
+    def add(self, name: str, sec: float, ok: bool):
+        with self.lock:
+            self.count[name] = self.count.get(name, 0) + 1
+            if ok:
+                self.lat.setdefault(name, []).append(sec)
+            else:
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+    def summary(self, elapsed: float) -> dict:
+        out = {}
+        with self.lock:
+            for name in sorted(self.count):
+                lat = self.lat.get(name, [])
+                out[name] = {
+                    "n": self.count[name],
+                    "errors": self.errors.get(name, 0),
+                    "rps": round(self.count[name] / elapsed, 2) if elapsed else 0.0,
+                    "p50_ms": round(percentile(lat, 50) * 1000, 1),
+                    "p99_ms": round(percentile(lat, 99) * 1000, 1),
+                    "max_ms": round(max(lat) * 1000, 1) if lat else 0.0,
+                }
+        return out
+
+
+def _get(url: str, timeout: float):
+    req = Request(url, headers={"User-Agent": "campingbusan-loadgen/1.0", "Accept-Encoding": "gzip, br"})
+    with urlopen(req, timeout=timeout) as r:
+        return r.status, r.read()
+
+
+def timed(stats: Stats, name: str, url: str, timeout: float):
+    t0 = time.perf_counter()
+    try:
+        status, body = _get(url, timeout)
+        stats.add(name, time.perf_counter() - t0, status < 400)
+        return body
+    except (HTTPError, URLError, OSError):
+        stats.add(name, time.perf_counter() - t0, False)
+        return None
+
+
+def poll_session(stats: Stats, name: str, url: str, args):
+    """ready 가 올 때까지 1초 간격 폴링. 개별 요청 + 세션 전체(ready 까지 걸린 시간)를 따로 집계."""
+    t0 = time.perf_counter()
+    for _ in range(args.max_polls):
+        body = timed(stats, name, url, args.timeout)
+        if body is not None:
+            try:
+                if json.loads(body).get("status") == "ready":
+                    stats.add(f"{name}:ready", time.perf_counter() - t0, True)
+                    return
+            except ValueError:
+                pass
+        time.sleep(args.poll_interval)
+    stats.add(f"{name}:ready", time.perf_counter() - t0, False)
+
+
+def pick_date(rng: random.Random, days: int) -> str:
+    offset = min(days - 1, int(rng.expovariate(3.0 / days)))
+    return (date.today() + timedelta(days=offset)).strftime("%Y-%m-%d")
+
+
+def user_loop(idx: int, stats: Stats, mix, args, deadline: float):
+    rng = random.Random(f"{args.seed}-{idx}")
+    names, weights = zip(*mix)
+    base = args.target.rstrip("/")
+    while time.time() < deadline:
+        kind = rng.choices(names, weights)[0]
+        d = pick_date(rng, args.days)
+        if kind == "tab":
+            timed(stats, "tab", f"{base}/?camp={rng.choice(TAB_CAMPS)}&resdate={d}", args.timeout)
+        elif kind == "all":
+            timed(stats, "all", f"{base}/?camp=all&resdate={d}", args.timeout)
+        elif kind in ("yeongdo", "gudeok"):
+            poll_session(stats, f"api_{kind}", f"{base}/api/{kind}?date={d}", args)
+        time.sleep(rng.uniform(0, args.think_sec))
+
+
+def parse_mix(spec: str):
+    mix = []
+    for part in spec.split(","):
+        name, _, w = part.partition("=")
+        mix.append((name.strip(), float(w or 1)))
+    return mix
+
+
+def run(args) -> dict:
+    stats = Stats()
+    mix = parse_mix(args.mix)
+    deadline = time.time() + args.duration
+    t0 = time.time()
+    threads = [threading.Thread(target=user_loop, args=(i, stats, mix, args, deadline), daemon=True)
+               for i in range(args.users)]
+    for t in threads:
+        t.start()
+        time.sleep(args.ramp_sec / max(1, args.users))
+    for t in threads:
+        t.join(args.duration + args.timeout * args.max_polls)
+    elapsed = time.time() - t0
+    return {"elapsed_sec": round(elapsed, 1), "users": args.users, "mix": args.mix,
+            "endpoints": stats.summary(elapsed)}
+
+
+def print_table(result: dict, label: str = ""):
+    print(f"\n== {label or result['mix']}  users={result['users']}  {result['elapsed_sec']}s ==")
+    print(f"{'endpoint':<20}{'n':>7}{'err':>6}{'rps':>8}{'p50ms':>10}{'p99ms':>10}{'maxms':>10}")
+    for name, s in result["endpoints"].items():
+        print(f"{name:<20}{s['n']:>7}{s['errors']:>6}{s['rps']:>8}{s['p50_ms']:>10}{s['p99_ms']:>10}{s['max_ms']:>10}")
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="campingbusan 부하 생성기")
+    p.add_argument("--target", default="http://127.0.0.1:8000")
+    p.add_argument("--users", type=int, default=10, help="동시 가상 사용자 수")
+    p.add_argument("--duration", type=float, default=60)
+    p.add_argument("--ramp-sec", type=float, default=5)
+    p.add_argument("--mix", default=DEFAULT_MIX)
+    p.add_argument("--days", type=int, default=14)
+    p.add_argument("--think-sec", type=float, default=2.0, help="시나리오 사이 최대 대기")
+    p.add_argument("--poll-interval", type=float, default=1.0)
+    p.add_argument("--max-polls", type=int, default=60)
+    p.add_argument("--timeout", type=float, default=30)
+    p.add_argument("--seed", default="loadgen")
+    p.add_argument("--json", action="store_true", help="결과를 JSON 한 줄로 출력")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    result = run(args)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False))
+    else:
+        print_table(result)
+
+
+if __name__ == "__main__":
+    main()
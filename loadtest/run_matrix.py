@@ -0,0 +1,143 @@
+"""
+gunicorn 설정 조합별 부하 테스트.
+
+설정마다 가짜 업스트림 + gunicorn(app:app) 을 새로 띄우고 loadgen 을 돌린 뒤 결과를 표로 비교한다.
+앱은 UPSTREAM_OVERRIDE 로 가짜 업스트림만 보므로 네트워크 없이 실행된다.
+(구덕/영도 Selenium 폴백까지 재려면 chromium + chromedriver 가 설치돼 있어야 함)
+
+    python loadtest/run_matrix.py \\
+        --config workers=2,threads=2,max_requests=50 \\
+        --config workers=2,threads=4,max_requests=200 \\
+        --config workers=3,threads=2,max_requests=0 \\
+        --users 20 --duration 60 --latency-ms 400 --error-rate 0.02
+
+--config 의 나머지 키(timeout, keep_alive, ...)는 --<key> 로 gunicorn 에 그대로 넘긴다.
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from urllib.request import urlopen
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+import loadgen  # noqa: E402
+
+# Dockerfile CMD 기본값
+GUNICORN_DEFAULTS = {"workers": "2", "threads": "2", "timeout": "90", "graceful_timeout": "30",
+                     "keep_alive": "5", "max_requests": "50", "max_requests_jitter": "20"}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_http(url: str, timeout: float = 60):
+    t0 = time.time()
+    while time.time() - t0 < timeout:
+        try:
+            with urlopen(url, timeout=2):
+                return
+        except Exception:
+            time.sleep(0.3)
+    raise RuntimeError(f"{url} 가 {timeout}s 안에 뜨지 않음")
+
+
+def parse_config(spec: str) -> dict:
+    cfg = dict(GUNICORN_DEFAULTS)
+    for part in spec.split(","):
+        if part.strip():
+            k, _, v = part.partition("=")
+            cfg[k.strip()] = v.strip()
+    return cfg
+
+
+def gunicorn_cmd(cfg: dict, port: int) -> list:
+    cmd = [sys.executable, "-m", "gunicorn", "app:app", "--bind", f"127.0.0.1:{port}", "--worker-class", "gthread"]
+    for k, v in cfg.items():
+        cmd += [f"--{k.replace('_', '-')}", v]
+    return cmd
+
+
+def run_config(cfg: dict, args) -> dict:
+    up_port, app_port = free_port(), free_port()
+    upstream = subprocess.Popen([
+        sys.executable, os.path.join(HERE, "fake_upstream.py"), "--port", str(up_port),
+        "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+        "--error-rate", str(args.error_rate),
+    ])
+    env = dict(os.environ, UPSTREAM_OVERRIDE=f"http://127.0.0.1:{up_port}")
+    env.setdefault("CLIENT_RATE_LIMIT", "0")   # 가상 사용자 전부가 127.0.0.1 하나로 보이므로 클라이언트 제한은 끔
+    if args.upstream_rate_limits:
+        env["UPSTREAM_RATE_LIMITS"] = args.upstream_rate_limits
+    server = subprocess.Popen(gunicorn_cmd(cfg, app_port), cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL if not args.verbose else None,
+                              stderr=subprocess.DEVNULL if not args.verbose else None)
+    try:
+        wait_http(f"http://127.0.0.1:{up_port}/healthz")
+        wait_http(f"http://127.0.0.1:{app_port}/health")
+        lg = loadgen.parse_args([
+            "--target", f"http://127.0.0.1:{app_port}", "--users", str(args.users),
+            "--duration", str(args.duration), "--mix", args.mix, "--seed", args.seed,
+        ])
+        return loadgen.run(lg)
+    finally:
+        for p in (server, upstream):
+            p.terminate()
+        for p in (server, upstream):
+            try:
+                p.wait(10)
+            except subprocess.TimeoutExpired:
+                p.kill()
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="gunicorn 설정별 부하 테스트")
+    p.add_argument("--config", action="append", default=[], help="예: workers=2,threads=4,max_requests=200")
+    p.add_argument("--users", type=int, default=10)
+    p.add_argument("--duration", type=float, default=60)
+    p.add_argument("--mix", default=loadgen.DEFAULT_MIX)
+    p.add_argument("--latency-ms", type=float, default=300)
+    p.add_argument("--jitter-ms", type=float, default=150)
+    p.add_argument("--error-rate", type=float, default=0.0)
+    p.add_argument("--upstream-rate-limits", default="",
+                   help="앱의 UPSTREAM_RATE_LIMITS 덮어쓰기 (예: www.nakdongcamping.com=20/40)")
+    p.add_argument("--seed", default="matrix")
+    p.add_argument("--out", help="결과 JSONL 저장 경로")
+    p.add_argument("--verbose", action="store_true")
+    args = p.parse_args(argv)
+
+    results = []
+    for spec in args.config or [""]:
+        cfg = parse_config(spec)
+        label = " ".join(f"{k}={cfg[k]}" for k in ("workers", "threads", "max_requests"))
+        print(f"[matrix] {label} ...", flush=True)
+        res = run_config(cfg, args)
+        res["gunicorn"] = cfg
+        loadgen.print_table(res, label)
+        results.append(res)
+        if args.out:
+            with open(args.out, "a", encoding="utf-8") as f:
+                f.write(json.dumps(res, ensure_ascii=False) + "\n")
+
+    # 설정별 한 줄 요약 (전체 처리량 + 화면 요청 p99)
+    print(f"\n{'config':<40}{'rps':>8}{'tab p99':>10}{'all p99':>10}{'errors':>8}")
+    for res in results:
+        cfg = res["gunicorn"]
+        eps = res["endpoints"]
+        rps = sum(s["rps"] for k, s in eps.items() if not k.endswith(":ready"))
+        errs = sum(s["errors"] for s in eps.values())
+        label = f"w={cfg['workers']} t={cfg['threads']} max_req={cfg['max_requests']}"
+        print(f"{label:<40}{rps:>8.2f}{eps.get('tab', {}).get('p99_ms', 0):>10}"
+              f"{eps.get('all', {}).get('p99_ms', 0):>10}{errs:>8}")
+
+
+if __name__ == "__main__":
+    main()
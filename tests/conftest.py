@@ -0,0 +1,13 @@
+import os
+import sys
+import tempfile
+
+# app.py 는 import 시점에 환경변수를 읽으므로 먼저 설정: 수집(셀레니움)은 끄고 DB·빌드 산출물은 임시 디렉터리에
+_TMP = tempfile.mkdtemp(prefix="campingbusan-test-")
+os.environ.setdefault("DISABLE_SCRAPERS", "1")
+os.environ.setdefault("HISTORY_DB", os.path.join(_TMP, "history.sqlite3"))
+os.environ.setdefault("STATE_DB", os.path.join(_TMP, "state.sqlite3"))
+os.environ.setdefault("ASSET_BUILD_DIR", os.path.join(_TMP, "assets"))
+os.environ.setdefault("CLIENT_RATE_LIMIT", "0")   # 클라이언트 제한은 test_client_limits 에서만 켠다
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
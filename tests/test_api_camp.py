@@ -0,0 +1,52 @@
+import pytest
+
+import app
+
+D = "2030-06-01"
+
+
+def _area(available, unavailable=()):
+    return {"available": list(available), "unavailable": list(unavailable),
+            "num_available": len(available), "num_unavailable": len(unavailable)}
+
+
+@pytest.fixture
+def no_upstream(monkeypatch):
+    def fail(camp, d):
+        raise AssertionError(f"upstream fetch for {camp} {d}")
+    monkeypatch.setattr(app, "get_realtime_areas", fail)
+
+
+def test_api_camp_returns_build_one(monkeypatch):
+    monkeypatch.setattr(app, "get_realtime_areas", lambda camp, d: {"area_a": _area(["01"], ["02"])})
+    body = app.app.test_client().get("/api/camp/samnak", query_string={"date": D}).get_json()
+    assert body["key"] == "samnak" and body["error"] is None
+    assert body["areas"]["area_a"]["available"] == ["01"]
+    assert "lazy_camp" not in body
+
+
+def test_api_camp_reports_upstream_error(monkeypatch):
+    def boom(camp, d):
+        raise app.UpstreamError("웹사이트 접속 실패: 503")
+    monkeypatch.setattr(app, "get_realtime_areas", boom)
+    body = app.app.test_client().get("/api/camp/daejeo", query_string={"date": D}).get_json()
+    assert body["areas"] == {} and "503" in body["error"]
+
+
+def test_api_camp_validation(no_upstream):
+    client = app.app.test_client()
+    assert client.get("/api/camp/nope").status_code == 404
+    assert client.get("/api/camp/all").status_code == 404
+    assert client.get("/api/camp/samnak", query_string={"date": "2030-6-1x"}).status_code == 400
+
+
+def test_all_view_does_not_wait_for_upstream(no_upstream):
+    with app.CAMP_LOCK:
+        app._cache_set(app.CAMP_CACHE, ("samnak", D), {"area_a": _area(["01", "02"], [])})
+    with app.app.test_request_context():
+        assert app.build_one("samnak", D, lazy=True)["areas"]["area_a"]["num_available"] == 2
+        lazy = app.build_one("daejeo", D, lazy=True)
+    assert lazy["lazy_camp"] and lazy["areas"] == {}
+
+    resp = app.app.test_client().get("/", query_string={"camp": "all", "resdate": D})
+    assert resp.status_code == 200
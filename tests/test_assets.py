@@ -0,0 +1,79 @@
+import gzip
+import hashlib
+import json
+import os
+
+import app
+
+
+def _url(name):
+    with app.app.test_request_context():
+        return app.asset_url(name)
+
+
+def test_manifest_names_are_content_hashes():
+    for name in ("app.js", "app.css"):
+        with open(os.path.join(app.ASSET_SRC_DIR, name), "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:10]
+        stem, ext = os.path.splitext(name)
+        assert app.ASSET_MANIFEST[name] == f"{stem}.{digest}{ext}"
+        assert _url(name) == f"/assets/{stem}.{digest}{ext}"
+
+
+def test_serves_precompressed_by_accept_encoding():
+    client = app.app.test_client()
+    url = _url("app.js")
+    with open(os.path.join(app.ASSET_SRC_DIR, "app.js"), "rb") as f:
+        raw = f.read()
+
+    resp = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(resp.data) == raw
+    assert "immutable" in resp.headers["Cache-Control"] and resp.headers["Vary"] == "Accept-Encoding"
+
+    resp = client.get(url, headers={"Accept-Encoding": "gzip;q=0"})
+    assert "Content-Encoding" not in resp.headers and resp.data == raw
+    assert resp.mimetype in ("text/javascript", "application/javascript")
+
+    if app.brotli is not None:
+        resp = client.get(url, headers={"Accept-Encoding": "gzip, br"})
+        assert resp.headers["Content-Encoding"] == "br"
+        assert app.brotli.decompress(resp.data) == raw
+
+
+def test_unknown_asset_is_404():
+    assert app.app.test_client().get("/assets/app.0000000000.js").status_code == 404
+
+
+def test_page_links_hashed_assets():
+    html = app.app.test_client().get("/", query_string={"camp": "busan_port"}).get_data(as_text=True)
+    assert _url("app.js") in html and _url("app.css") in html
+
+
+def test_workers_read_the_manifest_instead_of_rebuilding(monkeypatch):
+    assert os.path.exists(app.STATIC_MANIFEST)      # import 때 (빌드 단계가 없으니) 빌드하고 남김
+    expected = dict(app.ASSET_MANIFEST), dict(app.ASSET_FILES), json.loads(json.dumps(app.IMAGE_VARIANTS))
+    monkeypatch.setattr(app, "ASSET_MANIFEST", {})
+    monkeypatch.setattr(app, "ASSET_FILES", {})
+    monkeypatch.setattr(app, "IMAGE_VARIANTS", {})
+    monkeypatch.setattr(app, "build_assets", lambda: (_ for _ in ()).throw(AssertionError("rebuilt")))
+    monkeypatch.setattr(app, "build_images", lambda: (_ for _ in ()).throw(AssertionError("re-encoded")))
+    assert app.load_static_manifest()
+    assert (app.ASSET_MANIFEST, app.ASSET_FILES, app.IMAGE_VARIANTS) == expected
+
+
+def test_changed_map_image_invalidates_manifest(monkeypatch):
+    sources = app._static_sources()
+    assert any(k.startswith("image/map_") for k in sources)
+    monkeypatch.setattr(app, "_static_sources", lambda: {**sources, "image/map_daejeo.png": "changed"})
+    monkeypatch.setattr(app, "IMAGE_VARIANTS", {})
+    assert not app.load_static_manifest()
+    assert app.IMAGE_VARIANTS == {}
+
+
+def test_stale_manifest_is_not_used(monkeypatch):
+    monkeypatch.setattr(app, "ASSET_MANIFEST", {})
+    monkeypatch.setattr(app, "_static_sources", lambda: {"assets/app.js": "changed"})
+    assert not app.load_static_manifest()
+    assert app.ASSET_MANIFEST == {}
@@ -0,0 +1,50 @@
+import pytest
+
+import app
+
+BOT = {"User-Agent": "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)"}
+BROWSER = {"User-Agent": "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) Safari/604.1"}
+
+
+@pytest.mark.parametrize("ua, bot", [
+    (BOT["User-Agent"], True),
+    ("facebookexternalhit/1.1", True),
+    ("Mozilla/5.0 (X11; Linux x86_64) HeadlessChrome/120.0", True),
+    (BROWSER["User-Agent"], False),
+    ("", False),                     # UA 없는 브라우저·프라이버시 확장도 사람으로
+])
+def test_is_bot(ua, bot):
+    with app.app.test_request_context("/", headers={"User-Agent": ua}):
+        assert app.is_bot() is bot
+
+
+def test_bot_api_never_starts_a_job(monkeypatch):
+    monkeypatch.setattr(app, "INFLIGHT", {})
+    monkeypatch.setattr(app, "YEONGDO_CACHE", {})
+    started = []
+    monkeypatch.setattr(app, "start_yeongdo_job", started.append)
+    body = app.app.test_client().get("/api/yeongdo", query_string={"date": "2030-06-10"}, headers=BOT).get_json()
+    assert body == {"status": "skipped", "date": "2030-06-10", "reason": "crawler"}
+    assert started == [] and app.INFLIGHT == {}
+
+
+def test_bot_gets_cached_snapshot_page(monkeypatch):
+    monkeypatch.setattr(app, "BOT_PAGES", {})
+    fetched = []
+    monkeypatch.setattr(app, "fetch_realtime_areas_shared", lambda *a, **kw: fetched.append(a))
+    client = app.app.test_client()
+    r = client.get("/", query_string={"camp": "samnak", "resdate": "2030-06-11"}, headers=BOT)
+    assert r.status_code == 200
+    assert "저장된 현황" in r.get_data(as_text=True)
+    assert r.headers["Cache-Control"] == f"public, max-age={app.BOT_PAGE_TTL}"
+    assert fetched == []
+    assert ("samnak", "2030-06-11") in app.BOT_PAGES
+    assert client.get("/", query_string={"camp": "nope"}, headers=BOT).status_code == 404
+
+
+def test_sitemap_lists_each_tab_once():
+    r = app.app.test_client().get("/sitemap.xml")
+    xml = r.get_data(as_text=True)
+    assert r.mimetype == "application/xml"
+    assert xml.count("<url>") == 1 + len(app.CAMPING_TABS)
+    assert f"{app.SITE_URL}/?camp=yeongdo" in xml and "resdate" not in xml
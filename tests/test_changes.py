@@ -0,0 +1,71 @@
+import threading
+
+import app
+
+
+def _area(available, unavailable=()):
+    return {"available": list(available), "unavailable": list(unavailable)}
+
+
+def test_record_snapshot_versions_only_on_change():
+    d = "2030-01-01"
+    first = app.record_snapshot("samnak", d, {"area_a": _area(["01", "02"], ["03"])})
+    assert first["initial"]
+    assert first["changes"] == {"area_a": {"opened": ["01", "02"], "taken": []}}
+    v1 = app.snapshot_version("samnak", d)
+    assert v1 > 0
+
+    assert app.record_snapshot("samnak", d, {"area_a": _area(["02", "01"], ["03"])}) is None
+    assert app.snapshot_version("samnak", d) == v1
+
+    ev = app.record_snapshot("samnak", d, {"area_a": _area(["02", "03"], ["01"])})
+    assert not ev["initial"]
+    assert ev["changes"] == {"area_a": {"opened": ["03"], "taken": ["01"]}}
+    assert app.snapshot_version("samnak", d) > v1
+
+
+def test_record_snapshot_ignores_errors_and_empty():
+    d = "2030-01-02"
+    assert app.record_snapshot("samnak", d, {"error": "x"}) is None
+    assert app.record_snapshot("samnak", d, {"area_a": _area([], [])}) is None
+    assert app.snapshot_version("samnak", d) == 0
+
+
+def test_api_changes_since_and_epoch():
+    d = "2030-01-03"
+    app.record_snapshot("daejeo", d, {"area_a": _area(["01"], ["02"])})
+    v = app.snapshot_version("daejeo", d)
+    app.record_snapshot("daejeo", d, {"area_a": _area(["01", "02"])})
+
+    client = app.app.test_client()
+    q = {"since": v, "camp": "daejeo", "date": d}
+    body = client.get("/api/changes", query_string={**q, "epoch": app.CHANGE_EPOCH}).get_json()
+    assert not body["reset"]
+    assert [e["changes"] for e in body["changes"]] == [{"area_a": {"opened": ["02"], "taken": []}}]
+
+    body = client.get("/api/changes", query_string={**q, "epoch": "other"}).get_json()
+    assert body["reset"] and body["changes"] == []
+    assert body["snapshot"]["version"] == app.snapshot_version("daejeo", d)
+
+    body = client.get("/api/changes", query_string={"since": body["version"] + 100}).get_json()
+    assert body["reset"]
+
+
+def test_snapshots_are_shared_through_the_state_db():
+    # 다른 워커 = 다른 연결: 스레드마다 연결이 따로라 다른 스레드에서 기록한 스냅샷/버전이 보여야 함
+    d = "2030-01-05"
+    t = threading.Thread(target=app.record_snapshot, args=("samnak", d, {"area_a": _area(["01"], ["02"])}))
+    t.start()
+    t.join()
+    snap = app.load_snapshot("samnak", d)
+    assert snap is not None and snap["version"] == app.snapshot_version("samnak", d) > 0
+    assert snap["areas"]["area_a"]["available"].labels("02d") == ["01"]
+
+    ev = app.record_snapshot("samnak", d, {"area_a": _area(["01", "02"])})
+    assert ev["changes"] == {"area_a": {"opened": ["02"], "taken": []}}
+
+
+def test_unpadded_mixed_width_sites_are_not_dropped():
+    d = "2030-01-06"
+    ev = app.record_snapshot("daejeo", d, {"area_a": _area(["12", "3"], ["7"])})
+    assert ev["changes"] == {"area_a": {"opened": ["3", "12"], "taken": []}}
@@ -0,0 +1,102 @@
+import threading
+import time
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(app, "CLIENT_RATE_LIMIT", True)
+    monkeypatch.setattr(app, "CLIENT_BUCKETS", {})
+    monkeypatch.setattr(app, "INFLIGHT", {})
+    monkeypatch.setattr(app, "GUDEOK_INFLIGHT", {})
+    monkeypatch.setattr(app, "YEONGDO_CACHE", {})
+
+
+def test_client_id_takes_entry_added_by_trusted_proxy(monkeypatch):
+    monkeypatch.setattr(app, "TRUSTED_PROXY_HOPS", 1)
+    # 클라이언트가 넣은 왼쪽 항목(위조 가능)은 무시하고 프록시가 붙인 마지막 항목
+    with app.app.test_request_context("/", headers={"X-Forwarded-For": "1.2.3.4, 203.0.113.5"}):
+        assert app.client_id() == "203.0.113.5"
+    monkeypatch.setattr(app, "TRUSTED_PROXY_HOPS", 2)
+    with app.app.test_request_context("/", headers={"X-Forwarded-For": "1.2.3.4, 203.0.113.5, 10.0.0.1"}):
+        assert app.client_id() == "203.0.113.5"
+    # 홉 수보다 짧으면 프록시를 안 거친 요청 → remote_addr
+    with app.app.test_request_context("/", headers={"X-Forwarded-For": "1.2.3.4"},
+                                      environ_base={"REMOTE_ADDR": "198.51.100.7"}):
+        assert app.client_id() == "198.51.100.7"
+
+
+def test_client_id_ignores_forwarded_for_without_trusted_proxy(monkeypatch):
+    monkeypatch.setattr(app, "TRUSTED_PROXY_HOPS", 0)
+    with app.app.test_request_context("/", headers={"X-Forwarded-For": "1.2.3.4"},
+                                      environ_base={"REMOTE_ADDR": "198.51.100.7"}):
+        assert app.client_id() == "198.51.100.7"
+
+
+def test_watch_burst_then_429_with_retry_after(limits, monkeypatch):
+    monkeypatch.setitem(app.CLIENT_RATES, "watch", (0.001, 2))
+    client = app.app.test_client()
+    codes = [client.post("/api/watch", json={}).status_code for _ in range(3)]
+    assert codes[:2] == [400, 400]        # 제한 안쪽: 본문 검증까지 감
+    assert codes[2] == 429
+    r = client.post("/api/watch", json={})
+    assert r.get_json()["status"] == "limited"
+    assert int(r.headers["Retry-After"]) >= 1
+
+
+def test_buckets_are_per_client(limits, monkeypatch):
+    monkeypatch.setitem(app.CLIENT_RATES, "watch", (0.001, 1))
+    client = app.app.test_client()
+    a = {"REMOTE_ADDR": "198.51.100.1"}
+    b = {"REMOTE_ADDR": "198.51.100.2"}
+    monkeypatch.setattr(app, "TRUSTED_PROXY_HOPS", 0)
+    assert client.post("/api/watch", json={}, environ_base=a).status_code == 400
+    assert client.post("/api/watch", json={}, environ_base=a).status_code == 429
+    assert client.post("/api/watch", json={}, environ_base=b).status_code == 400
+
+
+def test_concurrent_selenium_jobs_capped_per_client(limits, monkeypatch):
+    monkeypatch.setattr(app, "TRUSTED_PROXY_HOPS", 0)
+    monkeypatch.setattr(app, "CLIENT_MAX_JOBS", 2)
+    now = time.time()
+    app.INFLIGHT["2030-07-01"] = {"ts": now, "ticks": 0, "client": "198.51.100.9"}
+    app.GUDEOK_INFLIGHT["2030-07-02"] = {"ts": now, "ticks": 0, "client": "198.51.100.9"}
+    with app.app.test_request_context("/", environ_base={"REMOTE_ADDR": "198.51.100.9"}):
+        assert app.client_jobs("198.51.100.9") == 2
+        r = app.scrape_limited()
+        assert r is not None and r.status_code == 429
+    with app.app.test_request_context("/", environ_base={"REMOTE_ADDR": "198.51.100.10"}):
+        assert app.scrape_limited() is None
+
+
+def test_client_jobs_snapshots_under_each_lock(limits):
+    app.GUDEOK_INFLIGHT["2030-07-02"] = {"ts": time.time(), "ticks": 0, "client": "198.51.100.9"}
+    out = []
+    with app.GUDEOK_LOCK:
+        t = threading.Thread(target=lambda: out.append(app.client_jobs("198.51.100.9")))
+        t.start()
+        t.join(0.2)
+        assert t.is_alive() and out == []      # 구덕 락이 풀릴 때까지 기다림
+    t.join(2)
+    assert out == [1]
+
+
+def test_job_cap_counts_other_camp_through_endpoint(limits, monkeypatch):
+    monkeypatch.setattr(app, "TRUSTED_PROXY_HOPS", 0)
+    monkeypatch.setattr(app, "CLIENT_MAX_JOBS", 1)
+    monkeypatch.setattr(app, "_submit_yeongdo", lambda d, interactive: None)
+    app.GUDEOK_INFLIGHT["2030-07-02"] = {"ts": time.time(), "ticks": 0, "client": "198.51.100.9"}
+    client = app.app.test_client()
+    r = client.get("/api/yeongdo", query_string={"date": "2030-07-01"}, environ_base={"REMOTE_ADDR": "198.51.100.9"})
+    assert r.status_code == 429 and app.INFLIGHT == {}
+    r = client.get("/api/yeongdo", query_string={"date": "2030-07-01"}, environ_base={"REMOTE_ADDR": "198.51.100.10"})
+    assert r.get_json()["status"] == "pending" and app.INFLIGHT["2030-07-01"]["client"] == "198.51.100.10"
+
+
+def test_token_bucket_take_or_delay():
+    b = app.TokenBucket(1.0, 2)
+    assert b.take_or_delay() == 0 and b.take_or_delay() == 0
+    assert b.take_or_delay() > 0
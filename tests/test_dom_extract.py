@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from loadtest.dom_roundtrips import FakeDriver, gudeok_html, interpark_html, measure
+
+import app
+
+SEATS_HTML = ("<html><body><div class='block'>"
+              '<a class="seat on" title="[데크사이트] B-2"></a>'
+              '<a class="seat off" title="[데크사이트] B-10"></a>'
+              '<button class="seat" title="[데크사이트] B-1" disabled></button>'
+              '<a class="seat" title="[데크사이트] B-3"><img alt="green"></a>'
+              '<a class="seat" title="[데크사이트] B-4"></a>'
+              '<a href="#menu">메뉴</a>'
+              "</div></body></html>")
+
+
+@pytest.mark.parametrize("scripts", [True, False])
+def test_interpark_parse_seats(scripts):
+    avail, unavail = app._interpark_parse_seats(FakeDriver(SEATS_HTML, scripts))
+    assert avail == ["B-2", "B-3"]
+    assert unavail == ["B-1", "B-4", "B-10"]
+
+
+@pytest.mark.parametrize("scripts", [True, False])
+def test_gudeok_option_items(scripts):
+    html = ('<select name="camp_num"><option value="">선택</option>'
+            '<option value="1-1">x</option><option value="2-3" disabled>x</option></select>')
+    assert app._gudeok_option_items(FakeDriver(html, scripts)) == [("", False), ("1-1", False), ("2-3", True)]
+
+
+def test_script_path_is_one_round_trip_with_same_result():
+    rng = random.Random("test")
+    for html, parse in ((interpark_html(rng, 40, 120), app._interpark_parse_seats),
+                        (gudeok_html(rng, 18), app._gudeok_option_items)):
+        rows = measure("case", html, parse)
+        assert rows["after"][0] == 1
+        assert rows["before"][0] > 1
@@ -0,0 +1,47 @@
+import sqlite3
+import time
+from datetime import date
+
+import app
+
+CAMP = "hwamyeong"   # 이 파일에서만 쓰는 캠핑장 (다른 테스트의 이력과 섞이지 않게)
+D = "2030-03-01"
+
+
+def _area(available, unavailable=()):
+    return {"available": list(available), "unavailable": list(unavailable)}
+
+
+def _wait_rows(n):
+    for _ in range(100):
+        try:
+            rows = app._history_query("SELECT COUNT(*) FROM scrapes WHERE camp = ?", (CAMP,))
+        except sqlite3.OperationalError:   # 쓰기 스레드가 아직 스키마를 만드는 중
+            rows = None
+        if rows and rows[0][0] >= n:
+            return
+        time.sleep(0.05)
+    raise AssertionError("history writer did not catch up")
+
+
+def test_history_heatmap_and_sellout():
+    app.record_snapshot(CAMP, D, {"area_a": _area(["01"], ["02", "03", "04"])})
+    app.record_snapshot(CAMP, D, {"area_a": _area([], ["01", "02", "03", "04"])})
+    _wait_rows(2)
+
+    rows = app._history_query(
+        "SELECT a.area, a.n_avail, a.n_total FROM scrape_areas a JOIN scrapes s ON s.id = a.scrape_id"
+        " WHERE s.camp = ? ORDER BY s.id", (CAMP,))
+    assert rows == [("area_a", 1, 4), ("area_a", 0, 4)]
+
+    client = app.app.test_client()
+    cells = client.get("/api/history/heatmap", query_string={"by": "month", "camp": CAMP}).get_json()["cells"]
+    assert cells == [{"camp": CAMP, "month": 3, "occupancy": 0.875, "samples": 2}]
+    assert client.get("/api/history/heatmap", query_string={"by": "year"}).status_code == 400
+
+    wd = date(2030, 3, 1).weekday()
+    body = client.get("/api/history/sellout", query_string={"weekdays": str(wd), "camp": CAMP}).get_json()
+    camp = body["camps"][CAMP]
+    assert camp["dates"] == 1 and camp["sold_out_dates"] == 1 and camp["open_dates"] == 0
+    assert camp["by_date"] == [{"date": D, "lead_days": (date(2030, 3, 1) - date.today()).days}]
+    assert client.get("/api/history/sellout", query_string={"weekdays": "fri"}).status_code == 400
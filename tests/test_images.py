@@ -0,0 +1,42 @@
+import io
+
+from PIL import Image
+
+import app
+
+
+def test_map_variants_cover_widths_up_to_original():
+    v = app.IMAGE_VARIANTS["map_daejeo.png"]
+    with Image.open(f"{app.IMAGE_SRC_DIR}/map_daejeo.png") as im:
+        assert (v["width"], v["height"]) == im.size
+    types = [s["type"] for s in v["sources"]]
+    assert "image/webp" in types
+    for s in v["sources"]:
+        widths = [w for _, w in s["srcset"]]
+        assert widths == sorted(widths) and widths[-1] == v["width"]
+        assert all(w <= v["width"] for w in widths)
+
+
+def test_variant_is_served_resized_and_immutable():
+    v = app.IMAGE_VARIANTS["map_daejeo.png"]
+    webp = next(s for s in v["sources"] if s["type"] == "image/webp")
+    name, w = webp["srcset"][0]
+    resp = app.app.test_client().get(f"/assets/{name}")
+    assert resp.status_code == 200 and resp.mimetype == "image/webp"
+    assert "immutable" in resp.headers["Cache-Control"]
+    with Image.open(io.BytesIO(resp.data)) as im:
+        assert im.format == "WEBP" and im.size[0] == w
+
+    resp = app.app.test_client().get(f"/assets/{v['src']}")
+    assert resp.status_code == 200 and resp.mimetype == "image/png"
+
+
+def test_image_media():
+    with app.app.test_request_context():
+        media = app.image_media("map_daejeo.png")
+        assert media["image_url"] == f"/assets/{app.IMAGE_VARIANTS['map_daejeo.png']['src']}"
+        assert media["image_sizes"] == app.IMAGE_SIZES
+        assert all(" 480w" in s["srcset"] for s in media["image_sources"])
+
+        missing = app.image_media("map_nowhere.png")
+        assert missing["image_url"] == "/static/map_nowhere.png" and missing["image_sources"] == []
@@ -0,0 +1,68 @@
+import threading
+import time
+
+import pytest
+
+import app
+
+
+@pytest.fixture(autouse=True)
+def _fast_adjust(monkeypatch):
+    monkeypatch.setattr(app, "ADAPTIVE_COOLDOWN", 0)
+    monkeypatch.setattr(app, "mem_available_mb", lambda: float("inf"))
+
+
+def test_shrinks_on_failures():
+    lim = app.AdaptiveLimiter(1, 3)
+    lim.limit = 3
+    for _ in range(3):
+        with lim:
+            lim.mark_failed()
+    assert lim.limit == 2
+    assert lim.metrics()["adjustments"] == 1
+
+
+def test_shrinks_on_slow_launches():
+    lim = app.AdaptiveLimiter(1, 3)
+    lim.limit = 2
+    for _ in range(3):
+        lim.note_launch(app.ADAPTIVE_LAUNCH_SLOW_SEC + 1)
+        with lim:
+            pass
+    assert lim.limit == 1
+    for _ in range(3):
+        with lim:
+            lim.mark_failed()
+    assert lim.limit == 1          # min 아래로는 안 내려감
+
+
+def test_grows_only_when_callers_wait():
+    lim = app.AdaptiveLimiter(1, 2)
+    for _ in range(3):
+        with lim:
+            pass
+    assert lim.limit == 1          # 기다리는 사람이 없으면 그대로
+
+    entered = threading.Event()
+
+    def waiter():
+        with lim:
+            entered.set()
+
+    with lim:
+        t = threading.Thread(target=waiter)
+        t.start()
+        while lim.metrics()["waiting"] < 1:
+            time.sleep(0.01)
+    t.join(5)
+    assert entered.is_set()
+    assert lim.limit == 2
+
+
+def test_memory_caps_effective_limit(monkeypatch):
+    lim = app.AdaptiveLimiter(1, 3)
+    lim.limit = 3
+    monkeypatch.setattr(app, "mem_available_mb", lambda: app.CHROME_MIN_FREE_MB + lim.per_browser_mb * 1.5)
+    assert lim.effective_limit() == 1
+    monkeypatch.setattr(app, "mem_available_mb", lambda: app.CHROME_MIN_FREE_MB - 10)
+    assert lim.effective_limit() == 1          # 메모리가 없어도 min 은 보장
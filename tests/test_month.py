@@ -0,0 +1,104 @@
+import calendar
+from datetime import date, timedelta
+
+import pytest
+
+import app
+
+
+def _area(available, unavailable=()):
+    return {"available": list(available), "unavailable": list(unavailable)}
+
+
+def _next_month() -> date:
+    return (date.today().replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+NEXT = _next_month()
+YM = NEXT.strftime("%Y-%m")
+N_DAYS = calendar.monthrange(NEXT.year, NEXT.month)[1]
+
+
+def _day(n: int) -> str:
+    return NEXT.replace(day=n).strftime("%Y-%m-%d")
+
+
+@pytest.fixture
+def window(monkeypatch):
+    """다음 달 전체가 예약 가능 기간 안에 들도록"""
+    monkeypatch.setattr(app, "MONTH_WINDOW_DAYS", 70)
+
+
+def test_month_status_mapping(window, monkeypatch):
+    monkeypatch.setattr(app, "MONTH_FETCH_MAX", 100)
+    fetched = []
+
+    def fake_fetch(camp, d):
+        fetched.append(d)
+        if d == _day(3):
+            raise app.UpstreamError("boom")
+        return {"area_a": _area(["01", "02"], ["03"]), "area_b": _area([], ["01"])}
+
+    monkeypatch.setattr(app, "get_realtime_areas", fake_fetch)
+    with app.CAMP_LOCK:
+        app._cache_set(app.CAMP_CACHE, ("samnak", _day(1)), {"area_a": _area(["01"], [])})
+
+    body = app.app.test_client().get("/api/month", query_string={"camp": "samnak", "ym": YM}).get_json()
+    days = body["days"]
+    assert len(days) == N_DAYS
+    assert days[_day(1)] == {"status": "cached", "free": 1, "areas": {"area_a": 1}}
+    assert days[_day(2)] == {"status": "fetched", "free": 2, "areas": {"area_a": 2, "area_b": 0}}
+    assert days[_day(3)]["status"] == "error"
+    assert _day(1) not in fetched and len(fetched) == N_DAYS - 1
+
+
+def test_month_caps_upstream_fetches_per_request(window, monkeypatch):
+    monkeypatch.setattr(app, "MONTH_FETCH_MAX", 3)
+    fetched = []
+    monkeypatch.setattr(app, "get_realtime_areas", lambda camp, d: fetched.append(d) or {"area_a": _area(["01"])})
+
+    days = app.app.test_client().get("/api/month", query_string={"camp": "daejeo", "ym": YM}).get_json()["days"]
+    assert sorted(fetched) == [_day(1), _day(2), _day(3)]     # 가까운 날부터
+    assert [days[_day(n)]["status"] for n in (1, 2, 3, 4)] == ["fetched", "fetched", "fetched", "unknown"]
+    assert sum(v["status"] == "unknown" for v in days.values()) == N_DAYS - 3
+
+
+def test_month_days_beyond_window_are_unknown(monkeypatch):
+    monkeypatch.setattr(app, "MONTH_WINDOW_DAYS", (NEXT - date.today()).days + 4)   # 다음 달 5일까지
+    monkeypatch.setattr(app, "MONTH_FETCH_MAX", 100)
+    fetched = []
+    monkeypatch.setattr(app, "get_realtime_areas", lambda camp, d: fetched.append(d) or {"area_a": _area(["01"])})
+
+    days = app.app.test_client().get("/api/month", query_string={"camp": "hwamyeong", "ym": YM}).get_json()["days"]
+    assert days[_day(5)]["status"] in ("fetched", "cached", "stale")
+    assert days[_day(6)]["status"] == "unknown"
+    assert max(fetched) <= _day(5)
+
+
+def test_month_selenium_camp_uses_snapshots_only(window, monkeypatch):
+    monkeypatch.setattr(app, "get_realtime_areas", lambda *a: (_ for _ in ()).throw(AssertionError("fetched")))
+    app.record_snapshot("yeongdo", _day(5), {"auto": _area([3, 4], [5])})
+
+    days = app.app.test_client().get("/api/month", query_string={"camp": "yeongdo", "ym": YM}).get_json()["days"]
+    assert days[_day(5)] == {"status": "stale", "free": 2, "areas": {"auto": 2}}
+    assert days[_day(6)]["status"] == "missing"
+
+
+def test_month_current_month_has_past_days(monkeypatch):
+    monkeypatch.setattr(app, "MONTH_FETCH_MAX", 0)
+    today = date.today()
+    days = app.app.test_client().get("/api/month", query_string={"camp": "samnak"}).get_json()["days"]
+    assert len(days) == calendar.monthrange(today.year, today.month)[1]
+    if today.day > 1:
+        assert days[today.replace(day=1).strftime("%Y-%m-%d")]["status"] == "past"
+
+
+def test_month_validation():
+    client = app.app.test_client()
+    assert client.get("/api/month", query_string={"camp": "samnak", "ym": "2030/04"}).status_code == 400
+    assert client.get("/api/month", query_string={"camp": "nope"}).status_code == 400
+    # 예약 가능 기간 밖 (지난 달, 먼 미래)
+    last_month = (date.today().replace(day=1) - timedelta(days=1)).strftime("%Y-%m")
+    assert client.get("/api/month", query_string={"camp": "samnak", "ym": last_month}).status_code == 400
+    assert client.get("/api/month", query_string={"camp": "samnak", "ym": "2020-01"}).status_code == 400
+    assert client.get("/api/month", query_string={"camp": "samnak", "ym": "2999-01"}).status_code == 400
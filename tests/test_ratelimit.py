@@ -0,0 +1,47 @@
+import threading
+import time
+
+import pytest
+
+import app
+
+
+def test_token_bucket_burst_then_delay():
+    bucket = app.TokenBucket(rate=1.0, burst=2)
+    assert bucket.take_or_delay() == 0.0
+    assert bucket.take_or_delay() == 0.0
+    assert bucket.take_or_delay() == pytest.approx(1.0, abs=0.05)
+
+
+def test_host_limiter_serves_higher_priority_first():
+    lim = app.HostRateLimiter("test.example", rate=10.0, burst=1)
+    lim.acquire()                      # 버킷을 비워 둠 → 다음 두 요청은 줄을 선다
+    order = []
+
+    def run(prio, name):
+        lim.acquire(prio, timeout=5)
+        order.append(name)
+
+    bg = threading.Thread(target=run, args=(app.PRIO_BACKGROUND, "background"))
+    bg.start()
+    time.sleep(0.02)
+    fg = threading.Thread(target=run, args=(app.PRIO_INTERACTIVE, "interactive"))
+    fg.start()
+    bg.join(5)
+    fg.join(5)
+    assert order == ["interactive", "background"]
+    assert lim.metrics()["requests"] == 3 and lim.metrics()["queued_now"] == 0
+
+
+def test_host_limiter_timeout_raises_throttled():
+    lim = app.HostRateLimiter("test.example", rate=0.1, burst=1)
+    lim.acquire()
+    with pytest.raises(app.UpstreamThrottled):
+        lim.acquire(timeout=0.05)
+    assert lim.metrics()["timeouts"] == 1
+    assert isinstance(app.UpstreamThrottled("x"), app.UpstreamError)
+
+
+def test_parse_rate_limits():
+    assert app._parse_rate_limits("a.example=0.2/1, b.example=3,junk") == {
+        "a.example": (0.2, 1), "b.example": (3.0, 1)}
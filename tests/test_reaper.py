@@ -0,0 +1,96 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def tmpdir_as_tempdir(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))   # reap_chrome 이 실제 /tmp 를 훑지 않게
+    return tmp_path
+
+
+def _dead_pid() -> int:
+    p = subprocess.Popen([sys.executable, "-c", "pass"])
+    p.wait()
+    return p.pid
+
+
+def _profile(root, pid, age=0):
+    path = root / f"{app.CHROME_PROFILE_PREFIX}{pid}-test"
+    path.mkdir()
+    (path / "Cookies").write_bytes(b"x" * 1000)
+    if age:
+        old = time.time() - age
+        os.utime(path, (old, old))
+    return str(path)
+
+
+def test_profile_owner():
+    assert app._profile_owner(f"/tmp/{app.CHROME_PROFILE_PREFIX}123-abcd/") == 123
+    assert app._profile_owner(f"/tmp/{app.CHROME_PROFILE_PREFIX}abcd") is None
+
+
+def test_orphan_profile_rules(tmpdir_as_tempdir):
+    now = time.time()
+    assert app._is_orphan_profile(_profile(tmpdir_as_tempdir, _dead_pid()), now)
+
+    mine = _profile(tmpdir_as_tempdir, os.getpid())
+    assert app._is_orphan_profile(mine, now)           # 이 워커 것인데 등록이 없음
+    app._register_driver(mine)
+    try:
+        assert not app._is_orphan_profile(mine, now)
+        assert app._is_orphan_profile(mine, now + app.CHROME_DRIVER_MAX_AGE + 1)   # 버려진 드라이버
+    finally:
+        with app.ACTIVE_DRIVERS_LOCK:
+            app.ACTIVE_DRIVERS.pop(mine, None)
+
+
+def test_reap_sweeps_only_old_orphan_profiles(tmpdir_as_tempdir, monkeypatch):
+    monkeypatch.setattr(app, "_chrome_processes", lambda: [])   # 개발 PC 의 실제 Chrome 은 건드리지 않음
+    grace = app.PROFILE_SWEEP_GRACE + 5
+    orphan = _profile(tmpdir_as_tempdir, _dead_pid(), age=grace)
+    fresh = _profile(tmpdir_as_tempdir, 999999999, age=0)       # 유예 시간 안
+    mine = _profile(tmpdir_as_tempdir, os.getpid(), age=grace)
+    app._register_driver(mine)
+    try:
+        report = app.reap_chrome()
+    finally:
+        with app.ACTIVE_DRIVERS_LOCK:
+            app.ACTIVE_DRIVERS.pop(mine, None)
+    assert not os.path.exists(orphan)
+    assert os.path.exists(fresh) and os.path.exists(mine)
+    assert report["swept_dirs"] == 1 and report["reclaimed_bytes"] >= 1000
+
+
+def test_quit_driver_removes_profile_and_registration(tmpdir_as_tempdir):
+    class FakeDriver:
+        quit_called = False
+
+        def quit(self):
+            FakeDriver.quit_called = True
+
+    drv = FakeDriver()
+    drv.temp_profile_dir = _profile(tmpdir_as_tempdir, os.getpid())
+    app._register_driver(drv.temp_profile_dir, drv)
+    app._quit_driver(drv)
+    assert FakeDriver.quit_called
+    assert not os.path.exists(drv.temp_profile_dir)
+    assert drv.temp_profile_dir not in app.ACTIVE_DRIVERS
+
+
+def test_low_memory_refuses_driver(monkeypatch):
+    monkeypatch.setattr(app, "mem_available_mb", lambda: app.CHROME_MIN_FREE_MB - 1)
+    monkeypatch.setattr(app, "reap_chrome", lambda: {})
+    before = app.REAPER_STATS["refused"]
+    with pytest.raises(app.ChromeMemoryError):
+        app._check_memory_for_driver()
+    assert app.REAPER_STATS["refused"] == before + 1
+
+    monkeypatch.setattr(app, "mem_available_mb", lambda: app.CHROME_MIN_FREE_MB + 1)
+    app._check_memory_for_driver()
@@ -0,0 +1,34 @@
+import app
+
+
+def test_registry_order_and_tabs():
+    assert list(app.CAMPS) == ["samnak", "daejeo", "hwamyeong", "yeongdo", "busan_port", "gudeok"]
+    assert list(app.CAMPING_TABS) == ["all", *app.CAMPS]
+    assert app.CAMPING_TABS["yeongdo"]["name"] == "영도"
+
+
+def test_strategy_flags():
+    samnak, yeongdo, busan_port = app.CAMPS["samnak"], app.CAMPS["yeongdo"], app.CAMPS["busan_port"]
+    assert samnak.batchable and samnak.concurrency == "http"
+    assert not yeongdo.batchable and yeongdo.concurrency == "selenium"
+    assert busan_port.concurrency is None and busan_port.cached("2030-05-01") is None
+
+
+def test_cache_key_per_cache():
+    assert app.CAMPS["daejeo"].cache_key("2030-05-01") == ("daejeo", "2030-05-01")
+    assert app.CAMPS["gudeok"].cache_key("2030-05-01") == "2030-05-01"
+
+
+def test_skeleton_and_media():
+    sk = app.CAMPS["yeongdo"].skeleton()
+    assert sk["auto"] == {"available": [], "unavailable": [], "num_available": 0, "num_unavailable": 0, "total": 40}
+    for spec in app.CAMPS.values():
+        assert spec.media["price_table"] == spec.price_table
+
+
+def test_refresh_selenium_starts_job(monkeypatch):
+    started = []
+    spec = app.CAMPS["gudeok"]
+    monkeypatch.setattr(spec, "start_job", started.append)
+    spec.refresh("2030-05-01")
+    assert started == ["2030-05-01"]
@@ -0,0 +1,74 @@
+import time
+from datetime import date, timedelta
+
+import pytest
+
+import app
+
+
+class _NoThread:
+    """submit 이 디스패치 스레드를 띄우지 않게 (테스트가 _pick/_dispatch 를 직접 부름)"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def start(self):
+        pass
+
+
+@pytest.fixture
+def sched(monkeypatch):
+    monkeypatch.setattr(app, "Thread", _NoThread)
+    return app.ScrapeScheduler()
+
+
+def _day(n):
+    return (date.today() + timedelta(days=n)).strftime("%Y-%m-%d")
+
+
+def test_pick_order_interactive_then_nearest_date(sched):
+    noop = lambda: None
+    assert sched.submit("gudeok", _day(1), noop, interactive=False)
+    assert sched.submit("yeongdo", _day(10), noop, interactive=True)
+    assert sched.submit("yeongdo", _day(2), noop, interactive=True)
+
+    picked = [sched._pick() for _ in range(3)]
+    assert [(j["camp"], j["date"]) for j in picked] == [
+        ("yeongdo", _day(2)), ("yeongdo", _day(10)), ("gudeok", _day(1))]
+    assert sched._pick() is None        # 남은 작업은 모두 실행 중
+
+
+def test_resubmit_updates_priority(sched):
+    noop = lambda: None
+    assert sched.submit("yeongdo", _day(1), noop, interactive=False)
+    assert sched.submit("gudeok", _day(5), noop, interactive=True)
+    assert not sched.submit("yeongdo", _day(1), noop, interactive=True)   # 사용자가 같은 날짜를 보기 시작
+    assert sched._pick()["camp"] == "yeongdo"
+
+
+def test_abandoned_interactive_job_is_cancelled(sched):
+    cancelled = []
+    sched.submit("yeongdo", _day(1), lambda: None, on_cancel=lambda: cancelled.append("yeongdo"))
+    sched.submit("gudeok", _day(1), lambda: None, on_cancel=lambda: cancelled.append("gudeok"))
+    sched.submit("yeongdo", _day(3), lambda: None, interactive=False,
+                 on_cancel=lambda: cancelled.append("background"))
+    stale = time.time() - app.JOB_ABANDON_SEC - 1
+    for job in sched.jobs.values():
+        job["last_poll"] = stale
+    sched.touch("gudeok", _day(1))      # 아직 폴링 중
+
+    job = sched._pick()
+    assert (job["camp"], job["date"]) == ("gudeok", _day(1))
+    assert cancelled == ["yeongdo"]     # 백그라운드(pinned) 작업은 취소하지 않음
+    assert sched.metrics()["cancelled"] == 1
+    assert ("yeongdo", _day(3)) in sched.jobs
+
+
+def test_dispatch_runs_job_and_clears_it(sched):
+    ran = []
+    sched.submit("yeongdo", _day(1), lambda: ran.append(1))
+    sched._dispatch()
+    assert ran == [1]
+    assert sched.jobs == {} and sched.metrics()["completed"] == 1
+    sched._dispatch()                   # 할 일이 없으면 그냥 반환
+    assert sched.metrics()["completed"] == 1
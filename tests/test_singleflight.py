@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pytest
+
+import app
+
+
+def test_singleflight_shares_leader_error():
+    flight = app.SingleFlight("test")
+    started, release = threading.Event(), threading.Event()
+    calls, errors = [], []
+
+    def fn():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        raise app.UpstreamError("boom")
+
+    def run():
+        try:
+            flight.do("k", fn)
+        except app.UpstreamError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=run)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=run)
+    follower.start()
+    while flight.metrics()["shared"] < 1:
+        time.sleep(0.01)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(calls) == 1
+    assert len(errors) == 2 and errors[0] is errors[1]
+    assert flight.metrics()["in_flight"] == 0
+    assert flight.do("k", lambda: "ok") == "ok"    # 실패한 호출이 남아 있지 않음
+
+
+def test_singleflight_follower_timeout():
+    flight = app.SingleFlight("test")
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return 1
+
+    leader = threading.Thread(target=flight.do, args=("k", slow))
+    leader.start()
+    started.wait(5)
+    with pytest.raises(app.UpstreamError):
+        flight.do("k", slow, timeout=0.05)
+    release.set()
+    leader.join(5)
+    assert flight.metrics()["follower_timeouts"] == 1
+
+
+def test_concurrent_camp_fetches_hit_upstream_once(monkeypatch):
+    calls = []
+    gate = threading.Event()
+
+    def fake_fetch(camp, d):
+        calls.append((camp, d))
+        gate.wait(5)
+        return {"area_a": {"available": ["01"], "unavailable": []}}
+
+    monkeypatch.setattr(app, "fetch_realtime_areas", fake_fetch)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(app.fetch_realtime_areas_shared("samnak", "2030-05-01")))
+               for _ in range(5)]
+    for t in threads:
+        t.start()
+    while app.HTTP_FLIGHT.metrics()["in_flight"] < 1 or len(calls) < 1:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    gate.set()
+    for t in threads:
+        t.join(5)
+    assert calls == [("samnak", "2030-05-01")]
+    assert len(results) == 5 and all(r is results[0] for r in results)
@@ -0,0 +1,96 @@
+import pytest
+
+import app
+
+
+@pytest.mark.parametrize("sites", [
+    [1, 5, 40],                      # 영도
+    ["01", "07", "12"],              # 낙동 계열
+    ["D1", "D12"],                   # 화명 D/E
+    ["D01", "D05", "D12"],           # 화명 D/E (zero-padding)
+    ["1-1", "2-15", "3-4"],          # 구덕
+    ["3", "12"],                     # 자릿수가 섞인 숫자 → 패딩 없음
+    ["12", "3"],                     # 순서가 바뀌어도 같은 형식
+    ["D12", "D1", "D5"],
+    ["E03", "E01"],
+    ["2-3", "1-20", "1-1"],          # 구덕, 뒷번호가 뒤에서 커짐
+])
+def test_sitebits_round_trip(sites):
+    fmt = app._site_format(sites)
+    assert app._site_format(list(reversed(sites))) == fmt
+    bits = app.SiteBits.from_sites(sites, fmt)
+    assert len(bits) == len(sites)
+    assert bits.labels(fmt) == sorted(sites, key=lambda v: app._site_index(v, app._dash_stride(fmt)))
+    assert app.SiteBits.from_wire(bits.to_wire()) == bits
+
+
+def test_site_format_rejects_mixed():
+    with pytest.raises(ValueError):
+        app._site_format(["01", "D2"])
+    with pytest.raises(ValueError):
+        app._site_format(["site?"])
+    with pytest.raises(ValueError):
+        app._site_format(["A-01", "B-02"])      # 접두어가 다름
+    with pytest.raises(ValueError):
+        app._site_format(["01", "123"])         # 패딩된 항목과 자릿수가 다른 항목
+    with pytest.raises(ValueError):
+        app._site_format([1, "02"])
+
+
+def test_site_format_widths():
+    assert app._site_format(["12", "3"]) == app._site_format(["3", "12"]) == "d"
+    assert app._site_format(["01", "12"]) == "02d"
+    assert app._site_format(["D12", "D1"]) == "prefix:D"
+    assert app._site_format(["D12", "D01"]) == "prefix:D:02d"
+
+
+def test_sitebits_set_ops():
+    a = app.SiteBits.from_sites([1, 2, 3])
+    b = app.SiteBits.from_sites([3, 4])
+    assert list(a | b) == [1, 2, 3, 4]
+    assert list(a & b) == [3]
+    assert list(a - b) == [1, 2]
+    assert 2 in a and 4 not in a
+    assert not app.SiteBits()
+    assert app.SiteBits.from_wire(app.SiteBits().to_wire()) == app.SiteBits()
+
+
+def test_merge_sites_keeps_notation():
+    assert app.merge_sites(["03", "01"], ["02", "03"]) == ["01", "02", "03"]
+    assert app.merge_sites([], ["D2"]) == ["D2"]
+
+
+def test_encode_areas_bits():
+    data = {
+        "area_a": {"available": ["01", "03"], "unavailable": ["02"], "num_available": 2, "total": 3},
+        "note": "x",
+    }
+    enc = app.encode_areas_bits(data)
+    assert enc["note"] == "x"
+    a = enc["area_a"]
+    assert a["fmt"] == "02d" and a["num_available"] == 2 and a["total"] == 3
+    assert app.SiteBits.from_wire(a["available"]).labels(a["fmt"]) == ["01", "03"]
+    assert app.SiteBits.from_wire(a["unavailable"]).labels(a["fmt"]) == ["02"]
+
+
+@pytest.mark.parametrize("sites, fmt", [
+    (["1-1", "2-15"], "dash"),
+    (["1-1", "2-16", "3-31"], "dash:32"),
+    (["1-40", "2-3"], "dash:64"),
+])
+def test_dash_stride_grows_with_sub_numbers(sites, fmt):
+    assert app._site_format(sites) == fmt
+    bits = app.SiteBits.from_sites(sites, fmt)
+    assert bits.labels(fmt) == sites
+    with pytest.raises(ValueError):
+        app._site_index("1-16", 16)
+
+
+def test_diff_areas_across_stride_change():
+    def area(sites):
+        fmt = app._site_format(sites)
+        return {"fmt": fmt, "available": app.SiteBits.from_sites(sites, fmt)}
+    prev = {"deck": area(["1-1", "1-2"])}
+    cur = {"deck": area(["1-2", "2-20"])}
+    assert prev["deck"]["fmt"] == "dash" and cur["deck"]["fmt"] == "dash:32"
+    assert app.diff_areas(prev, cur) == {"deck": {"opened": ["2-20"], "taken": ["1-1"]}}
@@ -0,0 +1,43 @@
+import re
+import time
+
+import app
+
+D = "2030-06-02"
+
+
+def _area(available, unavailable=()):
+    return {"available": list(available), "unavailable": list(unavailable),
+            "num_available": len(available), "num_unavailable": len(unavailable), "max_site_num": 3}
+
+
+def test_stream_mode_sends_camps_in_completion_order(monkeypatch):
+    def fake_fetch(camp, d):
+        if camp == "samnak":
+            time.sleep(0.3)        # 가장 느린 업스트림
+        if camp in ("samnak", "daejeo", "hwamyeong"):
+            return {a: _area(["01"], ["02"]) for a in ("area_a", "area_b", "area_c", "area_d", "area_e")}
+        raise app.UpstreamError("offline")
+
+    monkeypatch.setattr(app, "get_realtime_areas", fake_fetch)
+    monkeypatch.setattr(app, "ALL_RENDER_MODE", "stream")
+
+    resp = app.app.test_client().get("/", query_string={"camp": "all", "resdate": D}, buffered=False)
+    chunks = iter(resp.response)
+    first = next(chunks)
+    if isinstance(first, bytes):
+        first = first.decode()
+    assert "<html" in first and 'data-camp="samnak"' not in first    # 머리말은 수집을 기다리지 않음
+    html = first + "".join(c.decode() if isinstance(c, bytes) else c for c in chunks)
+    resp.close()
+    order = re.findall(r'<tbody data-camp="(\w+)"', html)
+    assert sorted(order) == sorted(k for k in app.CAMPING_TABS if k != "all")
+    assert order.index("daejeo") < order.index("samnak")
+    assert html.rstrip().endswith("</html>")
+
+
+def test_progressive_mode_renders_every_camp_without_upstream(monkeypatch):
+    monkeypatch.setattr(app, "get_realtime_areas", lambda camp, d: (_ for _ in ()).throw(AssertionError(camp)))
+    resp = app.app.test_client().get("/", query_string={"camp": "all", "resdate": D})
+    assert resp.status_code == 200
+    assert len(re.findall(r'<tbody data-camp="', resp.get_data(as_text=True))) == len(app.CAMPING_TABS) - 1
@@ -0,0 +1,52 @@
+import pytest
+
+import app
+
+PAGE = ("<html><body>"
+        '<a class="cbtn area_a cbtn_on">01<input type="hidden" class="sitename" value="01"></a>'
+        '<a class="cbtn area_a cbtn_Pcomplete">02<input type="hidden" class="sitename" value="02"></a>'
+        '<a class="cbtn area_b cbtn_on">01<input type="hidden" class="sitename" value="01"></a>'
+        "</body></html>")
+
+
+class _Resp:
+    status_code = 200
+    headers = {"Content-Type": "text/html"}
+    text = PAGE
+
+
+@pytest.fixture
+def tapes(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "SCRAPER_TAPE_DIR", str(tmp_path))
+    monkeypatch.setattr(app, "upstream_acquire", lambda url: 0.0)
+    return tmp_path
+
+
+def test_record_then_replay_gives_same_result(tapes, monkeypatch):
+    calls = []
+    monkeypatch.setattr(app.requests, "get", lambda url, **kw: calls.append(url) or _Resp())
+    monkeypatch.setattr(app, "SCRAPER_MODE", "record")
+    recorded = app.fetch_realtime_areas("samnak", "2030-05-01")
+    assert len(calls) == 1
+    assert list((tapes / "samnak" / "2030-05-01").glob("GET-*.json"))
+
+    def no_network(url, **kw):
+        raise AssertionError("replay 중 네트워크 요청")
+    monkeypatch.setattr(app.requests, "get", no_network)
+    monkeypatch.setattr(app, "SCRAPER_MODE", "replay")
+    assert app.fetch_realtime_areas("samnak", "2030-05-01") == recorded
+    assert recorded["area_a"]["available"] == ["01"]
+    assert recorded["area_a"]["unavailable"] == ["02"]
+
+
+def test_replay_without_recording_is_upstream_error(tapes, monkeypatch):
+    monkeypatch.setattr(app, "SCRAPER_MODE", "replay")
+    with pytest.raises(app.TapeMiss) as ei:
+        app.fetch_realtime_areas("samnak", "2030-05-02")
+    assert isinstance(ei.value, app.UpstreamError)
+
+
+def test_tape_response_raise_for_status():
+    r = app.TapeResponse({"url": "https://x/", "status": 503, "text": ""})
+    with pytest.raises(app.requests.HTTPError):
+        r.raise_for_status()
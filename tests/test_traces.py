@@ -0,0 +1,81 @@
+from collections import deque
+
+import pytest
+
+import app
+
+
+ADMIN = {"X-Admin-Token": "t0ken"}
+
+
+@pytest.fixture(autouse=True)
+def fresh_traces(monkeypatch):
+    monkeypatch.setattr(app, "TRACES", deque(maxlen=app.TRACE_KEEP))
+    monkeypatch.setattr(app, "TRACE_FILE", "")
+    monkeypatch.setattr(app, "ADMIN_TOKEN", "t0ken")
+
+
+def test_nested_spans_make_one_trace():
+    with app.span("outer", camp="samnak"):
+        with app.span("inner"):
+            app.span_attrs(tries=2)
+        with app.span("inner"):
+            pass
+    assert len(app.TRACES) == 1
+    t = app.TRACES[0]
+    assert t["name"] == "outer" and t["attrs"] == {"camp": "samnak"}
+    assert [c["name"] for c in t["children"]] == ["inner", "inner"]
+    assert t["children"][0]["attrs"] == {"tries": 2}
+    assert t["ms"] is not None and t["trace_id"]
+
+
+def test_span_records_error_and_reraises():
+    with pytest.raises(ValueError):
+        with app.span("outer"):
+            with app.span("inner"):
+                raise ValueError("boom")
+    t = app.TRACES[0]
+    assert "boom" in t["error"] and "boom" in t["children"][0]["error"]
+
+
+def test_traced_takes_date_attr():
+    @app.traced("job")
+    def job(camp, d):
+        return camp
+
+    assert job("samnak", "2030-05-01") == "samnak"
+    assert app.TRACES[0]["attrs"] == {"date": "2030-05-01"}
+
+
+def test_api_traces_filter_and_summary():
+    for name in ("a", "b", "a"):
+        with app.span(name):
+            with app.span("step"):
+                pass
+    client = app.app.test_client()
+    body = client.get("/api/traces?name=a&n=1", headers=ADMIN).get_json()
+    assert [t["name"] for t in body["traces"]] == ["a"]
+    summary = client.get("/api/traces?summary=1", headers=ADMIN).get_json()
+    assert summary["traces"] == 3
+    assert summary["stages"]["a/step"]["count"] == 2
+    assert set(summary["stages"]) == {"a", "a/step", "b", "b/step"}
+
+
+def test_api_traces_bad_n_falls_back_to_default():
+    for _ in range(3):
+        with app.span("x"):
+            pass
+    client = app.app.test_client()
+    r = client.get("/api/traces?n=abc", headers=ADMIN)
+    assert r.status_code == 200 and len(r.get_json()["traces"]) == 3
+    assert len(client.get("/api/traces?n=-5", headers=ADMIN).get_json()["traces"]) == 1
+
+
+@pytest.mark.parametrize("path", ["/api/traces", "/api/metrics"])
+def test_admin_endpoints_need_token(monkeypatch, path):
+    client = app.app.test_client()
+    assert client.get(path, headers=ADMIN).status_code == 200
+    assert client.get(path).status_code == 404
+    assert client.get(path, headers={"X-Admin-Token": "wrong"}).status_code == 404
+    monkeypatch.setattr(app, "ADMIN_TOKEN", "")
+    assert client.get(path, headers={"X-Admin-Token": ""}).status_code == 404     # 설정 안 하면 항상 닫힘
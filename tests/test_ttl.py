@@ -0,0 +1,59 @@
+from datetime import date, timedelta
+
+import pytest
+
+import app
+
+
+def _d(lead: int) -> str:
+    return (date.today() + timedelta(days=lead)).strftime("%Y-%m-%d")
+
+
+@pytest.fixture
+def plain_dates(monkeypatch):
+    """주말/성수기 보정은 끄고 리드타임·변경률만 본다"""
+    monkeypatch.setattr(app, "is_weekend_night", lambda d: False)
+    monkeypatch.setattr(app, "is_peak_season", lambda d: False)
+    monkeypatch.setattr(app, "CHANGE_STATS", {})
+
+
+@pytest.mark.parametrize("lead, ttl", [(0, 60), (1, 120), (2, 120), (5, 300), (20, 900), (90, 3600)])
+def test_ttl_by_lead_time(plain_dates, lead, ttl):
+    assert app._ttl_for("samnak", _d(lead)) == ttl
+
+
+def test_selenium_camps_scale_up_and_clamp(plain_dates):
+    assert app._ttl_for("yeongdo", _d(0)) == 60 * app.CAMPS["yeongdo"].ttl_scale
+    assert app._ttl_for("yeongdo", _d(90)) == app.TTL_MAX
+    assert app._ttl_for("samnak", "not-a-date") == app.TTL_MIN
+
+
+def test_weekend_and_peak_halve(monkeypatch):
+    monkeypatch.setattr(app, "CHANGE_STATS", {})
+    d = "2031-08-01"     # 8월 금요일 밤
+    assert app.is_weekend_night(d) and app.is_peak_season(d)
+    assert not app.is_weekend_night("2031-08-03") and not app.is_peak_season("2031-06-01")
+    assert app._ttl_for("samnak", d) == app.TTL_FAR * 0.25
+
+
+def test_change_rate_scales_after_enough_samples(plain_dates):
+    d = _d(5)
+    app.CHANGE_STATS[("samnak", d)] = {"p": 0.0, "n": 2}
+    assert app._ttl_for("samnak", d) == 300           # 관측 3회 미만이면 보정 없음
+    app.CHANGE_STATS[("samnak", d)] = {"p": 0.0, "n": 3}
+    assert app._ttl_for("samnak", d) == 450
+    app.CHANGE_STATS[("samnak", d)] = {"p": 1.0, "n": 3}
+    assert app._ttl_for("samnak", d) == 150
+
+
+def test_record_snapshot_tracks_change_rate(monkeypatch):
+    monkeypatch.setattr(app, "CHANGE_STATS", {})
+    d = "2031-09-10"
+    areas = lambda avail: {"area_a": {"available": avail, "unavailable": [], "num_available": len(avail)}}
+    app.record_snapshot("daejeo", d, areas(["01"]))
+    assert ("daejeo", d) not in app.CHANGE_STATS       # 첫 관측은 비교 대상 없음
+    app.record_snapshot("daejeo", d, areas(["01"]))
+    app.record_snapshot("daejeo", d, areas(["01", "02"]))
+    st = app.CHANGE_STATS[("daejeo", d)]
+    assert st["n"] == 2
+    assert st["p"] == pytest.approx(0.7 * (0.7 * 0.5) + 0.3)
@@ -0,0 +1,17 @@
+import app
+
+
+def test_upstream_url_rewrites_host_into_path(monkeypatch):
+    monkeypatch.setattr(app, "UPSTREAM_OVERRIDE", "http://127.0.0.1:9000")
+    url = "https://www.nakdongcamping.com/reservation/real_time?user_id=&site_id=&site_type=&dis_rese_date=2030-01-01"
+    assert app.upstream_url(url) == (
+        "http://127.0.0.1:9000/www.nakdongcamping.com/reservation/real_time"
+        "?user_id=&site_id=&site_type=&dis_rese_date=2030-01-01")
+    assert app.upstream_url("https://gudeok.go.kr") == "http://127.0.0.1:9000/gudeok.go.kr/"
+    # 이미 바뀐 URL 은 그대로
+    assert app.upstream_url("http://127.0.0.1:9000/gudeok.go.kr/x") == "http://127.0.0.1:9000/gudeok.go.kr/x"
+
+
+def test_upstream_url_passthrough_when_unset(monkeypatch):
+    monkeypatch.setattr(app, "UPSTREAM_OVERRIDE", "")
+    assert app.upstream_url("https://www.yeongdo.go.kr/a?b=1") == "https://www.yeongdo.go.kr/a?b=1"
@@ -0,0 +1,101 @@
+import threading
+from collections import deque
+from uuid import uuid4
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def warm_state(monkeypatch):
+    state = {"state": "pending", "started": None, "finished": None, "steps": {}, "errors": []}
+    monkeypatch.setattr(app, "WARMUP_STATE", state)
+    return state
+
+
+def test_ready_is_503_until_warmup_finishes(warm_state, monkeypatch):
+    monkeypatch.setattr(app, "WARMUP", True)
+    monkeypatch.setattr(app, "WARMUP_RUN", f"test:{uuid4().hex}")
+    client = app.app.test_client()
+    assert client.get("/ready").status_code == 503          # 아직 아무 워커도 안 잡음
+
+    assert app._claim_warmup()
+    assert not app._claim_warmup()                           # 같은 배포의 다른 워커는 넘김
+    assert client.get("/ready").get_json()["state"] == "running"
+
+    refreshed = []
+    monkeypatch.setattr(app, "fetch_realtime_areas_shared", lambda key, d: refreshed.append(key))
+    monkeypatch.setattr(app, "_warm_render", lambda d: {"all": 200})
+    app.warmup()
+    assert warm_state["state"] == "ready"
+    # DISABLE_SCRAPERS: 셀레니움 캠핑장은 건너뛰고 HTTP 캠핑장만 수집
+    assert refreshed == ["samnak", "daejeo", "hwamyeong"]
+    assert warm_state["steps"]["fetch"]["result"]["unfinished"] == []
+    assert warm_state["errors"] == []
+    r = client.get("/ready")
+    assert r.status_code == 200 and r.get_json()["warmed_by"] == app.os.getpid()
+
+
+def test_ready_without_warmup_is_always_200(monkeypatch):
+    monkeypatch.setattr(app, "WARMUP", False)
+    assert app.app.test_client().get("/ready").status_code == 200
+
+
+def test_warm_step_records_errors(warm_state):
+    app._warm_step("boom", lambda: 1 / 0)
+    assert "error" in warm_state["steps"]["boom"]
+    assert warm_state["errors"] and warm_state["errors"][0].startswith("boom:")
+
+
+class _FakeDriver:
+    current_url = "about:blank"
+
+
+def test_fill_browser_pool_stops_at_size_or_on_launch_error(monkeypatch):
+    monkeypatch.setattr(app, "BROWSER_POOL", deque())
+    monkeypatch.setattr(app, "BROWSER_POOL_SIZE", 2)
+    monkeypatch.setattr(app, "_set_pooled", lambda driver, pooled: None)
+    monkeypatch.setattr(app, "_launch_driver", lambda headless=True: _FakeDriver())
+    assert app.fill_browser_pool() == 2
+    assert app.fill_browser_pool() == 0
+    assert len(app.BROWSER_POOL) == 2
+
+    def no_memory(headless=True):
+        raise app.ChromeMemoryError("low memory")
+    monkeypatch.setattr(app, "BROWSER_POOL", deque())
+    monkeypatch.setattr(app, "_launch_driver", no_memory)
+    assert app.fill_browser_pool() == 0
+
+
+def test_pool_refill_waits_for_a_selenium_slot(monkeypatch):
+    monkeypatch.setattr(app, "BROWSER_POOL", deque())
+    monkeypatch.setattr(app, "BROWSER_POOL_SIZE", 1)
+    monkeypatch.setattr(app, "_set_pooled", lambda driver, pooled: None)
+    launched = threading.Event()
+    monkeypatch.setattr(app, "_launch_driver", lambda headless=True: launched.set() or _FakeDriver())
+    assert app.SELENIUM_SEM.effective_limit() == 1
+
+    with app.SELENIUM_SEM:        # 수집 중인 브라우저가 슬롯을 잡고 있는 동안
+        app.SELENIUM_SEM.skip()
+        t = threading.Thread(target=app.fill_browser_pool)
+        t.start()
+        assert not launched.wait(0.3)
+    t.join(5)
+    assert launched.is_set() and len(app.BROWSER_POOL) == 1
+
+
+def test_warmup_failure_is_recorded_and_does_not_block_ready(warm_state, monkeypatch):
+    monkeypatch.setattr(app, "WARMUP", True)
+    monkeypatch.setattr(app, "WARMUP_RUN", f"test:{uuid4().hex}")
+    monkeypatch.setattr(app, "WARMUP_DAYS", None)     # range(max(1, None)) → TypeError 가 워밍업 본문에서 터짐
+    assert app._claim_warmup()
+    app.warmup()
+    assert warm_state["state"] == "failed"
+    assert any(e.startswith("warmup:") for e in warm_state["errors"])
+    r = app.app.test_client().get("/ready")
+    assert r.status_code == 200 and r.get_json()["state"] == "failed"
+
+
+def test_browser_pool_is_off_by_default():
+    assert app.BROWSER_POOL_SIZE == 0
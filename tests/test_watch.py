@@ -0,0 +1,117 @@
+import threading
+import time
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(app, "_rescrape_key", lambda camp, d: None)   # 감시 루프가 실제로 수집하지 않게
+    return app.app.test_client()
+
+
+def _area(available, unavailable=()):
+    return {"available": list(available), "unavailable": list(unavailable)}
+
+
+def test_watch_create_validation(client):
+    assert client.post("/api/watch", json={"camp": "nope", "date": "2030-02-01"}).status_code == 400
+    assert client.post("/api/watch", json={"camp": "samnak", "date": "2000-01-01"}).status_code == 400
+    assert client.post("/api/watch", json={"camp": "samnak", "date": "20300201"}).status_code == 400
+    assert client.post("/api/watch", json={"camp": "samnak", "date": "2030-02-01", "area": "x"}).status_code == 400
+    assert client.post("/api/watch", json={"camp": "samnak", "date": "2030-02-01",
+                                           "sink": {"type": "sms"}}).status_code == 400
+    assert client.post("/api/watch", json={"camp": "samnak", "date": "2030-02-01",
+                                           "sink": {"type": "webhook", "url": "ftp://x"}}).status_code == 400
+
+
+def test_local_watch_receives_opened_sites(client):
+    d = "2030-02-02"
+    app.record_snapshot("samnak", d, {"area_a": _area(["01"], ["02", "03"]), "area_b": _area([], ["01"])})
+    resp = client.post("/api/watch", json={"camp": "samnak", "date": d, "area": "area_a"})
+    assert resp.status_code == 201
+    wid = resp.get_json()["id"]
+
+    app.record_snapshot("samnak", d, {"area_a": _area(["01", "02"], ["03"]), "area_b": _area(["01"], [])})
+    notes = []
+    for _ in range(50):
+        notes += client.get(f"/api/watch/{wid}").get_json().get("notifications", [])
+        if notes:
+            break
+        time.sleep(0.05)
+    assert [n["opened"] for n in notes] == [{"area_a": ["02"]}]   # 다른 구역(area_b)은 제외
+
+    assert client.delete(f"/api/watch/{wid}").status_code == 200
+    assert client.get(f"/api/watch/{wid}").status_code == 404
+
+
+def test_watch_key_is_claimed_by_one_worker_per_interval():
+    now = time.time()
+    key = ("daejeo", "2030-02-03")
+    assert app._claim_watch_key(*key, now)
+    assert not app._claim_watch_key(*key, now + 1)                       # 다른 워커: 이번 주기는 이미 잡힘
+    assert app._claim_watch_key(*key, now + app.WATCH_INTERVAL + 1)      # 다음 주기
+
+
+def test_watch_is_visible_to_other_workers(client):
+    # 감시 목록은 공유 DB 에 있으므로 다른 연결(스레드)에서도 조회된다
+    wid = client.post("/api/watch", json={"camp": "daejeo", "date": "2030-02-04"}).get_json()["id"]
+    seen = []
+    t = threading.Thread(target=lambda: seen.append(app._load_watch(wid)))
+    t.start()
+    t.join()
+    assert seen[0] is not None
+    assert client.delete(f"/api/watch/{wid}").status_code == 200
+
+
+@pytest.mark.parametrize("url", [
+    "http://127.0.0.1:8080/hook",
+    "http://169.254.169.254/latest/meta-data/",
+    "http://10.0.0.5/hook",
+    "http://[::ffff:127.0.0.1]/hook",
+    "http://[::1]/hook",
+])
+def test_webhook_to_internal_address_is_rejected(client, monkeypatch, url):
+    monkeypatch.setattr(app, "WEBHOOK_ALLOW_PRIVATE", False)
+    r = client.post("/api/watch", json={"camp": "samnak", "date": "2030-02-05",
+                                        "sink": {"type": "webhook", "url": url}})
+    assert r.status_code == 400
+    with pytest.raises(ValueError):
+        app.WebhookSink(url).send({"x": 1})     # 보낼 때도 다시 확인
+
+
+def test_watches_capped_per_client(client, monkeypatch):
+    monkeypatch.setattr(app, "WATCH_MAX_PER_CLIENT", 2)
+    env = {"REMOTE_ADDR": "198.51.100.77"}
+    ids = []
+    for i in range(2):
+        r = client.post("/api/watch", json={"camp": "daejeo", "date": "2030-02-06"}, environ_base=env)
+        assert r.status_code == 201
+        ids.append(r.get_json()["id"])
+    assert client.post("/api/watch", json={"camp": "daejeo", "date": "2030-02-06"},
+                       environ_base=env).status_code == 429
+    r = client.post("/api/watch", json={"camp": "daejeo", "date": "2030-02-06"},
+                    environ_base={"REMOTE_ADDR": "198.51.100.78"})
+    assert r.status_code == 201
+    ids.append(r.get_json()["id"])
+    for wid in ids:
+        client.delete(f"/api/watch/{wid}")
+
+
+@pytest.mark.parametrize("body", [
+    ["samnak", "2030-02-07"],
+    "samnak",
+    {"camp": ["samnak"], "date": "2030-02-07"},
+    {"camp": "samnak", "date": 20300207},
+    {"camp": "samnak", "date": "2030-02-07", "area": ["area_a"]},
+    {"camp": "samnak", "date": "2030-02-07", "sink": "abc"},
+    {"camp": "samnak", "date": "2030-02-07", "sink": ["webhook"]},
+    {"camp": "samnak", "date": "2030-02-07", "sink": {"type": ["webhook"]}},
+    {"camp": "samnak", "date": "2030-02-07", "sink": {"type": "webhook", "url": 123}},
+])
+def test_malformed_body_or_sink_is_400(client, body):
+    r = client.post("/api/watch", json=body)
+    assert r.status_code == 400
+    assert "error" in r.get_json()
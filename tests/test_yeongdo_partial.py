@@ -0,0 +1,70 @@
+import time
+
+import pytest
+
+import app
+
+D = "2030-06-03"
+
+
+@pytest.fixture
+def inflight(monkeypatch):
+    monkeypatch.setattr(app, "INFLIGHT", {})
+    monkeypatch.setattr(app, "YEONGDO_CACHE", {})
+    app.INFLIGHT[D] = {"ts": time.time(), "ticks": 4}
+    return app.INFLIGHT[D]
+
+
+def test_pending_until_a_category_is_published(inflight):
+    client = app.app.test_client()
+    body = client.get("/api/yeongdo", query_string={"date": D}).get_json()
+    assert body["status"] == "pending" and body["tries"] == 4
+
+    app._yeongdo_publish_partial(D, "caravan", {"available": [1, 3], "unavailable": [2]})
+    body = client.get("/api/yeongdo", query_string={"date": D}).get_json()
+    assert body["status"] == "partial"
+    assert body["done"] == ["caravan"]
+    assert body["data"] == {"caravan": {"available": [1, 3], "unavailable": [2]}}
+
+    bits = client.get("/api/yeongdo", query_string={"date": D, "enc": "bits"}).get_json()
+    assert bits["status"] == "partial" and "caravan" in bits["data"]
+
+
+def test_publish_without_job_is_ignored(monkeypatch):
+    monkeypatch.setattr(app, "INFLIGHT", {})
+    app._yeongdo_publish_partial(D, "auto", {"available": [], "unavailable": []})
+    assert app.INFLIGHT == {}
+
+
+def test_replay_publishes_each_category(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "SCRAPER_TAPE_DIR", str(tmp_path))
+    monkeypatch.setattr(app, "SCRAPER_MODE", "replay")
+    pages = {"caravan": "카라반", "auto": "오토사이트", "general": "일반사이트"}
+    for key, label in pages.items():
+        p = tmp_path / "yeongdo" / D / f"selenium-{key}.html"
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(f'<button title="{label}1 예약가능">{label}1</button>', encoding="utf-8")
+
+    seen = []
+    merged = app.fetch_yeongdo_via_selenium_dateclick(D, "https://example.invalid/",
+                                                      on_category=lambda k, part: seen.append((k, part)))
+    assert [k for k, _ in seen] == ["caravan", "auto", "general"]
+    assert {k: part for k, part in seen} == merged
+
+
+def test_callback_errors_do_not_stop_the_run():
+    def boom(key, part):
+        raise RuntimeError("x")
+    app._publish_category(boom, "auto", {"available": [1], "unavailable": []})
+
+
+@pytest.mark.parametrize("exc", [app.UpstreamThrottled("queue full"), app.TapeMiss("no tape")])
+def test_get_step_upstream_errors_fall_back_to_selenium(monkeypatch, exc):
+    def throttled(*a, **kw):
+        raise exc
+    monkeypatch.setattr(app, "http_get", throttled)
+    clicked = {"caravan": {"available": [1], "unavailable": [2]},
+               "auto": {"available": [], "unavailable": [5]},
+               "general": {"available": [3], "unavailable": []}}
+    monkeypatch.setattr(app, "fetch_yeongdo_via_selenium_dateclick", lambda *a, **kw: clicked)
+    assert app.fetch_yeongdo(D, "https://example.invalid/") == clicked